@@ -8,11 +8,19 @@ Filename     :
 Description  :
 '''
 
+from __future__ import annotations
+
+import os
 import re
-import numpy as np
+import sys
+import mmap
+import time
+import struct
+from collections import deque
 from dataclasses import dataclass
-from sympy import symbols
-import pyperclip
+from functools import lru_cache
+# numpy只在批量计算(calc_crc_batch)与engine='fold'的多项式折叠中使用, 在用到的函数内按需导入, 使只计算CRC的程序启动更快;
+# 类型注解中的np.ndarray不会被求值
 
 @dataclass(frozen=True)
 class CRCConfig:
@@ -37,10 +45,79 @@ class CRCConfig:
             raise ValueError(
                 f"xor_out 的二进制位宽 ({self.xor_out.bit_length()}) 超过了指定的位宽 width ({self.width})")
 
-    def calc_crc(self, input_value: str) -> str:
-        # 实例化类, 直接计算给定输入的CRC值
-        crc_calculator = _CRCCalculator(self)
-        return crc_calculator._calculate_crc(input_value)
+    @property
+    def calculator(self) -> '_CRCCalculator':
+        # 该配置对应的CRC计算器, 从缓存中获取, 避免重复构建状态转移矩阵和CRC表
+        return _get_calculator(self)
+
+    def new(self, data=None, engine: str = 'table') -> 'CRCHash':
+        # 创建流式CRC计算对象, 可分段输入数据
+        return CRCHash(self, data, engine)
+
+    def calc_crc(self, input_value: str | int | bytes | bytearray | memoryview | BitView | tuple,
+                 engine: str = 'table', workers: int = 1, parallel_chunk_size: int = None,
+                 executor: str = 'process', byteorder: str = None) -> int | bytes:
+        # 直接计算给定输入的CRC值, 默认返回整数; byteorder为'big'或'little'时返回CRC宽度对应字节数的bytes
+        # 需要二进制或16进制字符串时使用to_bin/to_hex转换
+        # 输入可以是整数、字符串或支持缓冲区协议的对象(bytes, bytearray, memoryview, numpy数组, mmap等)
+        # 长度不是整字节时, 可输入 (整数值, 位数) 或 BitView(缓冲区, 起始位, 位数), 位的顺序见BitView.from_int,
+        # (整数值, 位数)与整数输入一样按大端字节序计算, (value, 8*k)与value.to_bytes(k, 'big')结果相同
+        # engine可选 'table'(按字节查表, 默认), 'slicing8'/'slicing16'(每次处理8/16个字节),
+        # 'slicing'(根据数据长度自动选择), 'fold'(多项式折叠, 需要numpy, 适合1 MiB以上的长数据)
+        # 或 'matrix'(状态转移矩阵, 作为参考实现)
+        # workers不为1时将数据分块并行计算后合并, None表示使用全部CPU核心,
+        # executor可选 'process'(进程池) 或 'thread'(线程池, 仅在计算过程释放GIL时有加速效果)
+        # 按位输入与'matrix'参考实现不分块并行计算, 忽略workers
+        if workers == 1 or engine == 'matrix' or isinstance(input_value, (tuple, BitView)):
+            crc = self.calculator._calculate_crc(input_value, engine)
+        else:
+            data = self.calculator._input_to_buffer(input_value)
+            crc = _crc_parallel(self, data, engine, workers, parallel_chunk_size, executor)
+        if byteorder is None:
+            return crc
+        return crc.to_bytes((self.width + 7) // 8, byteorder)
+
+    def check(self, input_value, expected, engine: str = 'table', byteorder: str = 'big') -> bool:
+        """
+        校验数据的CRC值是否等于expected, 直接比较整数, 不产生字符串
+        :param input_value: 输入数据, 与calc_crc相同
+        :param expected: 期望的CRC值, 整数或bytes(如帧尾的校验字节)
+        :param engine: 计算方法, 与calc_crc相同
+        :param byteorder: expected为bytes时的字节序, 'big'或'little'
+        :return: 一致时返回True
+        """
+        if not isinstance(expected, int):
+            expected = memoryview(expected).cast('B')
+            if expected.nbytes != (self.width + 7) // 8:
+                raise ValueError(f"期望值应为 {(self.width + 7) // 8} 个字节, 而不是 {expected.nbytes} 个")
+            expected = int.from_bytes(expected, byteorder)
+        return self.calculator._calculate_crc(input_value, engine) == expected
+
+    def to_bin(self, crc: int) -> str:
+        # CRC值转换为CRC宽度的二进制字符串, 高位在前
+        return format(crc, f'0{self.width}b')
+
+    def to_hex(self, crc: int) -> str:
+        # CRC值转换为大写的16进制字符串, 位数与CRC宽度对应
+        return format(crc, f'0{(self.width + 3) // 4}X')
+
+    def combine(self, crc_a, crc_b, len_b: int) -> int:
+        """
+        由数据A的CRC值、数据B的CRC值和数据B的字节数, 计算A与B拼接后的CRC值
+        :param crc_a: 数据A的CRC值, 整数或to_bin返回的二进制字符串
+        :param crc_b: 数据B的CRC值, 整数或to_bin返回的二进制字符串
+        :param len_b: 数据B的字节数
+        :return: 整数形式的CRC值
+        """
+        return self.calculator._combine(crc_a, crc_b, len_b)
+
+    def calc_crc_batch(self, messages) -> np.ndarray:
+        """
+        批量计算多条等长消息的CRC值, 所有消息同时按列查表, 适合大量短帧
+        :param messages: 二维uint8的numpy数组(每行一条消息), 或等长字节缓冲区的列表
+        :return: uint64的numpy数组, 第i项为第i条消息的CRC值
+        """
+        return self.calculator._calculate_crc_batch(messages)
 
 CRC_4_ITU = CRCConfig(
     width       = 4,
@@ -231,6 +308,148 @@ CRC_32_MPEG_2 = CRCConfig(
     xor_out     = 0x00000000
 )
 
+CRC_64_ECMA_182 = CRCConfig(
+    width       = 64,
+    poly        = 0x42F0E1EBA9EA3693,
+    reflect_in  = False,
+    xor_in      = 0x0000000000000000,
+    reflect_out = False,
+    xor_out     = 0x0000000000000000
+)
+
+CRC_64_XZ = CRCConfig(
+    width       = 64,
+    poly        = 0x42F0E1EBA9EA3693,
+    reflect_in  = True,
+    xor_in      = 0xFFFFFFFFFFFFFFFF,
+    reflect_out = True,
+    xor_out     = 0xFFFFFFFFFFFFFFFF
+)
+
+
+class GF2Matrix:
+    """
+    GF(2)上的方阵, 每行按位存储为一个整数, 第0列对应最高位
+    乘法只用异或完成, 不会像整数矩阵的幂那样溢出; 矩阵的2^k次幂会被缓存, 用于快速求幂
+    """
+    def __init__(self, rows: list):
+        self.rows = list(rows)
+        self.n = len(self.rows)
+        self._squares = [self]  # self^1, self^2, self^4, ...
+        self._powers = {}
+
+    @classmethod
+    def identity(cls, n: int) -> 'GF2Matrix':
+        # n阶单位矩阵
+        return cls([1 << (n - 1 - i) for i in range(n)])
+
+    def vector_times(self, vector: int) -> int:
+        # 行向量乘矩阵, 向量同样按位存储为整数, 第0个分量对应最高位
+        n = self.n
+        result = 0
+        for i, row in enumerate(self.rows):
+            if (vector >> (n - 1 - i)) & 1:
+                result ^= row
+        return result
+
+    def __matmul__(self, other: 'GF2Matrix') -> 'GF2Matrix':
+        # 矩阵乘法, 结果的每一行等于本矩阵对应行乘以other
+        return GF2Matrix([other.vector_times(row) for row in self.rows])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GF2Matrix) and self.rows == other.rows
+
+    def _square(self, k: int) -> 'GF2Matrix':
+        # 矩阵的2^k次幂, 由反复平方得到并缓存
+        squares = self._squares
+        while len(squares) <= k:
+            squares.append(squares[-1] @ squares[-1])
+        return squares[k]
+
+    def power(self, exponent: int) -> 'GF2Matrix':
+        # 矩阵的exponent次幂, 按二进制分解后用缓存的2^k次幂相乘
+        result = self._powers.get(exponent)
+        if result is None:
+            result = GF2Matrix.identity(self.n)
+            k = 0
+            remaining = exponent
+            while remaining:
+                if remaining & 1:
+                    result = result @ self._square(k)
+                remaining >>= 1
+                k += 1
+            self._powers[exponent] = result
+        return result
+
+    def apply_power(self, vector: int, exponent: int) -> int:
+        # 计算 vector * self^exponent, 只需O(log exponent)次向量乘矩阵, 不必求出整个矩阵的幂
+        k = 0
+        while exponent:
+            if exponent & 1:
+                vector = self._square(k).vector_times(vector)
+            exponent >>= 1
+            k += 1
+        return vector
+
+
+class BitView:
+    """
+    缓冲区中从第bit_offset位开始的bit_length位, 用于长度不是整字节的输入, 不拷贝数据
+    位的顺序与CRC的计算顺序一致: reflect_in为True时每个字节从最低位开始, 否则从最高位开始,
+    因此BitView(data)与直接输入data的结果相同
+    """
+    def __init__(self, data, bit_offset: int = 0, bit_length: int = None):
+        view = memoryview(data)
+        if not view.c_contiguous:
+            raise ValueError("输入缓冲区必须是连续内存")
+        if view.ndim != 1 or view.format != 'B':
+            view = view.cast('B')
+        total = view.nbytes * 8
+        if bit_length is None:
+            bit_length = total - bit_offset
+        if bit_offset < 0 or bit_length < 0 or bit_offset + bit_length > total:
+            raise ValueError(f"位范围超出缓冲区: 偏移 {bit_offset}, 长度 {bit_length}, 缓冲区共 {total} 位")
+        self.data = view
+        self.bit_offset = bit_offset
+        self.bit_length = bit_length
+
+    @classmethod
+    def from_int(cls, value: int, bit_length: int, reflect_in: bool, order: str = 'big') -> 'BitView':
+        """
+        整数的低bit_length位
+        :param reflect_in: CRC配置的reflect_in, 决定每个字节内位的计算顺序
+        :param order: 'big'(默认)时与整数输入一致, 按大端字节序逐字节计算, (value, 8*k)与value.to_bytes(k, 'big')结果相同;
+                      bit_length不是8的倍数时, 最高的不足一个字节的部分作为开头的短字节, 即跳过整数输入补在最高字节中的0
+                      'lsb'时整个整数从最低位开始逐位计算, 如USB等低位先发的串行协议
+        """
+        if value < 0 or value >> bit_length:
+            raise ValueError(f"{value:#x} 超出了 {bit_length} 位")
+        if order not in ('big', 'lsb'):
+            raise ValueError(f"不支持的位顺序: {order}")
+        nbytes = (bit_length + 7) // 8
+        pad = nbytes * 8 - bit_length
+        if order == 'lsb':
+            if reflect_in:
+                return cls(value.to_bytes(nbytes, 'little'), 0, bit_length)
+            # 按位反转后从最高位开始计算, 即从原整数的最低位开始
+            value = int(format(value, f'0{bit_length}b')[::-1], 2) if bit_length else 0
+            return cls((value << pad).to_bytes(nbytes, 'big'), 0, bit_length)
+        data = bytearray(value.to_bytes(nbytes, 'big'))
+        if reflect_in and nbytes:
+            # 字节内从最低位开始计算, 开头的短字节移到第一个字节的高位, 使跳过的pad位正好是低位
+            data[0] = (data[0] << pad) & 0xFF
+        return cls(data, pad, bit_length)
+
+    def __len__(self) -> int:
+        return self.bit_length
+
+
+_SLICING_MIN_LENGTH = 64  # engine='slicing'时, 数据长度小于该值直接按字节查表
+_STREAM_ENGINES = ('table', 'slicing', 'slicing8', 'slicing16', 'fold')  # 流式计算(CRCHash)支持的engine
+_BATCH_BLOCK_ROWS = 1 << 16  # 批量计算时每次处理的消息条数
+_FOLD_BLOCK_SIZE = 256  # engine='fold'时每个数据块的字节数, 位置表大小为 块字节数*256
+_FOLD_BLOCK_ROWS = 1024  # engine='fold'时每次同时计算的数据块数, 即每步处理256 KiB
+
 
 class _CRCCalculator:
     def __init__(self, crc_config: CRCConfig):
@@ -238,11 +457,17 @@ class _CRCCalculator:
         self.crc_config = crc_config
         self.N = self.crc_config.width
         self.T = self._build_transfer_matrix(self.crc_config.poly, self.N)
+        self._table = None
+        self._fold_table = None
+        self._fold_maps = {}
+        self._slicing_tables = {}
 
     def _string_to_hex(self, input_value) -> str:
         # 将输入值转换为十六进制字符串表示形式
         if isinstance(input_value, int):
             return hex(input_value)[2:]  # 如果输入是数字，直接转换为十六进制
+        if not isinstance(input_value, str):
+            return self._data_to_buffer(input_value).hex()  # 如果是字节缓冲区，按字节转换
         # 如果是字符串，则根据配置进行编码和转换
         encoding = 'utf-8'
         try:
@@ -296,12 +521,16 @@ class _CRCCalculator:
             'e': '1110', 'f': '1111'
         }
         n = self.N
-        # 使用 format 函数将 xor_in 转换为固定长度的二进制字符串
-        xor_bin_str = format(self.crc_config.xor_in, f'0{n}b')
         # 将输入的十六进制字符串转换为二进制字符串
         bin_str = ''.join(hex_to_bin_table[char] for char in hex_str.upper())
         bin_str += '0' * n  # 在二进制字符串后面直接添加 n 个零
-        # 对最开始的 n 位进行异或操作
+        return self._xor_in_bin(bin_str)
+
+    def _xor_in_bin(self, bin_str: str) -> str:
+        # 对最开始的 n 位与初始值xor_in进行异或操作
+        n = self.N
+        # 使用 format 函数将 xor_in 转换为固定长度的二进制字符串
+        xor_bin_str = format(self.crc_config.xor_in, f'0{n}b')
         high_n_bits = bin_str[:n]
         xor_result_high_bits = ''.join(
             '1' if a != b else '0' for a, b in zip(high_n_bits, xor_bin_str))
@@ -309,48 +538,521 @@ class _CRCCalculator:
         final_bin = xor_result_high_bits + low_bits
         return final_bin
 
-    def _build_transfer_matrix(self, g_hex: str, n: int) -> np.ndarray:
+    def _bits_to_bin(self, bits: BitView) -> str:
+        # BitView按计算顺序转换为二进制字符串, 仅用于状态转移矩阵法
+        bin_str = ''.join(format(byte, '08b') for byte in bits.data)
+        if self.crc_config.reflect_in:
+            bin_str = ''.join(bin_str[i:i + 8][::-1] for i in range(0, len(bin_str), 8))
+        return bin_str[bits.bit_offset:bits.bit_offset + bits.bit_length]
+
+    def _build_transfer_matrix(self, g_hex: str, n: int) -> GF2Matrix:
         # 构建基于生成多项式的状态转移矩阵
-        g_bin = bin(g_hex)[2:].zfill(n)
-        T = np.zeros((n, n), dtype=int)
-        for i in range(n):
-            if i < len(g_bin):
-                T[0, n - 1 - i] = int(g_bin[-1 - i])
+        # 第0行为多项式的低n位, 其余第i行在第i-1列为1, 表示寄存器左移一位
+        rows = [g_hex & ((1 << n) - 1)]
         for i in range(1, n):
-            T[i, i - 1] = 1
-        return T
+            rows.append(1 << (n - i))
+        return GF2Matrix(rows)
+
+    def _reflect(self, value: int, width: int) -> int:
+        # 将width位的整数按位反转
+        return int(format(value, f'0{width}b')[::-1], 2)
+
+    def _build_crc_table(self) -> list:
+        # 构建按字节查表法使用的256项CRC表
+        # 输入反转时使用反转多项式右移计算; 否则左移计算, 宽度小于8时左对齐到8位
+        n = self.N
+        mask = (1 << n) - 1
+        table = []
+        if self.crc_config.reflect_in:
+            poly = self._reflect(self.crc_config.poly & mask, n)
+            for byte in range(256):
+                crc = byte
+                for _ in range(8):
+                    crc = (crc >> 1) ^ poly if crc & 1 else crc >> 1
+                table.append(crc)
+        else:
+            shift = max(8 - n, 0)
+            width = n + shift
+            poly = (self.crc_config.poly & mask) << shift
+            top_bit = 1 << (width - 1)
+            width_mask = (1 << width) - 1
+            for byte in range(256):
+                crc = byte << (width - 8)
+                for _ in range(8):
+                    crc = ((crc << 1) ^ poly) & width_mask if crc & top_bit else (crc << 1) & width_mask
+                table.append(crc)
+        return table
+
+    def _table_init_register(self) -> int:
+        # 由xor_in得到查表法的寄存器初值
+        if self.crc_config.reflect_in:
+            return self._reflect(self.crc_config.xor_in & ((1 << self.N) - 1), self.N)
+        return self.crc_config.xor_in << max(8 - self.N, 0)
+
+    def _table_update(self, register: int, data: bytes) -> int:
+        # 按字节查表更新寄存器, 每个字节只需一次查表
+        table = self.table
+        if self.crc_config.reflect_in:
+            for byte in data:
+                register = table[(register ^ byte) & 0xFF] ^ (register >> 8)
+        else:
+            width = max(self.N, 8)
+            top_shift = width - 8
+            width_mask = (1 << width) - 1
+            for byte in data:
+                register = table[((register >> top_shift) ^ byte) & 0xFF] ^ ((register << 8) & width_mask)
+        return register
+
+    def _build_slicing_tables(self, slices: int) -> list:
+        # 构建slicing-by-N使用的N张CRC表, 第t张表对应字节后面再跟t个0字节时对寄存器的影响
+        table = self.table
+        tables = [table]
+        if self.crc_config.reflect_in:
+            for _ in range(1, slices):
+                previous = tables[-1]
+                tables.append([(crc >> 8) ^ table[crc & 0xFF] for crc in previous])
+        else:
+            width = max(self.N, 8)
+            top_shift = width - 8
+            width_mask = (1 << width) - 1
+            for _ in range(1, slices):
+                previous = tables[-1]
+                tables.append([((crc << 8) & width_mask) ^ table[crc >> top_shift] for crc in previous])
+        return tables
+
+    def slicing_tables(self, slices: int) -> list:
+        # slicing-by-N使用的CRC表组, 首次使用时构建
+        tables = self._slicing_tables.get(slices)
+        if tables is None:
+            tables = self._build_slicing_tables(slices)
+            self._slicing_tables[slices] = tables
+        return tables
 
-    def _get_next_c(self, bin_input: str, T: np.ndarray) -> str:
+    def _slicing8_update(self, register: int, data: memoryview) -> int:
+        # slicing-by-8: 每次处理8个字节, 剩余不足8个字节的部分按字节查表
+        # 寄存器不超过32位时, 只有前4个字节与寄存器异或, 后4个字节直接查表
+        t0, t1, t2, t3, t4, t5, t6, t7 = self.slicing_tables(8)
+        end = len(data) - len(data) % 8
+        width = max(self.N, 8)
+        if self.crc_config.reflect_in:
+            if width <= 32:
+                for w, b4, b5, b6, b7 in struct.iter_unpack('<I4B', data[:end]):
+                    x = register ^ w
+                    register = (t7[x & 0xFF] ^ t6[(x >> 8) & 0xFF] ^ t5[(x >> 16) & 0xFF]
+                                ^ t4[x >> 24] ^ t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+            else:
+                for w, in struct.iter_unpack('<Q', data[:end]):
+                    x = register ^ w
+                    register = (t7[x & 0xFF] ^ t6[(x >> 8) & 0xFF] ^ t5[(x >> 16) & 0xFF]
+                                ^ t4[(x >> 24) & 0xFF] ^ t3[(x >> 32) & 0xFF]
+                                ^ t2[(x >> 40) & 0xFF] ^ t1[(x >> 48) & 0xFF] ^ t0[x >> 56])
+        else:
+            if width <= 32:
+                align_shift = 32 - width
+                for w, b4, b5, b6, b7 in struct.iter_unpack('>I4B', data[:end]):
+                    x = (register << align_shift) ^ w
+                    register = (t7[x >> 24] ^ t6[(x >> 16) & 0xFF] ^ t5[(x >> 8) & 0xFF]
+                                ^ t4[x & 0xFF] ^ t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+            else:
+                align_shift = 64 - width
+                for w, in struct.iter_unpack('>Q', data[:end]):
+                    x = (register << align_shift) ^ w
+                    register = (t7[x >> 56] ^ t6[(x >> 48) & 0xFF] ^ t5[(x >> 40) & 0xFF]
+                                ^ t4[(x >> 32) & 0xFF] ^ t3[(x >> 24) & 0xFF]
+                                ^ t2[(x >> 16) & 0xFF] ^ t1[(x >> 8) & 0xFF] ^ t0[x & 0xFF])
+        return self._table_update(register, data[end:])
+
+    def _slicing16_update(self, register: int, data: memoryview) -> int:
+        # slicing-by-16: 每次处理16个字节, 剩余不足16个字节的部分按字节查表
+        # 寄存器只与前4个(不超过32位时)或前8个字节异或, 其余字节直接查表
+        (t0, t1, t2, t3, t4, t5, t6, t7,
+         t8, t9, t10, t11, t12, t13, t14, t15) = self.slicing_tables(16)
+        end = len(data) - len(data) % 16
+        width = max(self.N, 8)
+        if self.crc_config.reflect_in:
+            if width <= 32:
+                for (w, b4, b5, b6, b7, b8, b9, b10, b11,
+                     b12, b13, b14, b15) in struct.iter_unpack('<I12B', data[:end]):
+                    x = register ^ w
+                    register = (t15[x & 0xFF] ^ t14[(x >> 8) & 0xFF] ^ t13[(x >> 16) & 0xFF]
+                                ^ t12[x >> 24] ^ t11[b4] ^ t10[b5] ^ t9[b6] ^ t8[b7]
+                                ^ t7[b8] ^ t6[b9] ^ t5[b10] ^ t4[b11]
+                                ^ t3[b12] ^ t2[b13] ^ t1[b14] ^ t0[b15])
+            else:
+                for w, b8, b9, b10, b11, b12, b13, b14, b15 in struct.iter_unpack('<Q8B', data[:end]):
+                    x = register ^ w
+                    register = (t15[x & 0xFF] ^ t14[(x >> 8) & 0xFF] ^ t13[(x >> 16) & 0xFF]
+                                ^ t12[(x >> 24) & 0xFF] ^ t11[(x >> 32) & 0xFF]
+                                ^ t10[(x >> 40) & 0xFF] ^ t9[(x >> 48) & 0xFF] ^ t8[x >> 56]
+                                ^ t7[b8] ^ t6[b9] ^ t5[b10] ^ t4[b11]
+                                ^ t3[b12] ^ t2[b13] ^ t1[b14] ^ t0[b15])
+        else:
+            if width <= 32:
+                align_shift = 32 - width
+                for (w, b4, b5, b6, b7, b8, b9, b10, b11,
+                     b12, b13, b14, b15) in struct.iter_unpack('>I12B', data[:end]):
+                    x = (register << align_shift) ^ w
+                    register = (t15[x >> 24] ^ t14[(x >> 16) & 0xFF] ^ t13[(x >> 8) & 0xFF]
+                                ^ t12[x & 0xFF] ^ t11[b4] ^ t10[b5] ^ t9[b6] ^ t8[b7]
+                                ^ t7[b8] ^ t6[b9] ^ t5[b10] ^ t4[b11]
+                                ^ t3[b12] ^ t2[b13] ^ t1[b14] ^ t0[b15])
+            else:
+                align_shift = 64 - width
+                for w, b8, b9, b10, b11, b12, b13, b14, b15 in struct.iter_unpack('>Q8B', data[:end]):
+                    x = (register << align_shift) ^ w
+                    register = (t15[x >> 56] ^ t14[(x >> 48) & 0xFF] ^ t13[(x >> 40) & 0xFF]
+                                ^ t12[(x >> 32) & 0xFF] ^ t11[(x >> 24) & 0xFF]
+                                ^ t10[(x >> 16) & 0xFF] ^ t9[(x >> 8) & 0xFF] ^ t8[x & 0xFF]
+                                ^ t7[b8] ^ t6[b9] ^ t5[b10] ^ t4[b11]
+                                ^ t3[b12] ^ t2[b13] ^ t1[b14] ^ t0[b15])
+        return self._table_update(register, data[end:])
+
+    def _update_register(self, register: int, data: memoryview, engine: str = 'table') -> int:
+        # 根据engine选择寄存器更新方法
+        # 'slicing'根据数据长度自动选择: 短数据直接查表, 长数据使用slicing-by-16
+        if engine == 'slicing':
+            if len(data) < _SLICING_MIN_LENGTH:
+                engine = 'table'
+            else:
+                engine = 'slicing16'
+        if engine == 'table':
+            return self._table_update(register, data)
+        if engine == 'slicing8':
+            return self._slicing8_update(register, data)
+        if engine == 'slicing16':
+            return self._slicing16_update(register, data)
+        if engine == 'fold':
+            return self._fold_update(register, data)
+        raise ValueError(f"不支持的CRC计算方法: {engine}")
+
+    def _xpow_subset_tables(self, images):
+        # images[..., j]为字节第j位的像, 返回 [..., 256] 的表, 第v项为v中各位的像的异或
+        import numpy as np
+        index = np.arange(256)
+        tables = np.zeros(images.shape[:-1] + (256,), dtype=np.uint64)
+        for j in range(8):
+            tables[..., ((index >> j) & 1).astype(bool)] ^= images[..., j:j + 1]
+        return tables
+
+    def _xpow_images(self, start: int, count: int) -> list:
+        # x^start, x^(start+1), ..., 共count项, 均模P, 以未反转的寄存器值表示
+        n = self.N
+        mask = (1 << n) - 1
+        poly = self.crc_config.poly & mask
+        value = self.T.apply_power(1, start)
+        images = []
+        for _ in range(count):
+            images.append(value)
+            value = ((value << 1) & mask) ^ (poly if value >> (n - 1) else 0)
+        return images
+
+    @property
+    def fold_table(self):
+        # 位置表: fold_table[i][v] 为块内第i个字节取值v时, 对整块余数 (块多项式*x^N mod P) 的贡献
+        # reflect_in时字节先按位反转, 直接体现在表中, 计算时无需再处理数据
+        if self._fold_table is None:
+            import numpy as np
+            size = _FOLD_BLOCK_SIZE
+            powers = np.array(self._xpow_images(0, 8 * size + self.N), dtype=np.uint64)
+            # 第i个字节的第j位(j=0为最低位)的权重为 x^(8*(size-1-i)+j+N)
+            exponents = (8 * (size - 1 - np.arange(size)))[:, None] + np.arange(8)[None, :] + self.N
+            images = powers[exponents]
+            if self.crc_config.reflect_in:
+                images = images[:, ::-1]
+            dtype = np.uint64 if self.N > 32 else np.uint32
+            self._fold_table = self._xpow_subset_tables(images).astype(dtype).reshape(-1)
+        return self._fold_table
+
+    def _fold_map(self, exponent: int):
+        # 将未反转的寄存器值乘以 x^exponent mod P 的按字节查表, 形状为 [字节数, 256]
+        if exponent not in self._fold_maps:
+            import numpy as np
+            nbytes = (self.N + 7) // 8
+            images = self._xpow_images(exponent, self.N) + [0] * (8 * nbytes - self.N)
+            tables = self._xpow_subset_tables(np.array(images, dtype=np.uint64).reshape(nbytes, 8))
+            self._fold_maps[exponent] = tables.astype(self.fold_table.dtype)
+        return self._fold_maps[exponent]
+
+    def _fold_remainder(self, data: memoryview) -> int:
+        # 数据多项式*x^N mod P (寄存器初值为0时的未反转寄存器值)
+        # 各块余数由位置表向量化求出, 再按二叉树两两合并: 前一块乘以 x^(块的位数) 后与后一块异或
+        import numpy as np
+        size = _FOLD_BLOCK_SIZE
+        table = self.fold_table
+        array = np.frombuffer(data, dtype=np.uint8)
+        head, count = len(array) % size, len(array) // size
+        offsets = np.arange(size, dtype=np.intp) * 256
+        # 开头不足一块的部分对齐到块的末尾, 相当于在数据前补0, 不影响余数
+        remainders = np.zeros(count + 1, dtype=table.dtype)
+        if head:
+            remainders[0] = np.bitwise_xor.reduce(table[offsets[size - head:] + array[:head]])
+        blocks = array[head:].reshape(count, size)
+        for start in range(0, count, _FOLD_BLOCK_ROWS):
+            rows = blocks[start:start + _FOLD_BLOCK_ROWS]
+            remainders[1 + start:1 + start + len(rows)] = np.bitwise_xor.reduce(table[offsets + rows], axis=1)
+        exponent = 8 * size
+        while len(remainders) > 1:
+            if len(remainders) % 2:
+                remainders = np.concatenate([np.zeros(1, dtype=table.dtype), remainders])
+            tables = self._fold_map(exponent)
+            high = remainders[0::2]
+            folded = remainders[1::2].copy()
+            for k in range(tables.shape[0]):
+                folded ^= tables[k][((high >> table.dtype.type(8 * k)) & table.dtype.type(0xFF)).astype(np.uint8)]
+            remainders = folded
+            exponent *= 2
+        return int(remainders[0])
+
+    def _fold_update(self, register: int, data: memoryview) -> int:
+        # 多项式折叠: 寄存器推进len(data)个字节后与数据的余数异或, 适合很长的数据
+        if self.crc_config.reflect_in:
+            plain = self._reflect(register, self.N)
+        else:
+            plain = register >> max(8 - self.N, 0)
+        plain = self._shift_register(plain, len(data)) ^ self._fold_remainder(data)
+        if self.crc_config.reflect_in:
+            return self._reflect(plain, self.N)
+        return plain << max(8 - self.N, 0)
+
+    def _partial_byte_update(self, register: int, bits: int, count: int) -> int:
+        # 寄存器输入不足一个字节的count位, bits中的位按计算顺序排列(reflect_in时低位在先, 否则高位在先)
+        # 查表时把这count位放在字节中最后参与计算的位置, 前面补0, 补0的几步只是移位, 因此结果等于逐位计算count步
+        if count == 0:
+            return register
+        table = self.table
+        if self.crc_config.reflect_in:
+            register ^= bits
+            return (register >> count) ^ table[(register & ((1 << count) - 1)) << (8 - count)]
+        width = max(self.N, 8)
+        index = (register >> (width - count)) ^ bits
+        return ((register << count) & ((1 << width) - 1)) ^ table[index]
+
+    def _update_register_bits(self, register: int, bits: BitView, engine: str = 'table') -> int:
+        # 按位输入: 开头与结尾不足一个字节的位单独计算, 中间的整字节使用按字节的计算方法
+        data = bits.data
+        start, remaining = divmod(bits.bit_offset, 8)[0], bits.bit_length
+        skip = bits.bit_offset % 8
+        if skip and remaining:
+            count = min(8 - skip, remaining)
+            if self.crc_config.reflect_in:
+                value = (data[start] >> skip) & ((1 << count) - 1)
+            else:
+                value = (data[start] >> (8 - skip - count)) & ((1 << count) - 1)
+            register = self._partial_byte_update(register, value, count)
+            start += 1
+            remaining -= count
+        nbytes, tail = divmod(remaining, 8)
+        if nbytes:
+            register = self._update_register(register, data[start:start + nbytes], engine)
+        if tail:
+            last = data[start + nbytes]
+            value = last & ((1 << tail) - 1) if self.crc_config.reflect_in else last >> (8 - tail)
+            register = self._partial_byte_update(register, value, tail)
+        return register
+
+    def _input_to_bits(self, input_value):
+        # 按位输入 (整数值, 位数) 或 BitView 转换为BitView, 其他输入返回None
+        if isinstance(input_value, BitView):
+            return input_value
+        if isinstance(input_value, tuple):
+            if len(input_value) != 2:
+                raise ValueError("按位输入必须是 (整数值, 位数)")
+            value, bit_length = input_value
+            # 与整数输入相同按大端字节序计算, 低位先发的串行数据使用BitView.from_int(..., order='lsb')
+            return BitView.from_int(value, bit_length, self.crc_config.reflect_in)
+        return None
+
+    def _table_finalize(self, register: int) -> int:
+        # 将查表法的寄存器转换为最终CRC值, 完成输出反转与xor_out异或
+        n = self.N
+        if self.crc_config.reflect_in:
+            crc = register if self.crc_config.reflect_out else self._reflect(register, n)
+        else:
+            crc = register >> max(8 - n, 0)
+            if self.crc_config.reflect_out:
+                crc = self._reflect(crc, n)
+        return crc ^ self.crc_config.xor_out
+
+    def _data_to_buffer(self, data) -> memoryview:
+        # 将字符串或支持缓冲区协议的对象(bytes, bytearray, memoryview, numpy数组, mmap等)
+        # 转换为按字节访问的memoryview, 缓冲区对象直接引用原内存, 不产生拷贝
+        if isinstance(data, str):
+            encoding = 'utf-8'
+            try:
+                data = data.encode(encoding)
+            except UnicodeEncodeError as e:
+                raise ValueError(f"字符集 '{encoding}' 不支持字符串中的某些字符: {e}")
+        try:
+            view = memoryview(data)
+        except TypeError:
+            raise TypeError(f"不支持的输入类型: {type(data).__name__}")
+        if not view.c_contiguous:
+            raise ValueError("输入缓冲区必须是连续内存")
+        if view.ndim != 1 or view.format != 'B':
+            view = view.cast('B')
+        return view
+
+    def _input_to_buffer(self, input_value) -> memoryview:
+        # 将输入值转换为字节缓冲区, 与_string_to_hex和_validate_hex_input的处理规则一致
+        if isinstance(input_value, int):
+            if input_value < 0:
+                raise ValueError("输入不是有效的16进制数")
+            # 数字按大端字节序转换, 高位不足一个字节时补0
+            input_value = input_value.to_bytes(max((input_value.bit_length() + 7) // 8, 1), 'big')
+        view = self._data_to_buffer(input_value)
+        if view.nbytes == 0:
+            raise ValueError("输入不能为空")
+        return view
+
+    def _shift_register(self, register: int, nbytes: int) -> int:
+        # 将未反转的寄存器值向后推进nbytes个0字节, 即乘以T^(8*nbytes), 只需O(log nbytes)次矩阵乘
+        return self.T.apply_power(register, 8 * nbytes)
+
+    def _crc_to_register(self, crc: int) -> int:
+        # 将最终CRC值还原为未反转、未与xor_out异或的寄存器值
+        register = (crc ^ self.crc_config.xor_out) & ((1 << self.N) - 1)
+        return self._reflect(register, self.N) if self.crc_config.reflect_out else register
+
+    def _register_to_crc(self, register: int) -> int:
+        # 将未反转的寄存器值转换为最终CRC值
+        if self.crc_config.reflect_out:
+            register = self._reflect(register, self.N)
+        return register ^ self.crc_config.xor_out
+
+    def _combine(self, crc_a, crc_b, len_b: int) -> int:
+        # 合并CRC: reg(AB) = (reg(A) ^ xor_in) * T^(8*len_b) ^ reg(B)
+        if isinstance(crc_a, str):
+            crc_a = int(crc_a, 2)
+        if isinstance(crc_b, str):
+            crc_b = int(crc_b, 2)
+        if len_b < 0:
+            raise ValueError("len_b不能小于0")
+        if len_b == 0:
+            return crc_a
+        xor_in = self.crc_config.xor_in & ((1 << self.N) - 1)
+        register_a = self._crc_to_register(crc_a)
+        register_b = self._crc_to_register(crc_b)
+        register = self._shift_register(register_a ^ xor_in, len_b) ^ register_b
+        return self._register_to_crc(register)
+
+    def _get_next_c(self, bin_input: str, T: GF2Matrix) -> int:
         # 根据状态转移矩阵计算下一个CRC校验值
+        # C = sum(D_j * T^(n*(块数-j-2)+i)) + D_last, 按秦九韶算法每个完整块只需乘一次T^n
         n = self.N
-        this_c = np.zeros(n, dtype=int)
-        C = np.dot(this_c, np.linalg.matrix_power(T, len(bin_input)))
         blocks = [bin_input[i:i+n] for i in range(0, len(bin_input), n)]
-        i = len(blocks[-1]) if blocks else 0
-        for j, block in enumerate(blocks):
-            D = np.array([int(bit) for bit in block], dtype=int)
-            if len(D) < n:
-                D = np.pad(D, (n - len(D), 0), 'constant')
-                C += D
-                break
-            power = n * (len(blocks)-j-2) + i
-            T_power = np.linalg.matrix_power(T, power)
-            C += np.dot(D, T_power)
-        C = C % 2
-        C = ''.join(map(str, C))
+        C = 0
+        if not blocks:
+            return C
+        T_n = T.power(n)
+        for block in blocks[:-1]:
+            C = T_n.vector_times(C) ^ int(block, 2)
+        # 最后一块长度为i, 不足n位时高位补0
+        C = T.power(len(blocks[-1])).vector_times(C) ^ int(blocks[-1], 2)
         return C
 
-    def _output_reverse_and_xor(self, bin_input: str) -> str:
+    def _output_reverse_and_xor(self, C: int) -> int:
         # 对最终的CRC结果进行可能的反转和与xor_out的按位异或操作
-        processed_bin = bin_input[::-1] if self.crc_config.reflect_out else bin_input
-        # 将 xor_out 转换为二进制字符串并确保其长度与 processed_bin 一致
-        xor_out_bin = format(self.crc_config.xor_out, f'0{len(processed_bin)}b')
-        # 对 processed_bin 和 xor_out 进行按位异或操作
-        result_bin = ''.join('1' if a != b else '0' for a, b in zip(processed_bin, xor_out_bin))
-        return result_bin
-
-    def _calculate_crc(self, input_value: str) -> str:
-        # 执行完整的CRC计算流程
+        if self.crc_config.reflect_out:
+            C = self._reflect(C, self.N)
+        return C ^ self.crc_config.xor_out
+
+    @property
+    def table(self) -> list:
+        # 查表法使用的CRC表, 首次使用时构建
+        if self._table is None:
+            self._table = self._build_crc_table()
+        return self._table
+
+    def _calculate_crc_table(self, input_value: str | int | bytes | bytearray | memoryview | BitView | tuple,
+                             engine: str = 'table') -> int:
+        # 查表计算CRC(按字节或slicing-by-N), 结果与状态转移矩阵法逐位一致
+        bits = self._input_to_bits(input_value)
+        if bits is not None:
+            if bits.bit_length == 0:
+                raise ValueError("输入不能为空")
+            register = self._update_register_bits(self._table_init_register(), bits, engine)
+            return self._table_finalize(register)
+        data = self._input_to_buffer(input_value)
+        register = self._update_register(self._table_init_register(), data, engine)
+        return self._table_finalize(register)
+
+    def _messages_to_array(self, messages) -> np.ndarray:
+        # 将批量输入转换为二维uint8数组, 每行一条消息
+        import numpy as np
+        if isinstance(messages, np.ndarray):
+            if messages.ndim != 2:
+                raise ValueError("批量输入必须是二维数组, 每行一条消息")
+            if messages.dtype != np.uint8:
+                raise ValueError(f"批量输入的数据类型必须是uint8, 而不是{messages.dtype}")
+            return messages
+        views = [self._data_to_buffer(message) for message in messages]
+        if not views:
+            return np.zeros((0, 0), dtype=np.uint8)
+        length = len(views[0])
+        if any(len(view) != length for view in views):
+            raise ValueError("批量输入的所有消息必须等长")
+        return np.frombuffer(b''.join(views), dtype=np.uint8).reshape(len(views), length)
+
+    def _reflect_array(self, values: np.ndarray, width: int) -> np.ndarray:
+        # 将uint64数组中每个width位的数按位反转
+        import numpy as np
+        reverse_byte = np.array([self._reflect(i, 8) for i in range(256)], dtype=np.uint64)
+        result = np.zeros_like(values)
+        for k in range(8):
+            byte = (values >> np.uint64(8 * k)) & np.uint64(0xFF)
+            result |= reverse_byte[byte] << np.uint64(56 - 8 * k)
+        return result >> np.uint64(64 - width)
+
+    def _calculate_crc_batch(self, messages) -> np.ndarray:
+        # 批量查表计算CRC, 寄存器为uint64数组, 每次对所有消息的同一列字节查表
+        import numpy as np
+        data = self._messages_to_array(messages)
+        n = self.N
+        table = np.array(self.table, dtype=np.uint64)
+        registers = np.full(data.shape[0], self._table_init_register(), dtype=np.uint64)
+        for start in range(0, data.shape[0], _BATCH_BLOCK_ROWS):
+            # 按行分块并转置, 使每列字节在内存中连续
+            columns = np.ascontiguousarray(data[start:start + _BATCH_BLOCK_ROWS].T)
+            register = registers[start:start + _BATCH_BLOCK_ROWS]
+            if self.crc_config.reflect_in:
+                shift = np.uint64(8)
+                for column in columns:
+                    register = table[register.astype(np.uint8) ^ column] ^ (register >> shift)
+            else:
+                width = max(n, 8)
+                top_shift = np.uint64(width - 8)
+                shift = np.uint64(8)
+                width_mask = np.uint64((1 << width) - 1)
+                for column in columns:
+                    register = (table[(register >> top_shift).astype(np.uint8) ^ column]
+                                ^ ((register << shift) & width_mask))
+            registers[start:start + _BATCH_BLOCK_ROWS] = register
+        # 输出反转与xor_out异或, 与_table_finalize一致
+        if self.crc_config.reflect_in:
+            crc = registers if self.crc_config.reflect_out else self._reflect_array(registers, n)
+        else:
+            crc = registers >> np.uint64(max(8 - n, 0))
+            if self.crc_config.reflect_out:
+                crc = self._reflect_array(crc, n)
+        return crc ^ np.uint64(self.crc_config.xor_out)
+
+    def _calculate_crc(self, input_value: str | int | bytes | bytearray | memoryview | BitView | tuple,
+                       engine: str = 'table') -> int:
+        # 根据engine选择CRC计算方法
+        if engine == 'matrix':
+            return self._calculate_crc_matrix(input_value)
+        return self._calculate_crc_table(input_value, engine)
+
+    def _calculate_crc_matrix(self,
+                              input_value: str | int | bytes | bytearray | memoryview | BitView | tuple) -> int:
+        # 执行完整的CRC计算流程(状态转移矩阵法, 作为参考实现)
+        bits = self._input_to_bits(input_value)
+        if bits is not None:
+            # 按位输入直接生成计算顺序的二进制字符串, 不再经过字节反转
+            if bits.bit_length == 0:
+                raise ValueError("输入不能为空")
+            C = self._get_next_c(self._xor_in_bin(self._bits_to_bin(bits) + '0' * self.N), self.T)
+            return self._output_reverse_and_xor(C)
         # 将输入转换为十六进制字符串
         hex_str = self._string_to_hex(input_value)
         # 根据配置验证并清理十六进制字符串
@@ -366,217 +1068,317 @@ class _CRCCalculator:
         final_result = self._output_reverse_and_xor(C)
         return final_result
 
-class CRCVerilog(_CRCCalculator):
-    def _crc_one_step_formula(self, din_width: int) -> np.ndarray:
-        # Verilog CRC计算单步并行公式
-        N = self.N
-        # 判断din_width是否大于0
-        if din_width == 0:
-            raise ValueError("din_width must be greater than 0")
-        # 生成数据行向量, 输入位宽变为8的倍数, 然后加上N
-        total_width = ((din_width + 7) // 8) * 8 + N
-        d_symbols = symbols(' '.join([f'd{i:02d}' for i in range(total_width)]))
-        D = np.array([list(d_symbols[::-1])])
-        # 取前total_width-d_min个元素
-        d_min = min(din_width, N)
-        D = D[:, :(total_width - d_min)]
-        # 后补d_min个0
-        D = np.concatenate((D, np.zeros((1, d_min), int)), axis=1)
-        # 生成状态转移矩阵
-        T = self.T
-        # 进行并行CRC计算
-        verilog_one_step = 0
-        j, i = divmod(total_width, N)
-        for k in range(j):
-            start_idx = k * N
-            end_idx = (k + 1) * N
-            sub_D = D[:, start_idx:end_idx]
-            exp = N * (j - 1 - k) + i
-            T_exp = np.linalg.matrix_power(T,  exp) % 2
-            term = np.dot(sub_D,  T_exp)
-            verilog_one_step += term
-        # 处理余数项
-        if i > 0:
-            sub_D_last = D[:, j * N: j * N + i]
-            eye_matrix = np.eye(i,  dtype=int)
-            term_last = np.dot(sub_D_last, eye_matrix)
-            verilog_one_step[0, :i] += term_last[0, :]
-        return verilog_one_step
-
-    def _split_long_line(self, line: str, len_limit: int = 100) -> list:
-        """
-        分割长度超过指定限制的行，使得每个分割出来的部分都以'^'开头。
-        :param line: 要分割的字符串
-        :param len_limit: 单行的最大长度限制，默认为100
-        :return: 分割后的字符串列表
-        """
-        if len(line) <= len_limit:
-            return [line]
-        parts = []
-        while len(line) > len_limit:
-            split_index = line.rfind('^', 0, len_limit)
-            parts.append(line[:split_index])
-            line = ' ' * 20 + line[split_index:]
-        parts.append(line)
-        return parts
-
-    def generate_verilog_crc_one_step_code(self, din_width) -> str:
-        """
-        将输入行向量转换为Verilog crc_calc赋值语句
-        :param din_width: 输入数据宽度
-        :return: 生成的Verilog代码字符串
-        """
-        verilog_crc_one_step_list = []
-        verilog_crc_one_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 begin')
-        verilog_crc_one_step_list.append('/*')
-        verilog_crc_one_step_list.append('单步计算CRC')
-        verilog_crc_one_step_list.append('CRC宽度: ' + str(self.N))
-        verilog_crc_one_step_list.append('CRC多项式: '
-                                            + f'0x{self.crc_config.poly:0{(self.N+3)//4}x}')
-        verilog_crc_one_step_list.append('输入数据位宽: ' + str(din_width))
-        verilog_crc_one_step_list.append('*/')
-        # 单步CRC计算公式
-        row_vector = self._crc_one_step_formula(din_width)
-        crc_list = [str(item) for item in row_vector[0]][::-1]
-        for i in range(len(crc_list)):
-            item = crc_list[i].replace('+', '^')
-            item = re.sub(r'\bd(\d{2})\b', lambda m: f"din_xor[{int(m.group(1))}]", item)
-            new_item = f'assign crc_calc[{i}] = ' + item + ';'
-            # 对过长的行进行分割
-            split_items = self._split_long_line(new_item)
-            verilog_crc_one_step_list.extend(split_items)
-        verilog_crc_one_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 end')
-        verilog_crc_one_step_code = '\n'.join(verilog_crc_one_step_list)
-        # 代码复制到剪贴板, 便于直接粘贴
-        pyperclip.copy(verilog_crc_one_step_code)
-        return verilog_crc_one_step_code
-
-    def _crc_multi_step_formula(self, din_width: int) -> np.ndarray:
-        # Verilog CRC计算多步并行公式
-        N = self.N
-        # 判断din_width是否大于0, 并且小于等于N
-        if din_width == 0:
-            raise ValueError("din_width must be greater than 0")
-        if din_width < N:
-            raise ValueError("din_width can't be less than CRC width")
-        # 生成状态行向量
-        c_symbols = symbols(' '.join([f'c{i:02d}' for i in range(N)]))
-        C = np.array([list(c_symbols[::-1])])
-        # 生成数据行向量
-        d_symbols = symbols(' '.join([f'd{i:02d}' for i in range(din_width)]))
-        D = np.array([list(d_symbols[::-1])])
-        # 生成状态转移矩阵
-        T = self.T
-        # 进行并行CRC计算
-        verilog_multi_step = 0
-        # 第一项
-        verilog_multi_step += np.dot(C,  np.linalg.matrix_power(T,  din_width) % 2)
-        # 中间项
-        j, i = divmod(din_width, N)
-        for k in range(j):
-            start_idx = k * N
-            end_idx = (k + 1) * N
-            sub_D = D[:, start_idx:end_idx]
-            exp = N * (j - 1 - k) + i
-            T_exp = np.linalg.matrix_power(T,  exp) % 2
-            term = np.dot(sub_D,  T_exp)
-            verilog_multi_step += term
-        # 处理余数项
-        if i > 0:
-            sub_D_last = D[:, j * N: j * N + i]
-            eye_matrix = np.eye(i,  dtype=int)
-            term_last = np.dot(sub_D_last, eye_matrix)
-            verilog_multi_step[0, :i] += term_last[0, :]
-        return verilog_multi_step
-
-    def _crc_multi_step_formula_last(self, din_width: int, last_din_width: int) -> np.ndarray:
-        # Verilog CRC计算多步并行公式
-        N = self.N
-        # 判断last_din_width是否大于0, 并且小于等于N
-        if last_din_width == 0:
-            raise ValueError("last_din_width must be greater than 0")
-        if last_din_width > din_width:
-            raise ValueError("last_din_width can't be greater than din_width")
-        # 生成状态行向量
-        c_symbols = symbols(' '.join([f'c{i:02d}' for i in range(N)]))
-        C = np.array([list(c_symbols[::-1])])
-        # 生成数据行向量
-        d_symbols = symbols(' '.join([f'd{i:02d}' for i in range(din_width)]))
-        D = np.array([list(d_symbols[::-1])])
-        # 取前last_din_width个数据
-        D = D[:, :last_din_width]
-        # 将D后补N个0
-        D = np.concatenate((D, np.zeros((1, N), int)), axis=1)
-        # 生成状态转移矩阵
-        T = self.T
-        # 进行并行CRC计算
-        verilog_multi_step_last = 0
-        # 第一项
-        verilog_multi_step_last += np.dot(C,  np.linalg.matrix_power(T,  last_din_width+N) % 2)
-        # 中间项
-        j, i = divmod(last_din_width+N, N)
-        for k in range(j):
-            start_idx = k * N
-            end_idx = (k + 1) * N
-            sub_D = D[:, start_idx:end_idx]
-            exp = N * (j - 1 - k) + i
-            T_exp = np.linalg.matrix_power(T,  exp) % 2
-            term = np.dot(sub_D,  T_exp)
-            verilog_multi_step_last += term
-        # 处理余数项
-        if i > 0:
-            sub_D_last = D[:, j * N: j * N + i]
-            eye_matrix = np.eye(i,  dtype=int)
-            term_last = np.dot(sub_D_last, eye_matrix)
-            verilog_multi_step_last[0, :i] += term_last[0, :]
-        return verilog_multi_step_last
-
-
-    def generate_verilog_crc_multi_step_code(self, din_width: int, last_din_width: int) -> str:
+_CALCULATOR_CACHE_SIZE = 128  # 计算器缓存的最大数量, 超出后淘汰最久未使用的配置
+
+
+@lru_cache(maxsize=_CALCULATOR_CACHE_SIZE)
+def _get_calculator(crc_config: CRCConfig) -> _CRCCalculator:
+    # 以CRC配置为键缓存计算器, CRCConfig不可变, 可直接作为字典键
+    return _CRCCalculator(crc_config)
+
+
+def calculator_cache_info():
+    # 查看计算器缓存的命中次数、未命中次数、最大容量和当前数量
+    return _get_calculator.cache_info()
+
+
+def calculator_cache_clear() -> None:
+    # 清空计算器缓存
+    _get_calculator.cache_clear()
+
+
+def _check_stream_engine(engine: str) -> None:
+    # 流式计算只保存寄存器, 在创建时检查engine, 避免到第一次update才报错
+    if engine == 'matrix':
+        raise ValueError("流式计算不支持'matrix'参考实现, 请使用calc_crc(..., engine='matrix')")
+    if engine not in _STREAM_ENGINES:
+        raise ValueError(f"不支持的CRC计算方法: {engine}")
+
+
+class CRCHash:
+    """
+    流式CRC计算对象, 用法与hashlib类似, 分段调用update后用digest获取结果
+    分段之间只保存CRC寄存器, xor_in只在开始时处理, 反转和xor_out只在输出时处理
+    """
+    def __init__(self, crc_config: CRCConfig, data=None, engine: str = 'table'):
+        _check_stream_engine(engine)
+        self.crc_config = crc_config
+        self.engine = engine
+        self._calculator = _get_calculator(crc_config)
+        self._register = self._calculator._table_init_register()
+        if data is not None:
+            self.update(data)
+
+    @property
+    def digest_size(self) -> int:
+        # digest返回的字节数
+        return (self.crc_config.width + 7) // 8
+
+    def update(self, data) -> None:
         """
-        将输入行向量转换为Verilog crc_calc赋值语句
-        :param din_width: 输入数据宽度
-        :return: 生成的Verilog代码字符串
+        输入一段数据, 更新CRC寄存器
+        :param data: 支持缓冲区协议的对象, 如bytes/bytearray/memoryview/numpy数组/mmap,
+                     字符串按utf-8编码处理; 也可以是按位输入的 (整数值, 位数) 或 BitView
         """
-        verilog_crc_multi_step_list = []
-        # 添加注释
-        verilog_crc_multi_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 begin')
-        verilog_crc_multi_step_list.append('/*')
-        verilog_crc_multi_step_list.append('多步计算CRC')
-        verilog_crc_multi_step_list.append('CRC宽度: ' + str(self.N))
-        verilog_crc_multi_step_list.append('CRC多项式: '
-                                            + f'0x{self.crc_config.poly:0{(self.N+3)//4}x}')
-        verilog_crc_multi_step_list.append('输入数据位宽: ' + str(din_width))
-        verilog_crc_multi_step_list.append('最后一段数据位宽: ' + str(last_din_width))
-        verilog_crc_multi_step_list.append('*/')
-        # 多步CRC计算第一部分
-        row_vector = self._crc_multi_step_formula(din_width)
-        crc_list = [str(item) for item in row_vector[0]][::-1]
-        for i in range(len(crc_list)):
-            item = crc_list[i].replace('+', '^')
-            item = re.sub(r'\bd(\d{2})\b', lambda m: f"din_xor[{int(m.group(1))}]", item)
-            item = re.sub(r'\bc(\d{2})\b', lambda m: f"crc[{int(m.group(1))}]", item)
-            new_item = f'assign crc_calc[{i}] = ' + item + ';'
-            # 对过长的行进行分割
-            split_items = self._split_long_line(new_item)
-            verilog_crc_multi_step_list.extend(split_items)
-        # 添加注释
-        verilog_crc_multi_step_list.append('// 最后一段数据的计算代码, 已考虑了补CRC宽度个0')
-        # 多步CRC计算第二部分
-        row_vector = self._crc_multi_step_formula_last(din_width, last_din_width)
-        crc_list = [str(item) for item in row_vector[0]][::-1]
-        for i in range(len(crc_list)):
-            item = crc_list[i].replace('+', '^')
-            item = re.sub(r'\bd(\d{2})\b', lambda m: f"din_xor[{int(m.group(1))}]", item)
-            item = re.sub(r'\bc(\d{2})\b', lambda m: f"crc[{int(m.group(1))}]", item)
-            new_item = f'assign crc_calc_last[{i}] = ' + item + ';'
-            # 对过长的行进行分割
-            split_items = self._split_long_line(new_item)
-            verilog_crc_multi_step_list.extend(split_items)
-        # 添加注释
-        verilog_crc_multi_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 end')
-        # 转为字符串
-        verilog_crc_multi_step_code = '\n'.join(verilog_crc_multi_step_list)
-        # 代码复制到剪贴板, 便于直接粘贴
-        pyperclip.copy(verilog_crc_multi_step_code)
-        return verilog_crc_multi_step_code
\ No newline at end of file
+        bits = self._calculator._input_to_bits(data)
+        if bits is not None:
+            self._register = self._calculator._update_register_bits(self._register, bits, self.engine)
+            return
+        data = self._calculator._data_to_buffer(data)
+        self._register = self._calculator._update_register(self._register, data, self.engine)
+
+    def intdigest(self) -> int:
+        # 以整数形式返回当前已输入数据的CRC值, 不影响后续update
+        return self._calculator._table_finalize(self._register)
+
+    def digest(self) -> bytes:
+        # 以大端字节形式返回CRC值
+        return self.intdigest().to_bytes(self.digest_size, 'big')
+
+    def hexdigest(self) -> str:
+        # 以16进制字符串形式返回CRC值
+        return self.digest().hex()
+
+    def copy(self) -> 'CRCHash':
+        # 复制当前计算状态, 可用于计算共同前缀的不同数据
+        other = CRCHash.__new__(CRCHash)
+        other.crc_config = self.crc_config
+        other.engine = self.engine
+        other._calculator = self._calculator
+        other._register = self._register
+        return other
+
+
+_PARALLEL_CHUNK_SIZE = 4 << 20  # 并行计算时每个数据块的默认字节数
+
+
+def _crc_chunk(crc_config: CRCConfig, data, engine: str) -> int:
+    # 在工作进程或线程中计算一个数据块的CRC值
+    return CRCHash(crc_config, data, engine).intdigest()
+
+
+def _crc_file_chunk(path, crc_config: CRCConfig, offset: int, length: int, engine: str) -> int:
+    # 在工作进程或线程中通过mmap计算文件中一段数据的CRC值, mmap的偏移需按分配粒度对齐
+    aligned_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), offset + length - aligned_offset,
+                       access=mmap.ACCESS_READ, offset=aligned_offset) as mm:
+            with memoryview(mm) as view:
+                return _crc_chunk(crc_config, view[offset - aligned_offset:], engine)
+
+
+def _parallel_combine(crc_config: CRCConfig, function, tasks, workers: int, executor: str) -> int:
+    """
+    在进程池或线程池中计算各数据块的CRC值, 按顺序用combine合并
+    :param function: 计算单个数据块CRC的函数
+    :param tasks: 可迭代对象, 每项为 (function的参数元组, 数据块字节数)
+    :return: 整数形式的CRC值
+    """
+    # concurrent.futures导入较慢, 只在并行计算时导入
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    if executor == 'process':
+        pool_class = ProcessPoolExecutor
+    elif executor == 'thread':
+        pool_class = ThreadPoolExecutor
+    else:
+        raise ValueError(f"不支持的并行方式: {executor}")
+    workers = workers or os.cpu_count() or 1
+    crc = None
+    pending = deque()
+    with pool_class(max_workers=workers) as pool:
+        # 同时提交的任务数有上限, 避免一次性复制全部数据块
+        for args, length in tasks:
+            pending.append((pool.submit(function, *args), length))
+            while len(pending) > 2 * workers or (pending and pending[0][0].done()):
+                future, chunk_length = pending.popleft()
+                chunk_crc = future.result()
+                crc = chunk_crc if crc is None else crc_config.combine(crc, chunk_crc, chunk_length)
+        while pending:
+            future, chunk_length = pending.popleft()
+            chunk_crc = future.result()
+            crc = chunk_crc if crc is None else crc_config.combine(crc, chunk_crc, chunk_length)
+    return crc
+
+
+def _crc_parallel(crc_config: CRCConfig, data: memoryview, engine: str, workers: int,
+                  chunk_size: int, executor: str) -> int:
+    # 将数据分块并行计算CRC后合并, 进程池需要复制数据块, 线程池直接引用原内存
+    _check_stream_engine(engine)
+    chunk_size = chunk_size or _PARALLEL_CHUNK_SIZE
+    if len(data) <= chunk_size:
+        return _crc_chunk(crc_config, data, engine)
+    def tasks():
+        for i in range(0, len(data), chunk_size):
+            chunk = data[i:i+chunk_size]
+            yield (crc_config, chunk if executor == 'thread' else bytes(chunk), engine), len(chunk)
+    return _parallel_combine(crc_config, _crc_chunk, tasks(), workers, executor)
+
+
+_FILE_CHUNK_SIZE = 1 << 20  # 无法使用mmap时, 分块读取文件的块大小
+
+
+def crc_file(path, crc_config: CRCConfig, use_mmap: bool = True,
+             chunk_size: int = _FILE_CHUNK_SIZE, engine: str = 'slicing', workers: int = 1,
+             parallel_chunk_size: int = _PARALLEL_CHUNK_SIZE, executor: str = 'process') -> int:
+    """
+    计算文件内容的CRC值, 默认通过mmap直接访问文件, 无法映射时改为分块读取
+    :param path: 文件路径
+    :param crc_config: CRC配置, 如CRC_32或自定义的CRCConfig
+    :param use_mmap: 是否使用mmap, False时分块读取
+    :param chunk_size: 分块读取时每块的字节数
+    :param engine: 寄存器更新方法, 同CRCConfig.calc_crc, 默认自动选择slicing-by-N
+    :param workers: 并行计算的进程或线程数, 为1时不并行, None表示使用全部CPU核心
+    :param parallel_chunk_size: 并行计算时每个工作进程或线程一次处理的字节数
+    :param executor: 'process'(进程池) 或 'thread'(线程池)
+    :return: 整数形式的CRC值
+    """
+    _check_stream_engine(engine)
+    if workers != 1 and use_mmap:
+        size = os.path.getsize(path)
+        if size > parallel_chunk_size:
+            # 各工作进程或线程自行映射文件中的一段, 不需要传递数据
+            tasks = (((path, crc_config, offset, min(parallel_chunk_size, size - offset), engine),
+                      min(parallel_chunk_size, size - offset))
+                     for offset in range(0, size, parallel_chunk_size))
+            return _parallel_combine(crc_config, _crc_file_chunk, tasks, workers, executor)
+    crc_hash = CRCHash(crc_config, engine=engine)
+    with open(path, 'rb') as f:
+        mm = None
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass  # 特殊文件无法映射, 改为分块读取
+        if mm is not None:
+            with mm:
+                crc_hash.update(mm)
+            return crc_hash.intdigest()
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            crc_hash.update(view[:size])
+    return crc_hash.intdigest()
+
+
+def crc_files(paths, crc_config: CRCConfig, use_mmap: bool = True,
+              chunk_size: int = _FILE_CHUNK_SIZE, engine: str = 'slicing', workers: int = 1,
+              parallel_chunk_size: int = _PARALLEL_CHUNK_SIZE, executor: str = 'process',
+              on_error=None):
+    """
+    依次计算多个文件的CRC值, 目录会递归遍历其中的所有文件
+    :param paths: 文件或目录路径列表
+    :param crc_config: CRC配置
+    :param on_error: 读取某个文件或目录出错时的回调函数, 参数为 (路径, OSError), 调用后继续处理其余文件;
+                     为None时直接抛出异常
+    其余参数同crc_file
+    :return: 生成器, 每项为 (文件路径, CRC值, 文件字节数)
+    """
+    options = (use_mmap, chunk_size, engine, workers, parallel_chunk_size, executor)
+
+    def file_crc(file_path):
+        try:
+            return file_path, crc_file(file_path, crc_config, *options), os.path.getsize(file_path)
+        except OSError as e:
+            if on_error is None:
+                raise
+            on_error(file_path, e)
+            return None
+
+    def walk_error(e):
+        if on_error is None:
+            raise e
+        on_error(e.filename, e)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path, onerror=walk_error):
+                dirs.sort()
+                for name in sorted(files):
+                    result = file_crc(os.path.join(root, name))
+                    if result is not None:
+                        yield result
+        else:
+            result = file_crc(path)
+            if result is not None:
+                yield result
+
+
+def _crc_presets() -> dict:
+    # 模块中预定义的CRC配置, 键为配置名称, 如'CRC_32'
+    return {name: value for name, value in globals().items()
+            if name.startswith('CRC_') and isinstance(value, CRCConfig)}
+
+
+def __getattr__(name: str):
+    # CRCVerilog与CRCEquationCache已移到myCRCVerilog.py, 保留myCRC.CRCVerilog的用法, 首次访问时才导入
+    if name in ('CRCVerilog', 'CRCEquationCache'):
+        import myCRCVerilog
+        return getattr(myCRCVerilog, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(argv=None) -> int:
+    # 命令行入口: 计算文件或目录中所有文件的CRC值, 并统计吞吐率
+    import argparse
+    presets = _crc_presets()
+    parser = argparse.ArgumentParser(description='计算文件的CRC值, 目录会递归计算其中的所有文件')
+    parser.add_argument('paths', nargs='+', help='文件或目录路径')
+    parser.add_argument('-c', '--config', default='CRC_32', choices=sorted(presets),
+                        help='预定义的CRC配置, 默认为CRC_32, 指定--width和--poly时忽略')
+    parser.add_argument('--width', type=int, help='自定义CRC宽度')
+    parser.add_argument('--poly', type=lambda x: int(x, 0), help='自定义CRC生成多项式, 如0x8005')
+    parser.add_argument('--reflect-in', action='store_true', help='自定义配置输入反转')
+    parser.add_argument('--xor-in', type=lambda x: int(x, 0), default=0, help='自定义配置输入异或值')
+    parser.add_argument('--reflect-out', action='store_true', help='自定义配置输出反转')
+    parser.add_argument('--xor-out', type=lambda x: int(x, 0), default=0, help='自定义配置输出异或值')
+    parser.add_argument('--no-mmap', action='store_true', help='不使用mmap, 分块读取文件')
+    parser.add_argument('--chunk-size', type=int, default=_FILE_CHUNK_SIZE, help='分块读取时每块的字节数')
+    parser.add_argument('--engine', default='slicing',
+                        choices=_STREAM_ENGINES, help='CRC计算方法')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='并行计算的进程数, 默认为1即不并行, 0表示使用全部CPU核心')
+    parser.add_argument('--parallel-chunk-size', type=int, default=_PARALLEL_CHUNK_SIZE,
+                        help='并行计算时每个进程一次处理的字节数')
+    args = parser.parse_args(argv)
+
+    if args.width is not None or args.poly is not None:
+        if args.width is None or args.poly is None:
+            parser.error('自定义CRC配置必须同时指定--width和--poly')
+        try:
+            crc_config = CRCConfig(width=args.width, poly=args.poly, reflect_in=args.reflect_in,
+                                   xor_in=args.xor_in, reflect_out=args.reflect_out,
+                                   xor_out=args.xor_out)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        crc_config = presets[args.config]
+
+    digits = (crc_config.width + 3) // 4
+    total_bytes = 0
+    file_count = 0
+    error_count = 0
+    start_time = time.perf_counter()
+
+    def report_error(path, error):
+        nonlocal error_count
+        print(f'错误: {path}: {error.strerror or error}', file=sys.stderr)
+        error_count += 1
+
+    for path, crc, size in crc_files(args.paths, crc_config, not args.no_mmap, args.chunk_size,
+                                     args.engine, args.workers or None, args.parallel_chunk_size,
+                                     on_error=report_error):
+        print(f'{crc:0{digits}X}  {path}')
+        total_bytes += size
+        file_count += 1
+    elapsed = time.perf_counter() - start_time
+    throughput = total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(f'文件数: {file_count}, 总字节数: {total_bytes}, 用时: {elapsed:.3f} s, '
+          f'吞吐率: {throughput:.2f} MB/s', file=sys.stderr)
+    return 1 if error_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
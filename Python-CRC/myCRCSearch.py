@@ -0,0 +1,297 @@
+'''
+Author       : Xu Xiaokang
+Email        :
+Date         : 2025-01-22 15:42:50
+LastEditors  : Xu Xiaokang
+LastEditTime : 2025-02-10 15:20:06
+Filename     :
+Description  : 由抓取到的 (消息, CRC值) 样本反推CRC参数(宽度, 多项式, 输入输出反转, xor_in, xor_out)
+'''
+
+import sys
+import numpy as np
+from myCRC import CRCConfig, _crc_presets
+
+# 原理:
+# 寄存器 R = (M·x^N + xor_in·x^L) mod P, CRC = refout(R) ^ xor_out, 其中M为按计算顺序排列的消息位, L为消息位数
+# 两条等长消息的CRC异或后, xor_in与xor_out的项抵消: refout^-1(c1 ^ c2) = (M1 ^ M2)·x^N mod P
+# 即P整除 Q = (M1 ^ M2)·x^N + refout^-1(c1 ^ c2), 所有样本对的Q的最大公因式G必含有P:
+# G的次数恰为N时G就是P; 次数为N+k时, 向量化搜索G的N次因式或k次因式(取次数较小的一方, k次因式H对应 P = G/H)
+# 多项式确定后, xor_in与xor_out满足GF(2)上的线性方程组, 用高斯消元求解
+
+_SEARCH_CHUNK_SIZE = 1 << 20  # 向量化搜索多项式时每批的候选数
+_SEARCH_MAX_WORK = 1 << 36  # 向量化搜索的工作量上限(候选数 x G的位数), 单核约每秒1e8, 超过时需要更多样本
+
+
+def _gf2_mod(a: int, b: int) -> int:
+    # GF(2)多项式取模, 多项式以整数表示, 第k位为x^k的系数
+    degree = b.bit_length()
+    while a.bit_length() >= degree:
+        a ^= b << (a.bit_length() - degree)
+    return a
+
+
+def _gf2_div(a: int, b: int) -> int:
+    # GF(2)多项式整除, 返回商
+    degree = b.bit_length()
+    quotient = 0
+    while a.bit_length() >= degree:
+        shift = a.bit_length() - degree
+        quotient |= 1 << shift
+        a ^= b << shift
+    return quotient
+
+
+def _gf2_gcd(a: int, b: int) -> int:
+    # GF(2)多项式的最大公因式
+    while b:
+        a, b = b, _gf2_mod(a, b)
+    return a
+
+
+def _reflect(value: int, width: int) -> int:
+    # 将width位的数按位反转
+    return int(format(value, f'0{width}b')[::-1], 2)
+
+
+_REVERSE_BYTES = bytes(_reflect(i, 8) for i in range(256))
+
+
+def _message_poly(message: bytes, reflect_in: bool) -> int:
+    # 消息按计算顺序转换为多项式, 先计算的位为高次项
+    if reflect_in:
+        message = message.translate(_REVERSE_BYTES)
+    return int.from_bytes(message, 'big')
+
+
+def _sample_pairs(samples: list) -> list:
+    # 按消息长度分组, 每组中其余样本与第一个样本组成样本对, 相同的消息不能抵消, 跳过
+    groups = {}
+    for message, crc in samples:
+        groups.setdefault(len(message), []).append((message, crc))
+    pairs = []
+    for group in groups.values():
+        first = group[0]
+        pairs.extend((first, other) for other in group[1:] if other[0] != first[0])
+    if not pairs:
+        raise ValueError("至少需要两个消息不同但长度相同的样本")
+    return pairs
+
+
+def _divisor_chunk(g: int, degree: int, start: int, stop: int) -> list:
+    # 在多项式 x^degree + p (start <= p < stop) 中找出G的因式, 所有候选同时按位对G取模
+    mask = np.uint64((1 << degree) - 1)
+    polys = np.arange(start, stop, dtype=np.uint64)
+    remainder = np.zeros(len(polys), dtype=np.uint64)
+    top_shift = np.uint64(degree - 1)
+    one = np.uint64(1)
+    for k in range(g.bit_length() - 1, -1, -1):
+        top = (remainder >> top_shift) & one
+        remainder = ((remainder << one) & mask) | np.uint64((g >> k) & 1)
+        remainder ^= polys * top
+    return [int(p) for p in polys[remainder == 0]]
+
+
+def _search_divisors(g: int, degree: int, workers: int) -> list:
+    # 向量化搜索G的所有degree次因式(不含x^degree项), workers不为1时在多个进程中分批搜索, 0表示使用全部CPU核心
+    total = 1 << degree
+    chunks = [(g, degree, start, min(start + _SEARCH_CHUNK_SIZE, total))
+              for start in range(0, total, _SEARCH_CHUNK_SIZE)]
+    if workers == 1 or len(chunks) == 1:
+        return [p for chunk in chunks for p in _divisor_chunk(*chunk)]
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return [p for found in pool.map(_divisor_chunk, *zip(*chunks)) for p in found]
+
+
+def _candidate_polys(pairs: list, width: int, reflect_in: bool, reflect_out: bool, workers: int) -> list:
+    # 由样本对求出所有可能的多项式(不含x^width项)
+    # 不含常数项的多项式P·x^k只是次数更低的P的移位, 计算结果与P相同, 因此只保留含常数项(最低位为1)的多项式
+    g = 0
+    for (message_a, crc_a), (message_b, crc_b) in pairs:
+        diff = _message_poly(bytes(a ^ b for a, b in zip(message_a, message_b)), reflect_in)
+        crc_diff = crc_a ^ crc_b
+        if reflect_out:
+            crc_diff = _reflect(crc_diff, width)
+        g = _gf2_gcd(g, (diff << width) ^ crc_diff)
+        if g.bit_length() - 1 < width:
+            return []
+    extra = g.bit_length() - 1 - width
+    if extra == 0:
+        polys = [g ^ (1 << width)]
+    elif (1 << min(width, extra)) * g.bit_length() > _SEARCH_MAX_WORK:
+        raise ValueError(f"样本太少, 无法确定{width}位CRC的多项式, 请提供更多等长的样本")
+    elif width <= extra:
+        polys = _search_divisors(g, width, workers)
+    else:
+        # 搜索次数较小的因式H, P = G/H
+        polys = [_gf2_div(g, (1 << extra) | h) ^ (1 << width) for h in _search_divisors(g, extra, workers)]
+    return [poly for poly in polys if poly & 1]
+
+
+def _solve_gf2(rows: list, nvars: int):
+    """
+    GF(2)上的线性方程组求解
+    :param rows: 每个方程为 (系数, 右边), 系数的第j位为第j个未知数的系数
+    :param nvars: 未知数个数
+    :return: (自由未知数取0时的解, 唯一确定的未知数集合), 无解时返回None
+    """
+    pivots = {}
+    for coefficients, rhs in rows:
+        for var, (pivot_coefficients, pivot_rhs) in pivots.items():
+            if (coefficients >> var) & 1:
+                coefficients ^= pivot_coefficients
+                rhs ^= pivot_rhs
+        if coefficients == 0:
+            if rhs:
+                return None
+            continue
+        var = coefficients.bit_length() - 1
+        # 新主元消去已有方程中的该未知数, 保持简化阶梯形
+        for other, (other_coefficients, other_rhs) in pivots.items():
+            if (other_coefficients >> var) & 1:
+                pivots[other] = (other_coefficients ^ coefficients, other_rhs ^ rhs)
+        pivots[var] = (coefficients, rhs)
+    # 自由未知数取0; 简化阶梯形中只含主元本身的方程才唯一确定该未知数
+    solution = 0
+    for var, (_, rhs) in pivots.items():
+        if rhs:
+            solution |= 1 << var
+    return solution, {var for var, (coefficients, _) in pivots.items() if coefficients == 1 << var}
+
+
+def _solve_xor_in_out(samples: list, width: int, poly: int, reflect_in: bool, reflect_out: bool,
+                      preferred: list = ()):
+    """
+    多项式确定后求xor_in与xor_out
+    对每个样本: xor_in·T^L ^ y = refout^-1(crc) ^ A, 其中A为xor_in与xor_out均为0时的寄存器值, y = refout^-1(xor_out)
+    样本长度都相同等情况下方程组欠定, 此时依次优先取预定义配置的值, xor_in与xor_out均为全0或全1, xor_in为全0或全1
+    :param preferred: 方程组欠定时优先尝试的 (xor_in, xor_out) 列表
+    :return: (xor_in, xor_out), 无解时返回None
+    """
+    mask = (1 << width) - 1
+    base = CRCConfig(width, poly, reflect_in, 0, False, 0)
+    calculator = base.calculator
+    images_by_length = {}
+    rows = []
+    for message, crc in samples:
+        register = _reflect(crc, width) if reflect_out else crc
+        rhs_value = register ^ base.calc_crc(message)
+        if len(message) not in images_by_length:
+            images_by_length[len(message)] = [calculator.T.apply_power(1 << j, 8 * len(message))
+                                              for j in range(width)]
+        images = images_by_length[len(message)]
+        for k in range(width):
+            coefficients = 1 << (width + k)
+            for j, image in enumerate(images):
+                if (image >> k) & 1:
+                    coefficients |= 1 << j
+            rows.append((coefficients, (rhs_value >> k) & 1))
+    solved = _solve_gf2(rows, 2 * width)
+    if solved is None:
+        return None
+    solution, pivots = solved
+    if not all(var in pivots for var in range(width)):
+        # xor_in不唯一, 依次尝试常用的取值
+        constants = [(xor_in, _reflect(xor_out, width) if reflect_out else xor_out) for xor_in, xor_out in preferred]
+        constants += [(xor_in, y) for xor_in in (0, mask) for y in (0, mask)]
+        candidates = [[(1 << j, (xor_in >> j) & 1) for j in range(width)]
+                      + [(1 << (width + j), (y >> j) & 1) for j in range(width)] for xor_in, y in constants]
+        candidates += [[(1 << j, (xor_in >> j) & 1) for j in range(width)] for xor_in in (0, mask)]
+        for extra_rows in candidates:
+            constrained = _solve_gf2(rows + extra_rows, 2 * width)
+            if constrained is not None:
+                solution = constrained[0]
+                break
+    xor_in = solution & mask
+    y = solution >> width
+    return xor_in, _reflect(y, width) if reflect_out else y
+
+
+def search_crc_config(samples: list, width: int = None, byteorder: str = 'big',
+                      workers: int = 1) -> list:
+    """
+    由 (消息, CRC值) 样本反推CRC参数, 返回所有与样本一致的配置
+    :param samples: 样本列表, 每项为 (消息, CRC值), 消息为bytes等缓冲区对象, CRC值为整数或bytes
+    :param width: CRC宽度, None表示在可能的宽度中全部搜索
+    :param byteorder: CRC值为bytes时的字节序, 'big'或'little'
+    :param workers: 向量化搜索多项式时的进程数, 0表示使用全部CPU核心
+    :return: CRCConfig列表, 按宽度从小到大排列, 同一宽度中与预定义配置相同的排在前面;
+             样本不足以唯一确定xor_in时, 返回的配置只保证在样本出现过的消息长度上与真实配置一致
+    """
+    normalized = []
+    max_width = 64
+    for message, crc in samples:
+        if not isinstance(crc, int):
+            crc = bytes(crc)
+            max_width = min(max_width, 8 * len(crc))
+            crc = int.from_bytes(crc, byteorder)
+        normalized.append((bytes(message), crc))
+    pairs = _sample_pairs(normalized)
+    min_width = max(4, max(crc.bit_length() for _, crc in normalized))
+    widths = [width] if width is not None else range(min_width, max_width + 1)
+    presets = set(_crc_presets().values())
+    found = []
+    errors = []
+    for n in widths:
+        if any(crc >> n for _, crc in normalized):
+            continue
+        for reflect_in in (False, True):
+            for reflect_out in (False, True):
+                try:
+                    polys = _candidate_polys(pairs, n, reflect_in, reflect_out, workers)
+                except ValueError as e:
+                    # 只指定了宽度时直接报错, 搜索所有宽度时跳过无法确定的宽度
+                    if width is not None:
+                        raise
+                    errors.append(e)
+                    continue
+                for poly in polys:
+                    preferred = [(config.xor_in, config.xor_out) for config in presets
+                                 if (config.width, config.poly, config.reflect_in, config.reflect_out)
+                                 == (n, poly, reflect_in, reflect_out)]
+                    solved = _solve_xor_in_out(normalized, n, poly, reflect_in, reflect_out, preferred)
+                    if solved is None:
+                        continue
+                    config = CRCConfig(n, poly, reflect_in, solved[0], reflect_out, solved[1])
+                    if all(config.calc_crc(message) == crc for message, crc in normalized):
+                        found.append(config)
+    if not found and errors:
+        raise errors[0]
+    return sorted(found, key=lambda config: (config.width, config not in presets))
+
+
+def main(argv=None) -> int:
+    # 命令行入口: 样本以 "消息16进制:CRC16进制" 的形式给出, 如 313233343536373839:CBF43926
+    import argparse
+    parser = argparse.ArgumentParser(description='由 (消息, CRC值) 样本反推CRC参数')
+    parser.add_argument('samples', nargs='+', help='样本, 格式为 消息16进制:CRC16进制')
+    parser.add_argument('--width', type=int, help='CRC宽度, 默认在可能的宽度中全部搜索')
+    parser.add_argument('--byteorder', default='big', choices=['big', 'little'],
+                        help='CRC值的字节序, 默认为big')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='搜索多项式的进程数, 默认为1, 0表示使用全部CPU核心')
+    args = parser.parse_args(argv)
+    samples = []
+    for text in args.samples:
+        message, _, crc = text.partition(':')
+        samples.append((bytes.fromhex(message), bytes.fromhex(crc)))
+    try:
+        configs = search_crc_config(samples, args.width, args.byteorder, args.workers)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    names = {config: name for name, config in _crc_presets().items()}
+    for config in configs:
+        print(f"{names.get(config, '自定义'):<20} width={config.width} poly=0x{config.poly:X} "
+              f"reflect_in={config.reflect_in} xor_in=0x{config.xor_in:X} "
+              f"reflect_out={config.reflect_out} xor_out=0x{config.xor_out:X}")
+    if not configs:
+        print('未找到与样本一致的CRC配置', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,388 @@
+'''
+Author       : Xu Xiaokang
+Email        :
+Date         : 2025-01-22 15:42:50
+LastEditors  : Xu Xiaokang
+LastEditTime : 2025-02-10 15:20:06
+Filename     :
+Description  : 基于asyncio的流式帧校验, 从StreamReader读取数据, 按帧边界切分并校验CRC(Modbus RTU, X.25等)
+'''
+
+from __future__ import annotations
+
+import sys
+import time
+import asyncio
+import inspect
+from dataclasses import dataclass
+from myCRC import CRCConfig, CRC_16_MODBUS, CRC_16_X25
+
+# 帧切分方式:
+# 'hdlc': 以0x7E为帧定界符, 帧内0x7E/0x7D转义为 0x7D, 字节^0x20, 0x7D后紧跟0x7E表示中止当前帧(X.25/HDLC/PPP)
+# 'gap' : 以线路空闲时间为帧边界, 超过gap秒没有收到数据即认为一帧结束(Modbus RTU的3.5字符时间), 流结束也会结束当前帧
+# 帧内容按接收顺序写入一个bytearray, CRC在每次读取后对新到的数据滚动计算, 末尾CRC字节数的数据暂不计算,
+# 帧结束时不再重新扫描整帧; 发出的帧直接交出该bytearray, 不再复制
+
+HDLC_FLAG = 0x7E
+HDLC_ESCAPE = 0x7D
+
+_STREAM_CHUNK_SIZE = 64 << 10  # 每次从StreamReader读取的最大字节数
+
+
+@dataclass
+class Frame:
+    # 一个完整的帧, data为去除定界符和转义后的帧内容(含末尾的CRC字节)
+    data: bytearray
+    status: str  # 'good', 'bad_crc', 'runt'(帧太短), 'oversize'(超过最大帧长, 内容被截断), 'aborted'(被中止序列中止)
+    crc: int = None  # 由帧内容计算得到的CRC值
+    received_crc: int = None  # 帧末尾携带的CRC值
+    crc_bytes: int = 0  # 帧末尾CRC的字节数, 未校验CRC的帧为0
+    end_time: float = 0.0  # 检测到帧结束时的时间, time.perf_counter()
+
+    @property
+    def good(self) -> bool:
+        return self.status == 'good'
+
+    @property
+    def payload(self) -> memoryview:
+        # 去除末尾CRC字节后的帧内容, 不复制
+        return memoryview(self.data)[:len(self.data) - self.crc_bytes]
+
+
+@dataclass
+class FrameStats:
+    # 帧校验计数
+    bytes: int = 0
+    frames: int = 0
+    good: int = 0
+    bad_crc: int = 0
+    runt: int = 0
+    oversize: int = 0
+    aborted: int = 0
+
+    @property
+    def bad(self) -> int:
+        return self.frames - self.good
+
+    def __add__(self, other: 'FrameStats') -> 'FrameStats':
+        return FrameStats(*(getattr(self, name) + getattr(other, name) for name in self.__dataclass_fields__))
+
+
+class CRCFrameChecker:
+    """
+    从asyncio.StreamReader中读取数据, 切分帧并校验帧尾的CRC
+    每个对象保存一个数据流的接收状态, 多个数据流需要使用多个对象, 可用check_streams同时处理
+    """
+    def __init__(self, crc_config: CRCConfig, framing: str = 'hdlc', byteorder: str = None,
+                 max_frame_size: int = 4096, min_frame_size: int = None, gap: float = None,
+                 chunk_size: int = _STREAM_CHUNK_SIZE, engine: str = 'slicing'):
+        """
+        :param crc_config: CRC配置
+        :param framing: 帧切分方式, 'hdlc'或'gap'
+        :param byteorder: 帧尾CRC的字节序, None表示输出反转的配置用'little', 否则用'big'
+        :param max_frame_size: 最大帧长(不含定界符与转义字节), 超过时该帧计为oversize
+        :param min_frame_size: 最小帧长, 默认为CRC字节数+1, 更短的帧计为runt
+        :param gap: framing为'gap'时的帧间空闲时间, 单位秒
+        :param chunk_size: 每次从StreamReader读取的最大字节数
+        :param engine: 计算CRC使用的方法, 与CRCConfig.calc_crc相同, 默认slicing, 对逐段到达的数据比table快
+        """
+        if framing not in ('hdlc', 'gap'):
+            raise ValueError(f"不支持的帧切分方式: {framing}, 可选 'hdlc' 或 'gap'")
+        if framing == 'gap' and not gap:
+            raise ValueError("framing为'gap'时必须指定帧间空闲时间gap")
+        self.crc_config = crc_config
+        self.framing = framing
+        self.byteorder = byteorder or ('little' if crc_config.reflect_out else 'big')
+        self.crc_bytes = (crc_config.width + 7) // 8
+        self.max_frame_size = max_frame_size
+        self.min_frame_size = self.crc_bytes + 1 if min_frame_size is None else max(min_frame_size, self.crc_bytes)
+        self.gap = gap
+        self.chunk_size = chunk_size
+        self.stats = FrameStats()
+        self._initial_hash = crc_config.new(engine=engine)
+        self._synced = framing == 'gap'  # hdlc在收到第一个定界符之前丢弃数据
+        self._escape = False
+        self._reset_frame()
+
+    @classmethod
+    def modbus_rtu(cls, baudrate: int = 19200, **kwargs) -> 'CRCFrameChecker':
+        """
+        Modbus RTU帧校验, CRC_16_MODBUS, CRC低字节在前, 帧间隔为3.5个字符时间
+        :param baudrate: 波特率, 超过19200时按协议规定使用固定的1.75ms
+        """
+        gap = 3.5 * 11 / baudrate if baudrate <= 19200 else 1.75e-3
+        kwargs.setdefault('max_frame_size', 256)
+        kwargs.setdefault('min_frame_size', 4)
+        return cls(CRC_16_MODBUS, framing='gap', byteorder='little', gap=kwargs.pop('gap', gap), **kwargs)
+
+    @classmethod
+    def x25(cls, **kwargs) -> 'CRCFrameChecker':
+        # X.25/HDLC帧校验, CRC_16_X25, FCS低字节在前, 0x7E定界并转义
+        return cls(CRC_16_X25, framing='hdlc', byteorder='little', **kwargs)
+
+    def encode_frame(self, payload) -> bytes:
+        # 为payload加上CRC与帧定界, 得到可发送的字节流, 用于发送端与测试
+        frame = bytes(payload) + self.crc_config.calc_crc(bytes(payload), byteorder=self.byteorder)
+        if self.framing == 'gap':
+            return frame
+        stuffed = frame.replace(b'\x7d', b'\x7d\x5d').replace(b'\x7e', b'\x7d\x5e')
+        return b'\x7e' + stuffed + b'\x7e'
+
+    def _reset_frame(self) -> None:
+        # 开始接收新的一帧
+        self._buffer = bytearray()
+        self._hash = self._initial_hash.copy()
+        self._crc_position = 0  # _buffer中已计算CRC的字节数
+        self._overflow = False
+
+    def _append(self, data) -> None:
+        # 向当前帧追加数据, 超过最大帧长后丢弃后续数据并标记
+        if self._overflow:
+            return
+        room = self.max_frame_size - len(self._buffer)
+        if len(data) > room:
+            data = data[:room]
+            self._overflow = True
+        self._buffer += data
+
+    def _update_crc(self) -> None:
+        # 对新到的数据滚动计算CRC, 末尾crc_bytes个字节可能是CRC本身, 留到帧结束时判断
+        stop = len(self._buffer) - self.crc_bytes
+        if stop > self._crc_position:
+            with memoryview(self._buffer) as view:
+                self._hash.update(view[self._crc_position:stop])
+            self._crc_position = stop
+
+    def _end_frame(self, aborted: bool = False) -> Frame | None:
+        # 当前帧结束, 返回校验结果, 空帧(连续的定界符或空闲)返回None
+        buffer = self._buffer
+        if not buffer and not aborted:
+            return None
+        end_time = time.perf_counter()
+        if aborted:
+            frame = Frame(buffer, 'aborted', end_time=end_time)
+        elif self._overflow:
+            frame = Frame(buffer, 'oversize', end_time=end_time)
+        elif len(buffer) < self.min_frame_size:
+            frame = Frame(buffer, 'runt', end_time=end_time)
+        else:
+            self._update_crc()
+            crc = self._hash.intdigest()
+            received_crc = int.from_bytes(buffer[-self.crc_bytes:], self.byteorder)
+            status = 'good' if crc == received_crc else 'bad_crc'
+            frame = Frame(buffer, status, crc, received_crc, self.crc_bytes, end_time)
+        stats = self.stats
+        stats.frames += 1
+        setattr(stats, frame.status, getattr(stats, frame.status) + 1)
+        self._reset_frame()
+        return frame
+
+    def _feed_hdlc(self, chunk: bytes) -> list:
+        # 处理一段hdlc数据, 返回其中结束的帧
+        frames = []
+        view = memoryview(chunk)
+        position = 0
+        length = len(chunk)
+        next_flag = next_escape = -1
+        while position < length:
+            if self._escape:
+                # 上一个字节是转义符
+                self._escape = False
+                byte = chunk[position]
+                position += 1
+                if byte == HDLC_FLAG:
+                    frames.append(self._end_frame(aborted=True))
+                else:
+                    self._append(bytes((byte ^ 0x20,)))
+                continue
+            if next_flag < position:
+                next_flag = chunk.find(HDLC_FLAG, position)
+                if next_flag < 0:
+                    next_flag = length
+            if next_escape < position:
+                next_escape = chunk.find(HDLC_ESCAPE, position)
+                if next_escape < 0:
+                    next_escape = length
+            stop = min(next_flag, next_escape)
+            if self._synced and stop > position:
+                self._append(view[position:stop])
+            position = stop + 1
+            if stop == next_flag < length:
+                if self._synced:
+                    frame = self._end_frame()
+                    if frame is not None:
+                        frames.append(frame)
+                else:
+                    self._synced = True
+            elif stop == next_escape < length:
+                self._escape = self._synced
+        self._update_crc()
+        return frames
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        输入一段接收到的数据, 返回其中结束的帧; 不需要asyncio时也可以直接调用
+        gap方式的帧边界由end_of_frame给出
+        """
+        self.stats.bytes += len(chunk)
+        if self.framing == 'hdlc':
+            return self._feed_hdlc(chunk)
+        self._append(memoryview(chunk))
+        self._update_crc()
+        return []
+
+    def end_of_frame(self) -> Frame | None:
+        # 线路空闲或数据流结束, 结束当前帧; hdlc方式下未闭合的帧计为aborted
+        if self.framing == 'hdlc':
+            self._escape = False
+            return self._end_frame(aborted=True) if self._buffer else None
+        return self._end_frame()
+
+    async def frames(self, reader: asyncio.StreamReader):
+        """
+        异步迭代reader中的帧, 直到数据流结束
+        :param reader: asyncio.StreamReader或任何提供 async read(n) 的对象
+        """
+        while True:
+            if self.framing == 'gap' and self._buffer:
+                # 帧接收中, 等待下一段数据的时间超过gap即认为帧结束; StreamReader.read被取消时不会丢失数据
+                try:
+                    chunk = await asyncio.wait_for(reader.read(self.chunk_size), self.gap)
+                except asyncio.TimeoutError:
+                    frame = self.end_of_frame()
+                    if frame is not None:
+                        yield frame
+                    continue
+            else:
+                chunk = await reader.read(self.chunk_size)
+            if not chunk:
+                frame = self.end_of_frame()
+                if frame is not None:
+                    yield frame
+                return
+            for frame in self.feed(chunk):
+                yield frame
+
+    async def run(self, reader: asyncio.StreamReader, on_frame=None) -> FrameStats:
+        """
+        处理reader中的全部帧, 返回计数
+        :param on_frame: 每帧的回调, 参数为Frame, 可以是普通函数或协程函数
+        """
+        async for frame in self.frames(reader):
+            if on_frame is not None:
+                result = on_frame(frame)
+                if inspect.isawaitable(result):
+                    await result
+        return self.stats
+
+
+async def check_streams(readers, make_checker, on_frame=None) -> FrameStats:
+    """
+    同时校验多个数据流, 每个数据流使用独立的CRCFrameChecker, 返回合计的计数
+    :param readers: StreamReader列表
+    :param make_checker: 无参数函数, 返回一个新的CRCFrameChecker, 如CRCFrameChecker.x25
+    :param on_frame: 每帧的回调, 参数为 (数据流序号, Frame)
+    """
+    async def one(index, reader):
+        callback = None if on_frame is None else (lambda frame: on_frame(index, frame))
+        return await make_checker().run(reader, callback)
+    results = await asyncio.gather(*(one(index, reader) for index, reader in enumerate(readers)))
+    return sum(results, FrameStats())
+
+
+async def _self_test(protocol: str, frames: int, streams: int, size: int, bad_ratio: float,
+                     transport: str) -> None:
+    # 自测: 生成帧(部分破坏CRC)写入内存StreamReader或本机TCP回环, 统计吞吐与延迟并核对计数
+    import random
+    rng = random.Random(0)
+    make_checker = CRCFrameChecker.modbus_rtu if protocol == 'modbus' else CRCFrameChecker.x25
+    encoder = make_checker()
+    gap = encoder.gap
+    send_times = [dict() for _ in range(streams)]
+    latencies = []
+    expected_bad = 0
+    payloads = []
+    for _ in range(frames):
+        frame = bytearray(encoder.encode_frame(rng.randbytes(size)))
+        if rng.random() < bad_ratio:
+            # 破坏帧尾CRC的一个字节, 不改变帧定界
+            position = len(frame) - (2 if protocol == 'x25' else 1)
+            frame[position] = frame[position] ^ 0x01 if frame[position] ^ 0x01 not in (0x7D, 0x7E) else 0x00
+            expected_bad += 1
+        payloads.append(bytes(frame))
+
+    async def produce(index, write, close):
+        for number, frame in enumerate(payloads):
+            write(frame)
+            send_times[index][number] = time.perf_counter()
+            if gap:
+                await asyncio.sleep(gap * 2)  # Modbus RTU需要帧间空闲
+            elif number % 64 == 63:
+                await asyncio.sleep(0)
+        await close()
+
+    received = [0] * streams
+
+    def on_frame(index, frame):
+        latencies.append(frame.end_time - send_times[index][received[index]])
+        received[index] += 1
+
+    start = time.perf_counter()
+    if transport == 'memory':
+        readers = [asyncio.StreamReader(limit=1 << 24) for _ in range(streams)]
+
+        async def close_reader(reader):
+            reader.feed_eof()
+        producers = [produce(index, reader.feed_data, lambda reader=reader: close_reader(reader))
+                     for index, reader in enumerate(readers)]
+        stats, *_ = await asyncio.gather(check_streams(readers, make_checker, on_frame), *producers)
+    else:
+        readers = asyncio.Queue()
+
+        async def accept(reader, writer):
+            await readers.put((reader, writer))
+        server = await asyncio.start_server(accept, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        writers = [(await asyncio.open_connection('127.0.0.1', port))[1] for _ in range(streams)]
+        accepted = [await readers.get() for _ in range(streams)]
+
+        async def close_writer(writer):
+            await writer.drain()
+            writer.close()
+        producers = [produce(index, writer.write, lambda writer=writer: close_writer(writer))
+                     for index, writer in enumerate(writers)]
+        stats, *_ = await asyncio.gather(check_streams([reader for reader, _ in accepted], make_checker, on_frame),
+                                         *producers)
+        for _, writer in accepted:
+            writer.close()
+        server.close()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{protocol} {transport}: {stats.frames} 帧, 好帧 {stats.good}, 坏帧 {stats.bad} "
+          f"(期望 {expected_bad * streams}), {elapsed:.3f} s, {stats.frames / elapsed:.0f} 帧/s, "
+          f"{stats.bytes / elapsed / 1e6:.1f} MB/s")
+    if latencies:
+        print(f"延迟: 中位数 {latencies[len(latencies) // 2] * 1e6:.0f} us, "
+              f"99% {latencies[int(len(latencies) * 0.99)] * 1e6:.0f} us")
+    if stats.frames != frames * streams or stats.bad != expected_bad * streams:
+        raise RuntimeError("帧计数与期望不一致")
+
+
+def main(argv=None) -> int:
+    # 命令行入口: 用内存流或本机TCP回环测试帧校验的吞吐与延迟
+    import argparse
+    parser = argparse.ArgumentParser(description='流式帧CRC校验自测(吞吐与延迟)')
+    parser.add_argument('--protocol', default='x25', choices=['x25', 'modbus'], help='协议, 默认为x25')
+    parser.add_argument('--frames', type=int, default=10000, help='每个数据流的帧数, 默认为10000')
+    parser.add_argument('--streams', type=int, default=1, help='同时校验的数据流数, 默认为1')
+    parser.add_argument('--size', type=int, default=64, help='每帧的数据字节数(不含CRC), 默认为64')
+    parser.add_argument('--bad-ratio', type=float, default=0.01, help='CRC被破坏的帧的比例, 默认为0.01')
+    parser.add_argument('--transport', default='memory', choices=['memory', 'tcp'],
+                        help='memory为内存StreamReader, tcp为本机TCP回环, 默认为memory')
+    args = parser.parse_args(argv)
+    asyncio.run(_self_test(args.protocol, args.frames, args.streams, args.size, args.bad_ratio, args.transport))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
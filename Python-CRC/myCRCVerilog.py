@@ -0,0 +1,1345 @@
+'''
+Author       : Xu Xiaokang
+Email        :
+Date         : 2025-01-22 15:42:50
+LastEditors  : Xu Xiaokang
+LastEditTime : 2025-02-10 15:20:06
+Filename     :
+Description  : 生成Verilog CRC并行计算代码, 与myCRC.py中的CRC计算分开, 只计算CRC时无需导入本模块
+'''
+
+import os
+import re
+import time
+import heapq
+import json
+import hashlib
+import tempfile
+import numpy as np
+from myCRC import CRCConfig, _CRCCalculator
+
+_EQUATION_CACHE_VERSION = 2  # 生成代码的格式或算法改变时需增加此版本号, 使旧的缓存失效
+_EQUATION_CACHE_MAX_BYTES = 256 << 20  # 公式缓存目录的默认容量上限
+
+
+class CRCEquationCache:
+    """
+    Verilog CRC公式与生成代码的磁盘缓存
+    以版本号和生成参数(CRC宽度、多项式、数据位宽等)的SHA-256摘要作为文件名, 每项保存为一个JSON文件,
+    总大小超过上限时删除最久未使用的项
+    """
+    def __init__(self, cache_dir=None, max_bytes: int = _EQUATION_CACHE_MAX_BYTES):
+        # 默认缓存目录为环境变量MYCRC_CACHE_DIR, 未设置时为 ~/.cache/myCRC
+        if cache_dir is None:
+            cache_dir = os.environ.get('MYCRC_CACHE_DIR',
+                                       os.path.join(os.path.expanduser('~'), '.cache', 'myCRC'))
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _path(self, params: dict) -> str:
+        # 缓存项的文件路径
+        key = json.dumps({'version': _EQUATION_CACHE_VERSION, **params}, sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, params: dict):
+        # 读取缓存项, 不存在或已损坏时返回None; 命中时更新文件时间, 用于淘汰最久未使用的项
+        path = self._path(params)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('params') != params or entry.get('version') != _EQUATION_CACHE_VERSION:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, params: dict, entry: dict) -> None:
+        # 写入缓存项, 先写临时文件再替换, 避免并发读取到不完整的文件
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {'version': _EQUATION_CACHE_VERSION, 'params': params, **entry}
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(params))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict()
+
+    def _entries(self) -> list:
+        # 所有缓存文件的 (修改时间, 大小, 路径)
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if name.endswith('.json'):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        # 缓存占用的总字节数
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        # 总大小超过上限时, 按最近使用时间从旧到新删除, 最近使用的一项始终保留
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        # 删除所有缓存项
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def verify(self, remove: bool = False) -> list:
+        """
+        重新生成每个缓存项并与缓存内容比较
+        :param remove: 是否删除不一致的缓存项
+        :return: 不一致的缓存项的参数列表
+        """
+        mismatched = []
+        for _, _, path in self._entries():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                params = entry['params']
+                if entry.get('version') != _EQUATION_CACHE_VERSION:
+                    continue
+                # 流水线模块的参数中含有完整的CRC配置, 其他代码只与宽度和多项式有关
+                config = CRCConfig(**{name: params[name] for name in CRCConfig.__dataclass_fields__
+                                      if name in params})
+                fresh = CRCVerilog(config)._build_entry(params)
+                ok = all(entry.get(name) == fresh[name] for name in fresh)
+            except (OSError, ValueError, KeyError, TypeError):
+                params, ok = {'path': path}, False
+            if not ok:
+                mismatched.append(params)
+                if remove:
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+        return mismatched
+
+
+class CRCVerilog(_CRCCalculator):
+    """
+    生成Verilog CRC并行计算的异或代码
+    每个输出位的公式表示为一对整数位掩码 (crc_mask, din_mask), 第k位为1表示公式中含有crc[k]或din_xor[k]
+    指定cache(CRCEquationCache)时, 生成结果保存到磁盘缓存, 相同参数再次生成时直接读取
+    """
+    def __init__(self, crc_config: CRCConfig, cache: CRCEquationCache = None):
+        super().__init__(crc_config)
+        self.cache = cache
+
+    def _data_terms(self, data_index: list) -> list:
+        # 数据行向量D与状态转移矩阵各次幂相乘, 得到每个输出列所含的数据位
+        # data_index[p]为D中第p个元素对应的din_xor下标, None表示该位置为0
+        N = self.N
+        j, i = divmod(len(data_index), N)
+        masks = [0] * N
+        for k in range(j):
+            # 第k段数据乘以T^(N*(j-1-k)+i)
+            rows = self.T.power(N * (j - 1 - k) + i).rows
+            for q in range(N):
+                index = data_index[k * N + q]
+                if index is None:
+                    continue
+                bit = 1 << index
+                row = rows[q]
+                for col in range(N):
+                    if (row >> (N - 1 - col)) & 1:
+                        masks[col] ^= bit
+        # 处理余数项, 乘以单位矩阵
+        for q in range(i):
+            index = data_index[j * N + q]
+            if index is not None:
+                masks[q] ^= 1 << index
+        return masks
+
+    def _state_terms(self, power: int) -> list:
+        # 状态行向量C与T^power相乘, 得到每个输出列所含的crc位, C的第q个元素为crc[N-1-q]
+        N = self.N
+        rows = self.T.power(power).rows
+        masks = [0] * N
+        for q in range(N):
+            bit = 1 << (N - 1 - q)
+            row = rows[q]
+            for col in range(N):
+                if (row >> (N - 1 - col)) & 1:
+                    masks[col] ^= bit
+        return masks
+
+    def _crc_one_step_formula(self, din_width: int) -> list:
+        # Verilog CRC计算单步并行公式, 返回每个输出列的 (crc_mask, din_mask)
+        N = self.N
+        # 判断din_width是否大于0
+        if din_width == 0:
+            raise ValueError("din_width must be greater than 0")
+        # 生成数据行向量, 输入位宽变为8的倍数, 然后加上N
+        total_width = ((din_width + 7) // 8) * 8 + N
+        # 取前total_width-d_min个元素, 后补d_min个0
+        d_min = min(din_width, N)
+        data_index = [total_width - 1 - p for p in range(total_width - d_min)] + [None] * d_min
+        return [(0, mask) for mask in self._data_terms(data_index)]
+
+    def _split_long_line(self, line: str, len_limit: int = 100) -> list:
+        """
+        分割长度超过指定限制的行，使得每个分割出来的部分都以'^'开头。
+        :param line: 要分割的字符串
+        :param len_limit: 单行的最大长度限制，默认为100
+        :return: 分割后的字符串列表
+        """
+        if len(line) <= len_limit:
+            return [line]
+        parts = []
+        while len(line) > len_limit:
+            split_index = line.rfind('^', 0, len_limit)
+            parts.append(line[:split_index])
+            line = ' ' * 20 + line[split_index:]
+        parts.append(line)
+        return parts
+
+    def _mask_indexes(self, mask: int) -> list:
+        # 整数位掩码中为1的位的下标, 从小到大排列
+        indexes = []
+        while mask:
+            low_bit = mask & -mask
+            indexes.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return indexes
+
+    def _formula_to_verilog(self, name: str, formula: list) -> list:
+        # 将每个输出列的 (crc_mask, din_mask) 转换为Verilog赋值语句, 输出列与CRC位的顺序相反
+        lines = []
+        for i, (crc_mask, din_mask) in enumerate(formula[::-1]):
+            terms = ([f'crc[{k}]' for k in self._mask_indexes(crc_mask)]
+                     + [f'din_xor[{k}]' for k in self._mask_indexes(din_mask)])
+            item = ' ^ '.join(terms) if terms else '0'
+            new_item = f'assign {name}[{i}] = ' + item + ';'
+            # 对过长的行进行分割
+            lines.extend(self._split_long_line(new_item))
+        return lines
+
+    def _popcount64(self, values: np.ndarray) -> np.ndarray:
+        # uint64数组中每个数的1的个数
+        if hasattr(np, 'bitwise_count'):
+            return np.bitwise_count(values)
+        popcount8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+        return popcount8[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+    def _optimize_xor(self, equations: list, max_depth: int = None):
+        """
+        提取多个输出位之间共用的异或子表达式(贪心选取被最多输出共用的两项), 再将每个输出构造成平衡异或树
+        :param equations: 每个输出位的异或项列表
+        :param max_depth: 逻辑深度上限, 默认为不共用子表达式时平衡树的深度, 不能小于该深度
+        :return: (wires, outputs, report), wires为 [(项a, 项b)], 第k项对应中间信号k;
+                 outputs为每个输出位的 [(深度, 项)]; 项为 ('in', 名称) 或 ('wire', k)
+        """
+        # 变量按首次出现的顺序编号, cols[v]的第o位为1表示第o个输出含有变量v
+        names = []
+        index = {}
+        for terms in equations:
+            for term in terms:
+                if term not in index:
+                    index[term] = len(names)
+                    names.append(term)
+        term_counts = [len(terms) for terms in equations]
+        min_depth = max((count - 1).bit_length() for count in term_counts) if term_counts else 0
+        if max_depth is not None and max_depth < min_depth:
+            raise ValueError(f"max_depth can't be less than the balanced tree depth {min_depth}")
+        limit = min_depth if max_depth is None else max_depth
+        capacity = max(2 * len(names), 16)
+        cols = np.zeros(capacity, dtype=np.uint64)
+        depth = np.zeros(capacity, dtype=np.int64)
+        for o, terms in enumerate(equations):
+            for term in terms:
+                cols[index[term]] |= np.uint64(1 << o)
+        # 每个输出的权重为各项2^深度之和, 平衡树深度不超过limit的条件是权重不超过2^limit
+        weight = np.array(term_counts, dtype=np.int64)
+        nodes = [('in', name) for name in names]
+        wires = []
+        blocked = {}
+        size = len(names)
+        best_count = np.zeros(capacity, dtype=np.int64)
+        best_partner = np.zeros(capacity, dtype=np.int64)
+
+        def pair_counts(v: int) -> np.ndarray:
+            # 变量v与其它所有变量共同出现的输出数, 超过深度上限或已被排除的组合记为0
+            counts = self._popcount64(cols[:size] & cols[v]).astype(np.int64)
+            counts[v] = 0
+            counts[np.maximum(depth[:size], depth[v]) + 1 > limit] = 0
+            for u in blocked.get(v, ()):
+                counts[u] = 0
+            return counts
+
+        def update_row(v: int) -> None:
+            counts = pair_counts(v)
+            partner = int(np.argmax(counts))
+            best_count[v] = counts[partner]
+            best_partner[v] = partner
+
+        for v in range(size):
+            update_row(v)
+        while size:
+            v = int(np.argmax(best_count[:size]))
+            if best_count[v] < 2:
+                break
+            u = int(best_partner[v])
+            # 最优值可能已过期(共用数只会减少), 过期则重新计算该行
+            if pair_counts(v)[u] != best_count[v]:
+                update_row(v)
+                continue
+            common = int(cols[v] & cols[u])
+            new_depth = int(max(depth[v], depth[u])) + 1
+            delta = (1 << new_depth) - (1 << int(depth[v])) - (1 << int(depth[u]))
+            # 只在替换后仍满足深度上限的输出中共用
+            usable = 0
+            for o in range(len(equations)):
+                if (common >> o) & 1 and weight[o] + delta <= (1 << limit):
+                    usable |= 1 << o
+            if bin(usable).count('1') < 2:
+                blocked.setdefault(v, set()).add(u)
+                blocked.setdefault(u, set()).add(v)
+                update_row(v)
+                update_row(u)
+                continue
+            if size == capacity:
+                capacity *= 2
+                cols = np.resize(cols, capacity)
+                depth = np.resize(depth, capacity)
+                best_count = np.resize(best_count, capacity)
+                best_partner = np.resize(best_partner, capacity)
+            t = size
+            size += 1
+            cols[t] = np.uint64(usable)
+            cols[v] &= ~np.uint64(usable)
+            cols[u] &= ~np.uint64(usable)
+            depth[t] = new_depth
+            for o in range(len(equations)):
+                if (usable >> o) & 1:
+                    weight[o] += delta
+            nodes.append(('wire', len(wires)))
+            wires.append((nodes[v], nodes[u]))
+            # 新变量只可能使其它行的最优值变大
+            update_row(t)
+            counts = pair_counts(t)
+            better = counts > best_count[:size]
+            best_count[:size][better] = counts[better]
+            best_partner[:size][better] = t
+            update_row(v)
+            update_row(u)
+
+        outputs = []
+        for o in range(len(equations)):
+            bit = np.uint64(1 << o)
+            outputs.append([(int(depth[v]), nodes[v]) for v in range(size) if cols[v] & bit])
+        gates_after = len(wires) + sum(max(len(terms) - 1, 0) for terms in outputs)
+        depth_after = max((self._xor_tree(terms)[0] for terms in outputs), default=0)
+        report = {
+            'gates_before': sum(max(count - 1, 0) for count in term_counts),
+            'depth_before': min_depth,
+            'gates_after': gates_after,
+            'depth_after': depth_after,
+        }
+        return wires, outputs, report
+
+    def _xor_tree(self, terms: list, node_name=str) -> tuple:
+        # 将 [(深度, 项)] 组合为深度最小的异或树, 每次合并深度最小的两项, 返回 (深度, 表达式)
+        if not terms:
+            return 0, '0'
+        heap = [(d, order, node_name(term)) for order, (d, term) in enumerate(terms)]
+        heapq.heapify(heap)
+        order = len(heap)
+        while len(heap) > 1:
+            d1, _, a = heapq.heappop(heap)
+            d2, _, b = heapq.heappop(heap)
+            expr = f'{a} ^ {b}'
+            if heap:
+                expr = f'({expr})'
+            heapq.heappush(heap, (max(d1, d2) + 1, order, expr))
+            order += 1
+        return heap[0][0], heap[0][2]
+
+    def _optimized_formula_to_verilog(self, name: str, formula: list, max_depth: int = None) -> tuple:
+        # 将公式优化后转换为Verilog代码, 共用的子表达式声明为中间信号 {name}_t{k}
+        equations = []
+        for crc_mask, din_mask in formula[::-1]:
+            equations.append([f'crc[{k}]' for k in self._mask_indexes(crc_mask)]
+                             + [f'din_xor[{k}]' for k in self._mask_indexes(din_mask)])
+        wires, outputs, report = self._optimize_xor(equations, max_depth)
+
+        def node_name(node):
+            kind, value = node
+            return value if kind == 'in' else f'{name}_t{value}'
+
+        lines = []
+        for k, (a, b) in enumerate(wires):
+            lines.append(f'wire {name}_t{k} = {node_name(a)} ^ {node_name(b)};')
+        for i, terms in enumerate(outputs):
+            _, item = self._xor_tree(terms, node_name)
+            lines.extend(self._split_long_line(f'assign {name}[{i}] = ' + item + ';'))
+        return lines, report
+
+    def _xor_report_lines(self, name: str, report: dict) -> list:
+        # 异或优化前后的门数与逻辑深度, 写入生成代码的注释中
+        return [f'{name} 异或优化前: 2输入异或门 {report["gates_before"]} 个, '
+                f'逻辑深度 {report["depth_before"]} 级',
+                f'{name} 异或优化后: 2输入异或门 {report["gates_after"]} 个, '
+                f'逻辑深度 {report["depth_after"]} 级']
+
+    def _one_step_entry(self, din_width: int, optimize: bool, max_depth: int) -> dict:
+        # 生成单步计算的公式与Verilog代码
+        verilog_crc_one_step_list = []
+        verilog_crc_one_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 begin')
+        verilog_crc_one_step_list.append('/*')
+        verilog_crc_one_step_list.append('单步计算CRC')
+        verilog_crc_one_step_list.append('CRC宽度: ' + str(self.N))
+        verilog_crc_one_step_list.append('CRC多项式: '
+                                            + f'0x{self.crc_config.poly:0{(self.N+3)//4}x}')
+        verilog_crc_one_step_list.append('输入数据位宽: ' + str(din_width))
+        # 单步CRC计算公式
+        formula = self._crc_one_step_formula(din_width)
+        reports = {}
+        if optimize:
+            lines, reports['crc_calc'] = self._optimized_formula_to_verilog('crc_calc', formula, max_depth)
+            verilog_crc_one_step_list.extend(self._xor_report_lines('crc_calc', reports['crc_calc']))
+        else:
+            lines = self._formula_to_verilog('crc_calc', formula)
+        verilog_crc_one_step_list.append('*/')
+        verilog_crc_one_step_list.extend(lines)
+        verilog_crc_one_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 end')
+        return {
+            'formulas': {'crc_calc': self._formula_to_json(formula)},
+            'report': reports,
+            'code': '\n'.join(verilog_crc_one_step_list),
+        }
+
+    def _formula_to_json(self, formula: list) -> list:
+        # 公式的位掩码转为16进制字符串, 便于保存为JSON
+        return [[f'{crc_mask:x}', f'{din_mask:x}'] for crc_mask, din_mask in formula]
+
+    def _build_entry(self, params: dict) -> dict:
+        # 根据缓存参数生成公式与代码
+        if params['kind'] == 'one_step':
+            return self._one_step_entry(params['din_width'], params['optimize'], params['max_depth'])
+        if params['kind'] == 'pipelined':
+            return self._pipelined_entry(params['din_width'], params['last_din_width'], params['stages'])
+        if params['kind'] == 'multi_step_last_variants':
+            return self._multi_step_last_variants_entry(params['din_width'], params['last_din_widths'],
+                                                        params['style'])
+        return self._multi_step_entry(params['din_width'], params['last_din_width'],
+                                      params['optimize'], params['max_depth'])
+
+    def _generate(self, params: dict, copy_to_clipboard: bool) -> str:
+        # 优先从磁盘缓存读取, 未命中时生成并写入缓存
+        params = {'width': self.N, 'poly': self.crc_config.poly, **params}
+        entry = self.cache.get(params) if self.cache is not None else None
+        if entry is None:
+            entry = self._build_entry(params)
+            if self.cache is not None:
+                self.cache.put(params, entry)
+        if params.get('optimize'):
+            self.xor_report = entry['report']
+        if params['kind'] == 'pipelined':
+            self.pipeline_report = entry['report']
+        code = entry['code']
+        # 代码复制到剪贴板, 便于直接粘贴; 无剪贴板的环境(如CI)不需要此功能, 因此按需导入pyperclip
+        if copy_to_clipboard:
+            import pyperclip
+            pyperclip.copy(code)
+        return code
+
+    def generate_verilog_crc_one_step_code(self, din_width, optimize: bool = False,
+                                           max_depth: int = None,
+                                           copy_to_clipboard: bool = False) -> str:
+        """
+        将输入行向量转换为Verilog crc_calc赋值语句
+        :param din_width: 输入数据宽度
+        :param optimize: 是否提取共用的异或子表达式并构造平衡异或树
+        :param max_depth: 优化时的逻辑深度上限, 默认为不共用子表达式时平衡树的深度, 不能小于该深度
+        :param copy_to_clipboard: 是否将生成的代码复制到剪贴板, 需要安装pyperclip
+        :return: 生成的Verilog代码字符串
+        """
+        return self._generate({'kind': 'one_step', 'din_width': din_width,
+                               'optimize': optimize, 'max_depth': max_depth}, copy_to_clipboard)
+
+    def _crc_multi_step_formula(self, din_width: int) -> list:
+        # Verilog CRC计算多步并行公式, 返回每个输出列的 (crc_mask, din_mask)
+        N = self.N
+        # 判断din_width是否大于0, 并且小于等于N
+        if din_width == 0:
+            raise ValueError("din_width must be greater than 0")
+        if din_width < N:
+            raise ValueError("din_width can't be less than CRC width")
+        # 第一项为状态行向量乘以T^din_width, 其余为数据行向量各段的贡献
+        # din_width不是N的整数倍时, 数据前补0使其按N对齐, 最后一段数据不足N位的余数项才会对应到寄存器低位
+        state_masks = self._state_terms(din_width)
+        data_index = [None] * (-din_width % N) + [din_width - 1 - p for p in range(din_width)]
+        data_masks = self._data_terms(data_index)
+        return list(zip(state_masks, data_masks))
+
+    def _crc_multi_step_formula_last(self, din_width: int, last_din_width: int) -> list:
+        # Verilog CRC计算多步并行公式(最后一段数据), 返回每个输出列的 (crc_mask, din_mask)
+        N = self.N
+        # 判断last_din_width是否大于0, 并且小于等于N
+        if last_din_width == 0:
+            raise ValueError("last_din_width must be greater than 0")
+        if last_din_width > din_width:
+            raise ValueError("last_din_width can't be greater than din_width")
+        # 取前last_din_width个数据, 后补N个0
+        data_index = [din_width - 1 - p for p in range(last_din_width)] + [None] * N
+        state_masks = self._state_terms(last_din_width + N)
+        data_masks = self._data_terms(data_index)
+        return list(zip(state_masks, data_masks))
+
+    def _crc_multi_step_formula_last_variants(self, din_width: int, last_din_widths: list) -> dict:
+        # 一次计算所有最后一段数据位宽的公式, 返回 {last_din_width: [(crc_mask, din_mask), ...]}
+        # 最后一段数据中din_xor[d]的贡献为 e_(N-1)·T^(d+L+N-din_width), 各位宽只是指数整体平移,
+        # 因此只需递推一次 v_s = e_(N-1)·T^s, 按输出列拼成整数后移位截取即可得到各位宽的数据项
+        N = self.N
+        if din_width < N:
+            raise ValueError("din_width can't be less than CRC width")
+        for last_din_width in last_din_widths:
+            if last_din_width <= 0 or last_din_width % 8:
+                raise ValueError("last_din_width must be a positive multiple of 8")
+            if last_din_width > din_width:
+                raise ValueError("last_din_width can't be greater than din_width")
+        # columns[col]的第s位为v_s的第col列
+        columns = [0] * N
+        vector = 1
+        for s in range(max(last_din_widths) + N):
+            for col in range(N):
+                if (vector >> (N - 1 - col)) & 1:
+                    columns[col] |= 1 << s
+            vector = self.T.vector_times(vector)
+        formulas = {}
+        for last_din_width in last_din_widths:
+            shift = last_din_width + N - din_width
+            window = (1 << din_width) - (1 << (din_width - last_din_width))
+            data_masks = [(column >> shift if shift >= 0 else column << -shift) & window
+                          for column in columns]
+            # 状态项乘以T^(last_din_width+N), 矩阵的幂在各位宽间共用缓存
+            state_masks = self._state_terms(last_din_width + N)
+            formulas[last_din_width] = list(zip(state_masks, data_masks))
+        return formulas
+
+    def _formula_to_verilog_statements(self, name: str, formula: list, indent: str) -> list:
+        # 与_formula_to_verilog相同, 但生成always块或function中的阻塞赋值语句
+        lines = []
+        for i, (crc_mask, din_mask) in enumerate(formula[::-1]):
+            terms = ([f'crc[{k}]' for k in self._mask_indexes(crc_mask)]
+                     + [f'din_xor[{k}]' for k in self._mask_indexes(din_mask)])
+            item = ' ^ '.join(terms) if terms else '0'
+            lines.extend(self._split_long_line(f'{indent}{name}[{i}] = ' + item + ';'))
+        return lines
+
+    def _multi_step_last_variants_entry(self, din_width: int, last_din_widths: list,
+                                        style: str) -> dict:
+        # 生成所有最后一段数据位宽的公式与Verilog代码
+        if style not in ('case', 'function'):
+            raise ValueError("style must be 'case' or 'function'")
+        formulas = self._crc_multi_step_formula_last_variants(din_width, last_din_widths)
+        verilog_list = []
+        verilog_list.append('// 此部分代码由Python程序生成 请勿手动修改 begin')
+        verilog_list.append('/*')
+        verilog_list.append('多步计算CRC-最后一段数据的所有位宽')
+        verilog_list.append('CRC宽度: ' + str(self.N))
+        verilog_list.append('CRC多项式: ' + f'0x{self.crc_config.poly:0{(self.N+3)//4}x}')
+        verilog_list.append('输入数据位宽: ' + str(din_width))
+        verilog_list.append('最后一段数据位宽: ' + ', '.join(str(w) for w in last_din_widths))
+        if style == 'case':
+            verilog_list.append('crc_calc_last需声明为reg, 并由last_din_bytes选择, '
+                                'last_din_bytes为最后一段数据的有效字节数, 须与din_xor对齐到同一拍')
+            verilog_list.append('最后一段数据位于din_xor的高位')
+        else:
+            verilog_list.append('每个位宽对应一个函数, 例如 crc_calc_last_8(crc, din_xor)')
+            verilog_list.append('最后一段数据位于din_xor的高位')
+        verilog_list.append('*/')
+        if style == 'case':
+            verilog_list.append('always @(*) begin')
+            verilog_list.append('  case (last_din_bytes)')
+            for last_din_width in last_din_widths:
+                verilog_list.append(f"    'd{last_din_width // 8}: begin")
+                verilog_list.extend(self._formula_to_verilog_statements(
+                    'crc_calc_last', formulas[last_din_width], ' ' * 6))
+                verilog_list.append('    end')
+            verilog_list.append("    default: crc_calc_last = 'd0;")
+            verilog_list.append('  endcase')
+            verilog_list.append('end')
+        else:
+            for last_din_width in last_din_widths:
+                name = f'crc_calc_last_{last_din_width}'
+                verilog_list.append(f'function [WIDTH-1 : 0] {name};')
+                verilog_list.append('  input [WIDTH-1 : 0] crc;')
+                verilog_list.append('  input [DIN_WIDTH-1 : 0] din_xor;')
+                verilog_list.append('  begin')
+                verilog_list.extend(self._formula_to_verilog_statements(
+                    name, formulas[last_din_width], ' ' * 4))
+                verilog_list.append('  end')
+                verilog_list.append('endfunction')
+        verilog_list.append('// 此部分代码由Python程序生成 请勿手动修改 end')
+        return {
+            'formulas': {f'crc_calc_last_{w}': self._formula_to_json(f) for w, f in formulas.items()},
+            'report': {},
+            'code': '\n'.join(verilog_list),
+        }
+
+    def _multi_step_entry(self, din_width: int, last_din_width: int, optimize: bool,
+                          max_depth: int) -> dict:
+        # 生成多步计算的公式与Verilog代码
+        verilog_crc_multi_step_list = []
+        # 添加注释
+        verilog_crc_multi_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 begin')
+        verilog_crc_multi_step_list.append('/*')
+        verilog_crc_multi_step_list.append('多步计算CRC')
+        verilog_crc_multi_step_list.append('CRC宽度: ' + str(self.N))
+        verilog_crc_multi_step_list.append('CRC多项式: '
+                                            + f'0x{self.crc_config.poly:0{(self.N+3)//4}x}')
+        verilog_crc_multi_step_list.append('输入数据位宽: ' + str(din_width))
+        verilog_crc_multi_step_list.append('最后一段数据位宽: ' + str(last_din_width))
+        # 多步CRC计算第一部分
+        formula = self._crc_multi_step_formula(din_width)
+        # 多步CRC计算第二部分
+        formula_last = self._crc_multi_step_formula_last(din_width, last_din_width)
+        reports = {}
+        if optimize:
+            lines, reports['crc_calc'] = self._optimized_formula_to_verilog('crc_calc', formula, max_depth)
+            lines_last, reports['crc_calc_last'] = self._optimized_formula_to_verilog(
+                'crc_calc_last', formula_last, max_depth)
+            verilog_crc_multi_step_list.extend(self._xor_report_lines('crc_calc', reports['crc_calc']))
+            verilog_crc_multi_step_list.extend(
+                self._xor_report_lines('crc_calc_last', reports['crc_calc_last']))
+        else:
+            lines = self._formula_to_verilog('crc_calc', formula)
+            lines_last = self._formula_to_verilog('crc_calc_last', formula_last)
+        verilog_crc_multi_step_list.append('*/')
+        verilog_crc_multi_step_list.extend(lines)
+        # 添加注释
+        verilog_crc_multi_step_list.append('// 最后一段数据的计算代码, 已考虑了补CRC宽度个0')
+        verilog_crc_multi_step_list.extend(lines_last)
+        # 添加注释
+        verilog_crc_multi_step_list.append('// 此部分代码由Python程序生成 请勿手动修改 end')
+        return {
+            'formulas': {'crc_calc': self._formula_to_json(formula),
+                         'crc_calc_last': self._formula_to_json(formula_last)},
+            'report': reports,
+            # 转为字符串
+            'code': '\n'.join(verilog_crc_multi_step_list),
+        }
+
+    def generate_verilog_crc_multi_step_code(self, din_width: int, last_din_width: int,
+                                             optimize: bool = False, max_depth: int = None,
+                                             copy_to_clipboard: bool = False) -> str:
+        """
+        将输入行向量转换为Verilog crc_calc赋值语句
+        :param din_width: 输入数据宽度
+        :param last_din_width: 最后一段数据宽度
+        :param optimize: 是否提取共用的异或子表达式并构造平衡异或树
+        :param max_depth: 优化时的逻辑深度上限, 默认为不共用子表达式时平衡树的深度, 不能小于该深度
+        :param copy_to_clipboard: 是否将生成的代码复制到剪贴板, 需要安装pyperclip
+        :return: 生成的Verilog代码字符串
+        """
+        return self._generate({'kind': 'multi_step', 'din_width': din_width,
+                               'last_din_width': last_din_width,
+                               'optimize': optimize, 'max_depth': max_depth}, copy_to_clipboard)
+
+    def generate_verilog_crc_multi_step_last_variants_code(self, din_width: int,
+                                                           last_din_widths: list = None,
+                                                           style: str = 'case',
+                                                           copy_to_clipboard: bool = False) -> str:
+        """
+        一次生成最后一段数据所有位宽的crc_calc_last计算代码, 用于最后一段数据长度可变的场合
+        :param din_width: 输入数据宽度
+        :param last_din_widths: 最后一段数据宽度列表, 均为8的倍数, 默认为8到din_width步进8
+        :param style: 'case'生成按last_din_bytes选择的case语句, 'function'生成每个位宽一个函数
+        :param copy_to_clipboard: 是否将生成的代码复制到剪贴板, 需要安装pyperclip
+        :return: 生成的Verilog代码字符串
+        """
+        if last_din_widths is None:
+            last_din_widths = range(8, din_width + 1, 8)
+        return self._generate({'kind': 'multi_step_last_variants', 'din_width': din_width,
+                               'last_din_widths': sorted(set(last_din_widths)), 'style': style},
+                              copy_to_clipboard)
+
+    def _mul_xpow(self, value: int, shift: int) -> int:
+        # value·x^shift mod P, value的第k位为x^k的系数; shift为负数时乘以x的逆元, 要求多项式含常数项
+        N = self.N
+        poly = (1 << N) | self.crc_config.poly
+        if shift >= 0:
+            for _ in range(shift):
+                value <<= 1
+                if value >> N:
+                    value ^= poly
+        else:
+            for _ in range(-shift):
+                if value & 1:
+                    value ^= poly
+                value >>= 1
+        return value
+
+    def _shift_masks(self, shift: int) -> list:
+        # 寄存器乘以x^shift的矩阵, masks[i]的第m位为1表示输出第i位含输入第m位
+        masks = [0] * self.N
+        for m in range(self.N):
+            for i in self._mask_indexes(self._mul_xpow(1 << m, shift)):
+                masks[i] |= 1 << m
+        return masks
+
+    def _segment_masks(self, din_width: int, start: int, stop: int) -> list:
+        # 数据位置[start, stop)的一段补N个0后的余数, 位置0为din_xor的最高位, masks[i]为输出第i位所含din_xor位的掩码
+        masks = [0] * self.N
+        image = self._mul_xpow(1, self.N)
+        for p in range(stop - 1, start - 1, -1):
+            bit = 1 << (din_width - 1 - p)
+            for i in self._mask_indexes(image):
+                masks[i] |= bit
+            image = self._mul_xpow(image, 1)
+        return masks
+
+    def _pipeline_plan(self, din_width: int, stages: int) -> list:
+        # 流水线每一级的节点 [(节点名, [(输入信号, 掩码)])]
+        # 第1级将数据分为2^(stages-1)段, 并行计算各段的余数; 之后每级将相邻两段合并: 前段余数·T^(后段位宽) ^ 后段余数
+        N = self.N
+        segments = 1 << (stages - 1)
+        if segments > din_width:
+            raise ValueError("流水级数过多, 数据段数不能超过din_width")
+        bounds = [din_width * s // segments for s in range(segments + 1)]
+        level = []
+        nodes = []
+        for j in range(segments):
+            name = f'crc_s1_{j}'
+            nodes.append((name, [('din_xor', self._segment_masks(din_width, bounds[j], bounds[j + 1]))]))
+            level.append((name, bounds[j], bounds[j + 1]))
+        plan = [nodes]
+        identity = [1 << i for i in range(N)]
+        shift_masks = {}
+        for k in range(2, stages + 1):
+            nodes = []
+            merged = []
+            for j in range(len(level) // 2):
+                (left, start, _), (right, middle, stop) = level[2 * j], level[2 * j + 1]
+                if stop - middle not in shift_masks:
+                    shift_masks[stop - middle] = self._shift_masks(stop - middle)
+                name = f'crc_s{k}_{j}'
+                nodes.append((name, [(f'{left}_r', shift_masks[stop - middle]), (f'{right}_r', identity)]))
+                merged.append((name, start, stop))
+            plan.append(nodes)
+            level = merged
+        return plan
+
+    def _sources_to_verilog(self, name: str, sources: list) -> list:
+        # 将 [(输入信号, 掩码)] 形式的公式转换为Verilog赋值语句
+        lines = []
+        for i in range(self.N):
+            terms = [f'{signal}[{k}]' for signal, masks in sources for k in self._mask_indexes(masks[i])]
+            item = ' ^ '.join(terms) if terms else '0'
+            lines.extend(self._split_long_line(f'assign {name}[{i}] = ' + item + ';'))
+        return lines
+
+    def _sources_xor_cost(self, sources: list) -> tuple:
+        # 按平衡异或树计算 (2输入异或门数, 逻辑深度)
+        counts = [sum(bin(masks[i]).count('1') for _, masks in sources) for i in range(self.N)]
+        gates = sum(max(count - 1, 0) for count in counts)
+        depth = max((count - 1).bit_length() for count in counts) if any(counts) else 0
+        return gates, depth
+
+    def _pipelined_entry(self, din_width: int, last_din_width: int, stages: int) -> dict:
+        # 生成流水线CRC计算的完整Verilog模块
+        N = self.N
+        config = self.crc_config
+        if din_width <= 0 or din_width % 8:
+            raise ValueError("din_width must be a positive multiple of 8")
+        if last_din_width <= 0 or last_din_width % 8 or last_din_width > din_width:
+            raise ValueError("last_din_width must be a positive multiple of 8 and not greater than din_width")
+        if stages < 1:
+            raise ValueError("stages must be at least 1")
+        if last_din_width != din_width and not config.poly & 1:
+            raise ValueError("last_din_width小于din_width时需要乘以T的逆, 多项式必须含常数项")
+        plan = self._pipeline_plan(din_width, stages)
+        identity = [1 << i for i in range(N)]
+        feedback = [('crc', self._shift_masks(din_width)), (f'{plan[-1][0][0]}_r', identity)]
+        output = [('crc_last', self._shift_masks(last_din_width - din_width))]
+
+        # 每级的逻辑深度、异或门数与寄存器数(含随数据传递的有效、首、尾指示)
+        report = [{'stage': 'din_r', 'xor_depth': 0, 'xor_gates': 0, 'registers': din_width + 3},
+                  {'stage': 'din_xor', 'xor_depth': 0, 'xor_gates': 0, 'registers': din_width + 3}]
+        for k, nodes in enumerate(plan, 1):
+            costs = [self._sources_xor_cost(sources) for _, sources in nodes]
+            report.append({'stage': f's{k}', 'xor_depth': max(depth for _, depth in costs),
+                           'xor_gates': sum(gates for gates, _ in costs), 'registers': len(nodes) * N + 3})
+        gates, depth = self._sources_xor_cost(feedback)
+        # 反馈环中还有一级选择初值XOR_IN的多路选择器, 不计入异或深度
+        report.append({'stage': 'crc', 'xor_depth': depth, 'xor_gates': gates, 'registers': 2 * N + 1})
+        gates, depth = self._sources_xor_cost(output)
+        report.append({'stage': 'crc_out', 'xor_depth': depth, 'xor_gates': gates, 'registers': 2 * N + 2})
+
+        generated = []
+        generated.append('// 此部分代码由Python程序生成 请勿手动修改 begin')
+        generated.append('/*')
+        generated.append('流水线计算CRC')
+        generated.append('CRC宽度: ' + str(N))
+        generated.append('CRC多项式: ' + f'0x{config.poly:0{(N+3)//4}x}')
+        generated.append('输入数据位宽: ' + str(din_width))
+        generated.append('最后一段数据位宽: ' + str(last_din_width))
+        generated.append('数据余数流水级数: ' + str(stages) + ', 数据段数: ' + str(len(plan[0])))
+        generated.append('各级逻辑深度与资源(2输入异或门按平衡异或树计算):')
+        for item in report:
+            generated.append(f'  {item["stage"]:<8} 异或深度 {item["xor_depth"]:>2} 级, '
+                             f'2输入异或门 {item["xor_gates"]:>6} 个, 寄存器 {item["registers"]:>5} 个')
+        generated.append('*/')
+        for k, nodes in enumerate(plan, 1):
+            generated.append(f'// 第{k}级: ' + ('各段数据的余数' if k == 1 else '相邻两段的余数合并'))
+            for name, sources in nodes:
+                generated.append(f'wire [WIDTH-1 : 0] {name};')
+                generated.extend(self._sources_to_verilog(name, sources))
+            for name, _ in nodes:
+                generated.append(f'reg  [WIDTH-1 : 0] {name}_r;')
+            generated.append('always @(posedge clk) begin')
+            for name, _ in nodes:
+                generated.append(f'  {name}_r <= {name};')
+            generated.append('end')
+        generated.append('// 反馈: crc·T^DIN_WIDTH 与数据余数异或')
+        generated.extend(self._sources_to_verilog('crc_calc', feedback))
+        generated.append('// 输出: 最后一段数据按整段计算, 乘以T^-(DIN_WIDTH-LAST_DIN_WIDTH)还原')
+        generated.extend(self._sources_to_verilog('crc_calc_last', output))
+        generated.append('// 此部分代码由Python程序生成 请勿手动修改 end')
+
+        code = _PIPELINED_MODULE_TEMPLATE.format(
+            din_width=din_width, last_din_width=last_din_width, stages=stages, width=N,
+            reflect_in=int(config.reflect_in), xor_in=f'{config.xor_in:X}',
+            reflect_out=int(config.reflect_out), xor_out=f'{config.xor_out:X}',
+            latency=stages + 5, generated='\n'.join(generated))
+        formulas = {name: [f'{masks[i]:x}' for _, masks in sources for i in range(N)]
+                    for nodes in plan for name, sources in nodes}
+        formulas['crc_calc'] = [f'{masks[i]:x}' for _, masks in feedback for i in range(N)]
+        formulas['crc_calc_last'] = [f'{masks[i]:x}' for _, masks in output for i in range(N)]
+        return {'formulas': formulas, 'report': report, 'code': code}
+
+    def generate_verilog_crc_pipelined_code(self, din_width: int, stages: int, last_din_width: int = None,
+                                            copy_to_clipboard: bool = False) -> str:
+        """
+        生成流水线CRC计算的完整Verilog模块(myCrcPipelined), 接口与myCrcMultiStep相同
+        数据余数分为stages级流水计算, 反馈环只有 crc·T^din_width 与数据余数的异或, 逻辑深度与数据位宽无关;
+        各级的逻辑深度与寄存器数写入代码注释, 并保存在pipeline_report中
+        :param din_width: 输入数据宽度, 8的倍数
+        :param stages: 数据余数的流水级数, 第1级把数据分为2^(stages-1)段
+        :param last_din_width: 最后一段数据宽度, 8的倍数, 默认等于din_width
+        :param copy_to_clipboard: 是否将生成的代码复制到剪贴板, 需要安装pyperclip
+        :return: 生成的Verilog模块字符串
+        """
+        if last_din_width is None:
+            last_din_width = din_width
+        config = self.crc_config
+        return self._generate({'kind': 'pipelined', 'din_width': din_width, 'last_din_width': last_din_width,
+                               'stages': stages, 'reflect_in': config.reflect_in, 'xor_in': config.xor_in,
+                               'reflect_out': config.reflect_out, 'xor_out': config.xor_out},
+                              copy_to_clipboard)
+
+
+# 流水线CRC模块的模板, 模2计算部分由_pipelined_entry生成后填入, Verilog中的花括号写为双花括号
+_PIPELINED_MODULE_TEMPLATE = """\
+/*
+ * @Author       : Xu Xiaokang
+ * @Email        :
+ * @Date         : 2025-01-28 00:52:08
+ * @LastEditors  : Xu Xiaokang
+ * @LastEditTime : 2025-02-11 10:25:48
+ * @Filename     :
+ * @Description  : 任意CRC代码示例
+*/
+
+/*
+! 模块功能: 计算CRC-多步流水线
+* 思路:
+  1.每个DIN_WIDTH数据分为若干段, 第1级流水并行计算各段补0后的余数
+  2.之后每级将相邻两段的余数合并: 前段余数乘以T^(后段位宽)再与后段余数异或, 直到得到整个数据的余数
+  3.反馈环只有 crc·T^DIN_WIDTH 与数据余数的异或, 逻辑深度与DIN_WIDTH无关, 位宽增大时吞吐率随之线性增加
+  4.最后一段数据的无效低位置0后按整段计算, 输出前乘以T^-(DIN_WIDTH-LAST_DIN_WIDTH)还原
+~ 使用:
+  1.接口与myCrcMultiStep相同, din_first与din_last同时为1时即为单步计算
+  2.每个时钟周期都可以输入数据, 帧与帧之间也无需间隔
+  3.DIN_WIDTH必须是8的倍数, 模2计算代码由Python程序生成, 与DIN_WIDTH, LAST_DIN_WIDTH, STAGES和CRC多项式对应
+  4.XOR_IN作为每帧第一个数据的寄存器初值, 可以为任意值, 也不要求DIN_WIDTH≥WIDTH
+  5.din_valid到crc_out_valid的延迟为STAGES+5个时钟周期
+*/
+
+`default_nettype none
+
+module myCrcPipelined
+#(
+  parameter DIN_WIDTH = {din_width}, // 输入数据位宽, 8的倍数, 须与生成代码时一致
+  // 最后一段的有效数据位宽，其值为 8 的倍数，且最小值为 8，最大值为 DIN_WIDTH，高位为有效数据, 须与生成代码时一致
+  parameter LAST_DIN_WIDTH = {last_din_width},
+  parameter STAGES = {stages},             // 数据余数的流水级数, 须与生成代码时一致
+  parameter WIDTH = {width},               // CRC宽度, 须与生成代码时一致
+  parameter [0:0] REFLECT_IN = {reflect_in},      // 输入是否翻转, 取值范围0或1, 1表示反转, 0表示不反转
+  parameter [WIDTH-1 : 0] XOR_IN = 'h{xor_in}, // 输入异或值, 即寄存器初值, 可以为任意值
+  parameter [0:0] REFLECT_OUT = {reflect_out},     // 输出是否翻转, 取值范围0或1, 1表示反转, 0表示不反转
+  parameter [WIDTH-1 : 0] XOR_OUT = 'h{xor_out} // 输出异或值
+)(
+  output reg [WIDTH-1 : 0] crc_out, // CRC输出
+  output reg               crc_out_valid, // CRC输出是否有效指示, 高电平有效
+
+  input  wire [DIN_WIDTH-1 : 0] din, // 输入数据
+  input  wire                   din_valid, // 输入数据有效指示, 高电平有效
+  input  wire                   din_first, // 第一个输入数据指示, 高电平有效
+  input  wire                   din_last,  // 最后一个输入数据指示, 高电平有效
+
+  input  wire clk,
+  input  wire rstn
+);
+
+
+//++ 输入寄存 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+reg [DIN_WIDTH-1 : 0] din_r;
+always @(posedge clk) begin
+  if (~rstn)
+    din_r <= 'd0;
+  else if (din_valid)
+    din_r <= din;
+end
+
+reg din_valid_r1;
+always @(posedge clk) begin
+  if (~rstn)
+    din_valid_r1 <= 1'b0;
+  else
+    din_valid_r1 <= din_valid;
+end
+
+reg din_first_r1;
+reg din_last_r1;
+always @(posedge clk) begin
+  din_first_r1 <= din_first;
+  din_last_r1 <= din_last;
+end
+//-- 输入寄存 ------------------------------------------------------------
+
+
+//++ 输入按字节反转 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+wire [DIN_WIDTH-1:0] din_reflected;
+
+generate
+if (REFLECT_IN == 1) begin
+  // 对每个字节进行位反转
+  genvar i;
+  for (i = 0; i < DIN_WIDTH / 8; i = i + 1) begin
+    assign din_reflected[i*8+7 : i*8] = {{ din_r[i*8], din_r[i*8+1], din_r[i*8+2], din_r[i*8+3],
+                                          din_r[i*8+4], din_r[i*8+5],din_r[i*8+6], din_r[i*8+7]
+                                        }};
+  end
+end else begin
+  assign din_reflected = din_r;
+end
+endgenerate
+//-- 输入按字节反转 ------------------------------------------------------------
+
+
+//++ 最后一段数据的无效低位置0 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+// 信号名沿用myCrcMultiStep中的din_xor, XOR_IN不再与数据异或, 而是作为寄存器初值
+localparam [DIN_WIDTH-1 : 0] LAST_MASK = ~({{DIN_WIDTH{{1'b1}}}} >> LAST_DIN_WIDTH);
+
+reg [DIN_WIDTH-1 : 0] din_xor;
+always @(posedge clk) begin
+  if (din_valid_r1)
+    din_xor <= din_last_r1 ? din_reflected & LAST_MASK : din_reflected;
+end
+
+// 有效、首、尾指示随数据逐级传递, [0]与din_xor对齐, [k]与第k级流水寄存器对齐
+reg [STAGES : 0] valid_pipe;
+reg [STAGES : 0] first_pipe;
+reg [STAGES : 0] last_pipe;
+always @(posedge clk) begin
+  if (~rstn)
+    valid_pipe <= 'd0;
+  else
+    valid_pipe <= {{valid_pipe[STAGES-1 : 0], din_valid_r1}};
+end
+
+always @(posedge clk) begin
+  first_pipe <= {{first_pipe[STAGES-1 : 0], din_first_r1}};
+  last_pipe <= {{last_pipe[STAGES-1 : 0], din_last_r1}};
+end
+//-- 最后一段数据的无效低位置0 ------------------------------------------------------------
+
+
+//++ 模2计算 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+wire [WIDTH-1 : 0] crc_calc;
+wire [WIDTH-1 : 0] crc_calc_last;
+reg  [WIDTH-1 : 0] crc_r;
+reg  [WIDTH-1 : 0] crc_last;
+reg                crc_last_valid;
+
+// 每帧第一个数据的寄存器初值为XOR_IN
+wire [WIDTH-1 : 0] crc = first_pipe[STAGES] ? XOR_IN : crc_r;
+
+always @(posedge clk) begin
+  if (~rstn)
+    crc_r <= 'd0;
+  else if (valid_pipe[STAGES])
+    crc_r <= crc_calc;
+end
+
+always @(posedge clk) begin
+  if (valid_pipe[STAGES] & last_pipe[STAGES])
+    crc_last <= crc_calc;
+end
+
+always @(posedge clk) begin
+  if (~rstn)
+    crc_last_valid <= 1'b0;
+  else
+    crc_last_valid <= valid_pipe[STAGES] & last_pipe[STAGES];
+end
+
+{generated}
+//-- 模2计算 ------------------------------------------------------------
+
+
+//++ 输出反转 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+reg  [WIDTH-1 : 0] crc_reflected;
+generate
+if (REFLECT_OUT == 1) begin // 输出是否翻转
+  genvar i;
+  for (i = 0; i < WIDTH; i = i + 1) begin : reverse
+    always @(posedge clk) begin
+      if (crc_last_valid)
+        crc_reflected[i] <= crc_calc_last[WIDTH-1-i]; // 最后一步输出反转
+    end
+  end
+end else begin
+  always @(posedge clk) begin
+    if (crc_last_valid)
+      crc_reflected <= crc_calc_last;
+  end
+end
+endgenerate
+
+reg crc_reflected_valid;
+always @(posedge clk) begin
+  if (~rstn)
+    crc_reflected_valid <= 1'b0;
+  else
+    crc_reflected_valid <= crc_last_valid;
+end
+//-- 输出反转 ------------------------------------------------------------
+
+
+//++ 输出异或 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+always @(posedge clk) begin
+  if (crc_reflected_valid)
+    crc_out <= crc_reflected ^ XOR_OUT; // 最后一步输出结果与XOR_OUT异或
+end
+
+always @(posedge clk) begin
+  if (~rstn)
+    crc_out_valid <= 1'b0;
+  else
+    crc_out_valid <= crc_reflected_valid;
+end
+//-- 输出异或 ------------------------------------------------------------
+
+
+endmodule
+`resetall
+"""
+
+
+_SIM_CHUNK_VECTORS = 1 << 16  # 仿真时每批的测试向量数, 限制按位展开时的内存占用
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+class CRCVerilogSimulator:
+    """
+    用numpy按位切片(bit-sliced)仿真生成的Verilog CRC公式, 不需要HDL仿真器
+    每个信号位表示为一个uint64数组, 数组中每个数的每一位对应一个测试向量, 一次异或即可计算64个向量
+    输入反转、XOR_IN、输出反转与XOR_OUT的处理与myCrcOneStep.v / myCrcMultiStep.v一致,
+    仿真结果与软件计算的CRC值逐个比较
+    """
+    def __init__(self, crc_config: CRCConfig, seed: int = None):
+        self.crc_config = crc_config
+        self.N = crc_config.width
+        self.rng = np.random.default_rng(seed)
+        self._compiled = {}
+
+    def _compile(self, code: str) -> list:
+        # 解析生成代码中的 wire name = ...; 与 assign name[i] = ...; 语句, 异或满足结合律, 括号直接去掉
+        # 返回 [(目标名, 目标下标或None, {信号名: 下标数组}, [中间wire名]), ...]
+        if code in self._compiled:
+            return self._compiled[code]
+        statements = []
+        for match in re.finditer(r'\b(?:assign|wire)\s+(\w+)(?:\[(\d+)\])?\s*=\s*([^;]*);', code):
+            name, index, expr = match.groups()
+            indexed = {}
+            wires = []
+            for term in expr.replace('(', ' ').replace(')', ' ').split('^'):
+                term = term.strip()
+                if term == '0':
+                    continue
+                term_match = re.fullmatch(r'(\w+)\[(\d+)\]', term)
+                if term_match:
+                    indexed.setdefault(term_match.group(1), []).append(int(term_match.group(2)))
+                else:
+                    wires.append(term)
+            statements.append((name, None if index is None else int(index),
+                               {signal: np.array(indexes, dtype=np.intp) for signal, indexes in indexed.items()},
+                               wires))
+        self._compiled[code] = statements
+        return statements
+
+    def _evaluate(self, code: str, signals: dict, registers: dict = None) -> dict:
+        """
+        按位切片计算生成代码中的所有输出
+        :param code: 生成的Verilog代码
+        :param signals: {信号名: 形状为 [位宽, 字数] 的uint64数组}, 如crc与din_xor
+        :param registers: {输出名: 寄存器名}, 流水线中的寄存器取对应输出的值, 供后面的语句引用
+        :return: {输出名: 形状为 [CRC宽度, 字数] 的数组}, 如crc_calc与crc_calc_last
+        """
+        words = next(iter(signals.values())).shape[1]
+        signals = dict(signals)
+        registers = registers or {}
+        wires = {}
+        outputs = {}
+        for name, index, indexed, wire_terms in self._compile(code):
+            value = np.zeros(words, dtype=np.uint64)
+            for signal, indexes in indexed.items():
+                value ^= np.bitwise_xor.reduce(signals[signal][indexes], axis=0)
+            for wire in wire_terms:
+                value ^= wires[wire]
+            if index is None:
+                wires[name] = value
+            else:
+                if name not in outputs:
+                    outputs[name] = np.zeros((self.N, words), dtype=np.uint64)
+                    if name in registers:
+                        signals[registers[name]] = outputs[name]
+                outputs[name][index] = value
+        return outputs
+
+    def _reflect_bytes(self, planes: np.ndarray) -> np.ndarray:
+        # 每个字节内按位反转, 与模块中的din_reflected一致
+        if not self.crc_config.reflect_in:
+            return planes
+        index = np.arange(planes.shape[0])
+        return planes[(index // 8) * 8 + 7 - index % 8]
+
+    def _xor_constant(self, planes: np.ndarray, value: int, low: int) -> None:
+        # planes[low:low+N] 与常数value按位异或, 原地修改
+        for k in range(self.N):
+            if (value >> k) & 1:
+                planes[low + k] ^= _ALL_ONES
+
+    def _output(self, crc_calc: np.ndarray) -> np.ndarray:
+        # 输出反转与XOR_OUT异或, 得到crc_out
+        crc_out = crc_calc[::-1].copy() if self.crc_config.reflect_out else crc_calc.copy()
+        self._xor_constant(crc_out, self.crc_config.xor_out, 0)
+        return crc_out
+
+    def simulate_one_step(self, code: str, din_width: int, din: np.ndarray) -> np.ndarray:
+        """
+        仿真myCrcOneStep.v
+        :param code: generate_verilog_crc_one_step_code生成的代码
+        :param din_width: 输入数据位宽
+        :param din: 输入数据, 形状为 [din_width, 字数] 的uint64数组, 第k行为din[k]
+        :return: crc_out, 形状为 [CRC宽度, 字数] 的uint64数组
+        """
+        N = self.N
+        din_width_to_8 = (din_width + 7) // 8 * 8
+        words = din.shape[1]
+        # 高位补0到整字节, 反转后低位补N个0, 最高N位与XOR_IN异或
+        din_r = np.zeros((din_width_to_8, words), dtype=np.uint64)
+        din_r[:din_width] = din
+        din_xor = np.zeros((din_width_to_8 + N, words), dtype=np.uint64)
+        din_xor[N:] = self._reflect_bytes(din_r)
+        self._xor_constant(din_xor, self.crc_config.xor_in, din_width_to_8)
+        return self._output(self._evaluate(code, {'din_xor': din_xor})['crc_calc'])
+
+    def simulate_multi_step(self, code: str, din_width: int, din: np.ndarray) -> np.ndarray:
+        """
+        仿真myCrcMultiStep.v, 每个测试向量为由若干个din组成的一帧, 最后一个din使用crc_calc_last
+        :param code: generate_verilog_crc_multi_step_code生成的代码
+        :param din_width: 输入数据位宽
+        :param din: 形状为 [每帧的din个数, din_width, 字数] 的uint64数组
+        :return: crc_out, 形状为 [CRC宽度, 字数] 的uint64数组
+        """
+        N = self.N
+        crc = np.zeros((N, din.shape[2]), dtype=np.uint64)
+        for k, word in enumerate(din):
+            din_xor = self._reflect_bytes(word)
+            if k == 0:
+                # 第一个输入的最高N位与XOR_IN异或
+                self._xor_constant(din_xor, self.crc_config.xor_in, din_width - N)
+            outputs = self._evaluate(code, {'crc': crc, 'din_xor': din_xor})
+            if k == len(din) - 1:
+                return self._output(outputs['crc_calc_last'])
+            crc = outputs['crc_calc']
+
+    def simulate_pipelined(self, code: str, din_width: int, last_din_width: int, din: np.ndarray) -> np.ndarray:
+        """
+        仿真myCrcPipelined.v, 流水线寄存器只影响时序, 按每帧逐个din计算即可
+        :param code: generate_verilog_crc_pipelined_code生成的模块
+        :param din_width: 输入数据位宽
+        :param last_din_width: 最后一段数据位宽
+        :param din: 形状为 [每帧的din个数, din_width, 字数] 的uint64数组
+        :return: crc_out, 形状为 [CRC宽度, 字数] 的uint64数组
+        """
+        N = self.N
+        # 只计算生成的模2计算部分, 流水线寄存器 name_r <= name 与 crc_last <= crc_calc 视为直通
+        begin = code.index('// 此部分代码由Python程序生成 请勿手动修改 begin')
+        region = code[begin:code.index('// 此部分代码由Python程序生成 请勿手动修改 end')]
+        registers = {name: f'{name}_r' for name in re.findall(r'\b(\w+)_r <= \1;', region)}
+        registers['crc_calc'] = 'crc_last'
+        # 每帧第一个数据的寄存器初值为XOR_IN
+        crc = np.zeros((N, din.shape[2]), dtype=np.uint64)
+        self._xor_constant(crc, self.crc_config.xor_in, 0)
+        for k, word in enumerate(din):
+            din_xor = self._reflect_bytes(word)
+            last = k == len(din) - 1
+            if last:
+                # 最后一个数据的无效低位置0
+                din_xor = din_xor.copy()
+                din_xor[:din_width - last_din_width] = 0
+            outputs = self._evaluate(region, {'crc': crc, 'din_xor': din_xor}, registers)
+            if last:
+                return self._output(outputs['crc_calc_last'])
+            crc = outputs['crc_calc']
+
+    def _random_planes(self, shape: tuple) -> np.ndarray:
+        # 随机测试向量, 直接以按位切片的形式生成
+        return self.rng.integers(0, 1 << 64, size=shape, dtype=np.uint64, endpoint=False)
+
+    def _planes_to_bits(self, planes: np.ndarray) -> np.ndarray:
+        # [位宽, 字数] 的按位切片数组展开为 [向量数, 位宽] 的0/1数组, 第j列为第j位
+        bits = np.unpackbits(planes.astype('<u8').view(np.uint8), axis=1, bitorder='little')
+        return bits.T
+
+    def _planes_to_bytes(self, planes: np.ndarray) -> np.ndarray:
+        # 按位切片数组转换为每个向量的大端字节, 形状为 [向量数, 字节数], 与Verilog中din的字节顺序一致
+        # 高位补0到整字节, 行顺序反转为高位在前, 每8行移位合并为一行字节后再转置
+        width_to_8 = (planes.shape[0] + 7) // 8 * 8
+        padded = np.zeros((width_to_8, planes.shape[1]), dtype='<u8')
+        padded[width_to_8 - planes.shape[0]:] = planes[::-1]
+        bits = np.unpackbits(padded.view(np.uint8), axis=1, bitorder='little')
+        data = np.zeros((width_to_8 // 8, bits.shape[1]), dtype=np.uint8)
+        for i in range(8):
+            data |= bits[i::8] << np.uint8(7 - i)
+        return np.ascontiguousarray(data.T)
+
+    def _planes_to_ints(self, planes: np.ndarray) -> np.ndarray:
+        # CRC的按位切片数组转换为每个向量的整数值
+        bits = self._planes_to_bits(planes).astype(np.uint64)
+        return (bits << np.arange(planes.shape[0], dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+
+    def _compare(self, messages: np.ndarray, crc_out: np.ndarray, result: dict) -> None:
+        # 与软件批量计算的结果比较, 累计不一致的个数并记录第一个不一致的向量
+        actual = self._planes_to_ints(crc_out)
+        expected = self.crc_config.calc_crc_batch(messages)
+        wrong = np.flatnonzero(actual != expected)
+        result['vectors'] += len(actual)
+        result['mismatches'] += len(wrong)
+        if len(wrong) and result['first_mismatch'] is None:
+            k = wrong[0]
+            result['first_mismatch'] = {'data': messages[k].tobytes().hex(),
+                                        'expected': int(expected[k]), 'actual': int(actual[k])}
+
+    def _check(self, simulate, vectors: int) -> dict:
+        # 分批仿真与比较, simulate(字数)返回 (消息字节, crc_out)
+        result = {'vectors': 0, 'mismatches': 0, 'first_mismatch': None}
+        start = time.perf_counter()
+        for done in range(0, vectors, _SIM_CHUNK_VECTORS):
+            words = (min(_SIM_CHUNK_VECTORS, vectors - done) + 63) // 64
+            self._compare(*simulate(words), result)
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    def check_one_step(self, din_width: int, code: str = None, vectors: int = 1 << 20,
+                       optimize: bool = False) -> dict:
+        """
+        用随机输入仿真单步计算代码, 并与软件计算结果比较
+        :param din_width: 输入数据位宽
+        :param code: 要检查的代码, 默认由CRCVerilog生成
+        :param vectors: 测试向量数, 向上取整到64的倍数
+        :param optimize: code为None时, 是否生成异或优化后的代码
+        :return: 字典, 包含测试向量数vectors, 不一致个数mismatches, 第一个不一致的向量first_mismatch与用时seconds
+        """
+        if code is None:
+            code = CRCVerilog(self.crc_config).generate_verilog_crc_one_step_code(din_width, optimize)
+
+        def simulate(words):
+            din = self._random_planes((din_width, words))
+            return self._planes_to_bytes(din), self.simulate_one_step(code, din_width, din)
+        return self._check(simulate, vectors)
+
+    def check_multi_step(self, din_width: int, last_din_width: int, code: str = None,
+                         frame_words: int = 4, vectors: int = 1 << 20, optimize: bool = False) -> dict:
+        """
+        用随机输入仿真多步计算代码, 每帧由frame_words个din组成, 最后一个din只有高last_din_width位有效
+        :param din_width: 输入数据位宽
+        :param last_din_width: 最后一段数据位宽, 须为8的倍数
+        :param code: 要检查的代码, 默认由CRCVerilog生成
+        :param frame_words: 每帧的din个数
+        :param vectors: 测试向量数, 向上取整到64的倍数
+        :param optimize: code为None时, 是否生成异或优化后的代码
+        :return: 与check_one_step相同
+        """
+        if last_din_width % 8:
+            raise ValueError("last_din_width must be a multiple of 8")
+        if code is None:
+            code = CRCVerilog(self.crc_config).generate_verilog_crc_multi_step_code(
+                din_width, last_din_width, optimize)
+
+        def simulate(words):
+            # 最后一个din的低位也填充随机数, 用于检查公式没有用到无效的数据位
+            din = self._random_planes((frame_words, din_width, words))
+            parts = [self._planes_to_bytes(word) for word in din]
+            parts[-1] = parts[-1][:, :last_din_width // 8]
+            return np.concatenate(parts, axis=1), self.simulate_multi_step(code, din_width, din)
+        return self._check(simulate, vectors)
+
+    def check_pipelined(self, din_width: int, stages: int, last_din_width: int = None, code: str = None,
+                        frame_words: int = 4, vectors: int = 1 << 20) -> dict:
+        """
+        用随机输入仿真流水线模块, 每帧由frame_words个din组成, 最后一个din只有高last_din_width位有效
+        :param din_width: 输入数据位宽
+        :param stages: 数据余数的流水级数
+        :param last_din_width: 最后一段数据位宽, 默认等于din_width
+        :param code: 要检查的模块代码, 默认由CRCVerilog生成
+        :param frame_words: 每帧的din个数, 为1时即单步计算
+        :param vectors: 测试向量数, 向上取整到64的倍数
+        :return: 与check_one_step相同
+        """
+        if last_din_width is None:
+            last_din_width = din_width
+        if code is None:
+            code = CRCVerilog(self.crc_config).generate_verilog_crc_pipelined_code(din_width, stages, last_din_width)
+
+        def simulate(words):
+            din = self._random_planes((frame_words, din_width, words))
+            parts = [self._planes_to_bytes(word) for word in din]
+            parts[-1] = parts[-1][:, :last_din_width // 8]
+            return (np.concatenate(parts, axis=1),
+                    self.simulate_pipelined(code, din_width, last_din_width, din))
+        return self._check(simulate, vectors)
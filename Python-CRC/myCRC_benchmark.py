@@ -0,0 +1,316 @@
+'''
+Author       : Xu Xiaokang
+Email        :
+Date         : 2025-01-22 15:42:50
+LastEditors  : Xu Xiaokang
+LastEditTime : 2025-02-10 15:20:06
+Filename     :
+Description  : myCRC性能测试, 结果以JSON格式输出, 便于比较不同版本
+'''
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import statistics
+import subprocess
+import myCRC
+
+# 本文件所在目录, 子进程在此目录中导入myCRC
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 默认输入长度, 1 B 到 1 GiB, 每级乘以16
+DEFAULT_SIZES = [1, 16, 256, 4 << 10, 64 << 10, 1 << 20, 16 << 20, 256 << 20, 1 << 30]
+# 各计算方法测试的最大输入长度, 较慢的方法只测较短的输入
+ENGINE_MAX_SIZE = {
+    'matrix': 64 << 10,
+    'table': 16 << 20,
+    'slicing': 1 << 30,
+    'fold': 1 << 30,
+    'batch': 64 << 10,
+    'parallel': 1 << 30,
+    'streaming': 1 << 30,
+}
+ENGINES = list(ENGINE_MAX_SIZE)
+_BATCH_TOTAL_BYTES = 16 << 20  # 批量计算时每次测试的消息总字节数
+_BATCH_MAX_MESSAGES = 1 << 18  # 批量计算时每次测试的最大消息条数
+_PARALLEL_MIN_CHUNK_SIZE = 1 << 20  # 并行计算时每个数据块的最小字节数
+_STREAMING_CHUNK_SIZE = 64 << 10  # 流式计算时每次update的字节数
+_MIN_MEASURE_TIME = 0.2  # 单个测试项的最短计时, 短输入重复执行直到超过该时间
+# HDL代码生成测试的CRC配置与输入数据位宽
+HDL_CONFIGS = ['CRC_8', 'CRC_16_MODBUS', 'CRC_32', 'CRC_64_ECMA_182']
+HDL_DIN_WIDTHS = [8, 16, 32, 64, 128, 256, 512, 1024]
+HDL_PIPELINE_STAGES = 4  # 生成流水线模块时的流水级数, 数据段数不超过输入位宽时才测量
+
+
+def measure_import_time(module: str, repeat: int = 5) -> dict:
+    """
+    在新的子进程中测量导入模块所需的时间, 避免已导入模块的缓存影响结果
+    :param module: 模块名, 如'myCRC'
+    :param repeat: 重复次数
+    :return: 字典, 包含各次的时间与中位数, 单位为秒
+    """
+    code = ('import time, sys; t = time.perf_counter(); import {0}; '
+            'print(time.perf_counter() - t); '
+            'print(",".join(m for m in ("numpy", "sympy", "pyperclip") if m in sys.modules))').format(module)
+    times = []
+    loaded = ''
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=_HERE, check=True,
+                                capture_output=True, text=True).stdout.split('\n')
+        times.append(float(output[0]))
+        loaded = output[1]
+    return {
+        'module': module,
+        'times': times,
+        'median': statistics.median(times),
+        # 导入后已加载的重量级依赖, 计算CRC的路径应为空
+        'heavy_modules': [m for m in loaded.split(',') if m],
+    }
+
+
+def _time_call(function) -> tuple:
+    """
+    测量函数单次执行的时间, 执行时间过短时重复执行, 取每轮的最小值
+    :param function: 无参数的函数
+    :return: (单次执行的秒数, 函数返回值)
+    """
+    best = None
+    total = 0.0
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            result = function()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        best = elapsed / number if best is None else min(best, elapsed / number)
+        if total >= _MIN_MEASURE_TIME:
+            return best, result
+        # 按已用时间估计还需重复的次数
+        number = max(1, min(number * 10, int(_MIN_MEASURE_TIME / max(elapsed / number, 1e-9))))
+
+
+def _engine_function(crc_config: myCRC.CRCConfig, engine: str, data: memoryview, workers: int):
+    # 返回计算给定数据CRC的无参数函数, 以及实际处理的字节数
+    if engine == 'batch':
+        import numpy as np
+        # 预先构造消息矩阵, 只测量批量计算本身
+        count = max(1, min(_BATCH_TOTAL_BYTES // len(data), _BATCH_MAX_MESSAGES))
+        messages = np.tile(np.frombuffer(data, dtype=np.uint8), (count, 1))
+        return (lambda: int(crc_config.calc_crc_batch(messages)[0])), len(data) * count
+    if engine == 'parallel':
+        # 数据平均分给各进程, 数据较短时只有一块, 不启动进程池
+        chunk_size = max(_PARALLEL_MIN_CHUNK_SIZE, -(-len(data) // workers))
+        return (lambda: crc_config.calc_crc(data, engine='slicing', workers=workers,
+                                            parallel_chunk_size=chunk_size)), len(data)
+    if engine == 'streaming':
+        def streaming():
+            crc_hash = crc_config.new(engine='slicing')
+            for start in range(0, len(data), _STREAMING_CHUNK_SIZE):
+                crc_hash.update(data[start:start + _STREAMING_CHUNK_SIZE])
+            return crc_hash.intdigest()
+        return streaming, len(data)
+    return (lambda: crc_config.calc_crc(data, engine=engine)), len(data)
+
+
+def benchmark_engines(configs: dict, sizes: list, engines: list, max_size: int = None,
+                      workers: int = 0, progress=None) -> list:
+    """
+    测量各CRC配置、计算方法与输入长度下的计算速度
+    :param configs: {名称: CRCConfig}
+    :param sizes: 输入长度列表, 单位为字节
+    :param engines: 计算方法列表, 可选ENGINES中的值
+    :param max_size: 所有计算方法共同的最大输入长度, None表示只受ENGINE_MAX_SIZE限制
+    :param workers: 并行计算的进程数, 0表示使用所有CPU核
+    :param progress: 每完成一项调用一次, 参数为该项的结果字典
+    :return: 结果字典的列表
+    """
+    workers = workers or os.cpu_count() or 1
+    largest = max(size for size in sizes if max_size is None or size <= max_size)
+    # 所有测试使用同一段固定种子的随机数据的前若干字节
+    data = memoryview(random.Random(0).randbytes(largest))
+    results = []
+    for name, crc_config in configs.items():
+        for engine in engines:
+            for size in sizes:
+                if size > ENGINE_MAX_SIZE[engine] or (max_size is not None and size > max_size):
+                    continue
+                function, nbytes = _engine_function(crc_config, engine, data[:size], workers)
+                seconds, crc = _time_call(function)
+                item = {
+                    'config': name,
+                    'width': crc_config.width,
+                    'engine': engine,
+                    'size': size,
+                    'bytes': nbytes,
+                    'seconds': seconds,
+                    'mb_per_s': nbytes / seconds / (1 << 20),
+                    'crc': f'{int(crc):x}',
+                }
+                results.append(item)
+                if progress is not None:
+                    progress(item)
+    _check_engines_agree(results)
+    return results
+
+
+def _check_engines_agree(results: list) -> None:
+    # 同一配置同一输入长度下, 各计算方法的结果必须一致(批量计算的结果为单条消息的CRC)
+    seen = {}
+    for item in results:
+        key = (item['config'], item['size'])
+        if seen.setdefault(key, item)['crc'] != item['crc']:
+            raise AssertionError(f"{item['config']} {item['size']} B: "
+                                 f"{item['engine']}与{seen[key]['engine']}的结果不一致")
+
+
+def benchmark_hdl(configs: list, din_widths: list, optimize: bool = False, progress=None) -> list:
+    """
+    测量Verilog代码生成时间与输入数据位宽的关系, 每次使用新的CRCVerilog, 不使用磁盘缓存
+    :param configs: CRC配置名称列表
+    :param din_widths: 输入数据位宽列表
+    :param optimize: 是否同时测量异或优化后的生成时间
+    :param progress: 每完成一项调用一次, 参数为该项的结果字典
+    :return: 结果字典的列表
+    """
+    results = []
+    for name in configs:
+        crc_config = getattr(myCRC, name)
+        for din_width in din_widths:
+            kinds = [('one_step', False)]
+            if din_width >= crc_config.width:
+                kinds.append(('multi_step', False))
+            if 1 << (HDL_PIPELINE_STAGES - 1) <= din_width:
+                kinds.append(('pipelined', False))
+            if optimize:
+                kinds.append(('one_step', True))
+            for kind, optimized in kinds:
+                crc_verilog = myCRC.CRCVerilog(crc_config)
+                start = time.perf_counter()
+                if kind == 'one_step':
+                    code = crc_verilog.generate_verilog_crc_one_step_code(din_width, optimize=optimized)
+                elif kind == 'multi_step':
+                    code = crc_verilog.generate_verilog_crc_multi_step_code(din_width, din_width)
+                else:
+                    code = crc_verilog.generate_verilog_crc_pipelined_code(din_width, HDL_PIPELINE_STAGES)
+                item = {
+                    'config': name,
+                    'width': crc_config.width,
+                    'kind': kind,
+                    'optimize': optimized,
+                    'din_width': din_width,
+                    'seconds': time.perf_counter() - start,
+                    'code_length': len(code),
+                }
+                results.append(item)
+                if progress is not None:
+                    progress(item)
+    return results
+
+
+def run_benchmark(configs: dict = None, sizes: list = None, engines: list = None,
+                  max_size: int = None, workers: int = 0, hdl: bool = True,
+                  hdl_optimize: bool = False, progress=None) -> dict:
+    """
+    运行所有测试项, 返回可直接保存为JSON的结果
+    :param configs: {名称: CRCConfig}, 默认为myCRC中的所有预定义配置
+    :param sizes: 输入长度列表, 默认为DEFAULT_SIZES
+    :param engines: 计算方法列表, 默认为ENGINES
+    :param max_size: 最大输入长度
+    :param workers: 并行计算的进程数, 0表示使用所有CPU核
+    :param hdl: 是否测量Verilog代码生成时间
+    :param hdl_optimize: 是否测量异或优化后的代码生成时间
+    :param progress: 每完成一项调用一次, 参数为该项的结果字典
+    :return: 结果字典
+    """
+    result = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'import': [measure_import_time('myCRC'), measure_import_time('myCRCVerilog')],
+    }
+    result['engines'] = benchmark_engines(configs or myCRC._crc_presets(), sizes or DEFAULT_SIZES,
+                                          engines or ENGINES, max_size, workers, progress)
+    if hdl:
+        result['hdl'] = benchmark_hdl(HDL_CONFIGS, HDL_DIN_WIDTHS, hdl_optimize, progress)
+    return result
+
+
+def compare_results(old: dict, new: dict, threshold: float = 0.1) -> list:
+    """
+    比较两次测试结果, 找出变慢超过阈值的测试项
+    :param old: 旧版本的结果字典
+    :param new: 新版本的结果字典
+    :param threshold: 变慢的比例阈值, 默认为10%
+    :return: 列表, 每项为 (测试项描述, 旧耗时, 新耗时)
+    """
+    def keyed(result):
+        items = {}
+        for item in result.get('engines', []):
+            items[('engine', item['config'], item['engine'], item['size'])] = item['seconds']
+        for item in result.get('hdl', []):
+            items[('hdl', item['config'], item['kind'], item['optimize'], item['din_width'])] = item['seconds']
+        return items
+    old_items = keyed(old)
+    slower = []
+    for key, seconds in keyed(new).items():
+        if key in old_items and seconds > old_items[key] * (1 + threshold):
+            slower.append((' '.join(str(k) for k in key), old_items[key], seconds))
+    return slower
+
+
+def main(argv=None) -> int:
+    # 命令行入口: 运行测试并将结果写入JSON文件或标准输出
+    import argparse
+    parser = argparse.ArgumentParser(description='myCRC性能测试')
+    parser.add_argument('-o', '--output', help='结果JSON文件路径, 默认输出到标准输出')
+    parser.add_argument('-c', '--config', action='append', choices=sorted(myCRC._crc_presets()),
+                        help='只测试指定的预定义配置, 可多次指定, 默认为全部')
+    parser.add_argument('-e', '--engine', action='append', choices=ENGINES,
+                        help='只测试指定的计算方法, 可多次指定, 默认为全部')
+    parser.add_argument('--max-size', type=int, help='最大输入长度(字节)')
+    parser.add_argument('--quick', action='store_true', help='快速测试, 输入长度不超过1 MiB')
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                        help='并行计算的进程数, 0表示使用所有CPU核, 默认为0')
+    parser.add_argument('--no-hdl', action='store_true', help='不测量Verilog代码生成时间')
+    parser.add_argument('--hdl-optimize', action='store_true', help='同时测量异或优化后的代码生成时间')
+    parser.add_argument('--compare', help='与之前保存的结果JSON文件比较, 列出变慢超过10%%的测试项')
+    args = parser.parse_args(argv)
+    presets = myCRC._crc_presets()
+    configs = {name: presets[name] for name in args.config} if args.config else presets
+    max_size = args.max_size
+    if args.quick:
+        max_size = min(max_size or (1 << 20), 1 << 20)
+
+    def progress(item):
+        # 在标准错误中显示进度, 不影响标准输出中的JSON
+        if 'engine' in item:
+            print(f"{item['config']:<16} {item['engine']:<10} {item['size']:>11} B "
+                  f"{item['mb_per_s']:10.2f} MB/s", file=sys.stderr)
+        else:
+            print(f"{item['config']:<16} {item['kind']:<10} din {item['din_width']:>5} "
+                  f"{item['seconds']:8.3f} s", file=sys.stderr)
+
+    result = run_benchmark(configs, engines=args.engine, max_size=max_size, workers=args.workers,
+                           hdl=not args.no_hdl, hdl_optimize=args.hdl_optimize, progress=progress)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            slower = compare_results(json.load(f), result)
+        for name, old_seconds, new_seconds in slower:
+            print(f'变慢: {name}: {old_seconds:.6f} s -> {new_seconds:.6f} s', file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
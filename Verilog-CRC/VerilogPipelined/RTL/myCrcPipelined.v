@@ -0,0 +1,774 @@
+/*
+ * @Author       : Xu Xiaokang
+ * @Email        :
+ * @Date         : 2025-01-28 00:52:08
+ * @LastEditors  : Xu Xiaokang
+ * @LastEditTime : 2025-02-11 10:25:48
+ * @Filename     :
+ * @Description  : 任意CRC代码示例
+*/
+
+/*
+! 模块功能: 计算CRC-多步流水线
+* 思路:
+  1.每个DIN_WIDTH数据分为若干段, 第1级流水并行计算各段补0后的余数
+  2.之后每级将相邻两段的余数合并: 前段余数乘以T^(后段位宽)再与后段余数异或, 直到得到整个数据的余数
+  3.反馈环只有 crc·T^DIN_WIDTH 与数据余数的异或, 逻辑深度与DIN_WIDTH无关, 位宽增大时吞吐率随之线性增加
+  4.最后一段数据的无效低位置0后按整段计算, 输出前乘以T^-(DIN_WIDTH-LAST_DIN_WIDTH)还原
+~ 使用:
+  1.接口与myCrcMultiStep相同, din_first与din_last同时为1时即为单步计算
+  2.每个时钟周期都可以输入数据, 帧与帧之间也无需间隔
+  3.DIN_WIDTH必须是8的倍数, 模2计算代码由Python程序生成, 与DIN_WIDTH, LAST_DIN_WIDTH, STAGES和CRC多项式对应
+  4.XOR_IN作为每帧第一个数据的寄存器初值, 可以为任意值, 也不要求DIN_WIDTH≥WIDTH
+  5.din_valid到crc_out_valid的延迟为STAGES+5个时钟周期
+*/
+
+`default_nettype none
+
+module myCrcPipelined
+#(
+  parameter DIN_WIDTH = 64, // 输入数据位宽, 8的倍数, 须与生成代码时一致
+  // 最后一段的有效数据位宽，其值为 8 的倍数，且最小值为 8，最大值为 DIN_WIDTH，高位为有效数据, 须与生成代码时一致
+  parameter LAST_DIN_WIDTH = 8,
+  parameter STAGES = 2,             // 数据余数的流水级数, 须与生成代码时一致
+  parameter WIDTH = 32,               // CRC宽度, 须与生成代码时一致
+  parameter [0:0] REFLECT_IN = 1,      // 输入是否翻转, 取值范围0或1, 1表示反转, 0表示不反转
+  parameter [WIDTH-1 : 0] XOR_IN = 'hFFFFFFFF, // 输入异或值, 即寄存器初值, 可以为任意值
+  parameter [0:0] REFLECT_OUT = 1,     // 输出是否翻转, 取值范围0或1, 1表示反转, 0表示不反转
+  parameter [WIDTH-1 : 0] XOR_OUT = 'hFFFFFFFF // 输出异或值
+)(
+  output reg [WIDTH-1 : 0] crc_out, // CRC输出
+  output reg               crc_out_valid, // CRC输出是否有效指示, 高电平有效
+
+  input  wire [DIN_WIDTH-1 : 0] din, // 输入数据
+  input  wire                   din_valid, // 输入数据有效指示, 高电平有效
+  input  wire                   din_first, // 第一个输入数据指示, 高电平有效
+  input  wire                   din_last,  // 最后一个输入数据指示, 高电平有效
+
+  input  wire clk,
+  input  wire rstn
+);
+
+
+//++ 输入寄存 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+reg [DIN_WIDTH-1 : 0] din_r;
+always @(posedge clk) begin
+  if (~rstn)
+    din_r <= 'd0;
+  else if (din_valid)
+    din_r <= din;
+end
+
+reg din_valid_r1;
+always @(posedge clk) begin
+  if (~rstn)
+    din_valid_r1 <= 1'b0;
+  else
+    din_valid_r1 <= din_valid;
+end
+
+reg din_first_r1;
+reg din_last_r1;
+always @(posedge clk) begin
+  din_first_r1 <= din_first;
+  din_last_r1 <= din_last;
+end
+//-- 输入寄存 ------------------------------------------------------------
+
+
+//++ 输入按字节反转 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+wire [DIN_WIDTH-1:0] din_reflected;
+
+generate
+if (REFLECT_IN == 1) begin
+  // 对每个字节进行位反转
+  genvar i;
+  for (i = 0; i < DIN_WIDTH / 8; i = i + 1) begin
+    assign din_reflected[i*8+7 : i*8] = { din_r[i*8], din_r[i*8+1], din_r[i*8+2], din_r[i*8+3],
+                                          din_r[i*8+4], din_r[i*8+5],din_r[i*8+6], din_r[i*8+7]
+                                        };
+  end
+end else begin
+  assign din_reflected = din_r;
+end
+endgenerate
+//-- 输入按字节反转 ------------------------------------------------------------
+
+
+//++ 最后一段数据的无效低位置0 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+// 信号名沿用myCrcMultiStep中的din_xor, XOR_IN不再与数据异或, 而是作为寄存器初值
+localparam [DIN_WIDTH-1 : 0] LAST_MASK = ~({DIN_WIDTH{1'b1}} >> LAST_DIN_WIDTH);
+
+reg [DIN_WIDTH-1 : 0] din_xor;
+always @(posedge clk) begin
+  if (din_valid_r1)
+    din_xor <= din_last_r1 ? din_reflected & LAST_MASK : din_reflected;
+end
+
+// 有效、首、尾指示随数据逐级传递, [0]与din_xor对齐, [k]与第k级流水寄存器对齐
+reg [STAGES : 0] valid_pipe;
+reg [STAGES : 0] first_pipe;
+reg [STAGES : 0] last_pipe;
+always @(posedge clk) begin
+  if (~rstn)
+    valid_pipe <= 'd0;
+  else
+    valid_pipe <= {valid_pipe[STAGES-1 : 0], din_valid_r1};
+end
+
+always @(posedge clk) begin
+  first_pipe <= {first_pipe[STAGES-1 : 0], din_first_r1};
+  last_pipe <= {last_pipe[STAGES-1 : 0], din_last_r1};
+end
+//-- 最后一段数据的无效低位置0 ------------------------------------------------------------
+
+
+//++ 模2计算 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+wire [WIDTH-1 : 0] crc_calc;
+wire [WIDTH-1 : 0] crc_calc_last;
+reg  [WIDTH-1 : 0] crc_r;
+reg  [WIDTH-1 : 0] crc_last;
+reg                crc_last_valid;
+
+// 每帧第一个数据的寄存器初值为XOR_IN
+wire [WIDTH-1 : 0] crc = first_pipe[STAGES] ? XOR_IN : crc_r;
+
+always @(posedge clk) begin
+  if (~rstn)
+    crc_r <= 'd0;
+  else if (valid_pipe[STAGES])
+    crc_r <= crc_calc;
+end
+
+always @(posedge clk) begin
+  if (valid_pipe[STAGES] & last_pipe[STAGES])
+    crc_last <= crc_calc;
+end
+
+always @(posedge clk) begin
+  if (~rstn)
+    crc_last_valid <= 1'b0;
+  else
+    crc_last_valid <= valid_pipe[STAGES] & last_pipe[STAGES];
+end
+
+// 此部分代码由Python程序生成 请勿手动修改 begin
+/*
+流水线计算CRC
+CRC宽度: 32
+CRC多项式: 0x04c11db7
+输入数据位宽: 64
+最后一段数据位宽: 8
+数据余数流水级数: 2, 数据段数: 2
+各级逻辑深度与资源(2输入异或门按平衡异或树计算):
+  din_r    异或深度  0 级, 2输入异或门      0 个, 寄存器    67 个
+  din_xor  异或深度  0 级, 2输入异或门      0 个, 寄存器    67 个
+  s1       异或深度  5 级, 2输入异或门    840 个, 寄存器    67 个
+  s2       异或深度  5 级, 2输入异或门    452 个, 寄存器    35 个
+  crc      异或深度  5 级, 2输入异或门    485 个, 寄存器    65 个
+  crc_out  异或深度  5 级, 2输入异或门    490 个, 寄存器    66 个
+*/
+// 第1级: 各段数据的余数
+wire [WIDTH-1 : 0] crc_s1_0;
+assign crc_s1_0[0] = din_xor[32] ^ din_xor[38] ^ din_xor[41] ^ din_xor[42] ^ din_xor[44] 
+                    ^ din_xor[48] ^ din_xor[56] ^ din_xor[57] ^ din_xor[58] ^ din_xor[60] 
+                    ^ din_xor[61] ^ din_xor[62] ^ din_xor[63];
+assign crc_s1_0[1] = din_xor[32] ^ din_xor[33] ^ din_xor[38] ^ din_xor[39] ^ din_xor[41] 
+                    ^ din_xor[43] ^ din_xor[44] ^ din_xor[45] ^ din_xor[48] ^ din_xor[49] 
+                    ^ din_xor[56] ^ din_xor[59] ^ din_xor[60];
+assign crc_s1_0[2] = din_xor[32] ^ din_xor[33] ^ din_xor[34] ^ din_xor[38] ^ din_xor[39] 
+                    ^ din_xor[40] ^ din_xor[41] ^ din_xor[45] ^ din_xor[46] ^ din_xor[48] 
+                    ^ din_xor[49] ^ din_xor[50] ^ din_xor[56] ^ din_xor[58] ^ din_xor[62] 
+                    ^ din_xor[63];
+assign crc_s1_0[3] = din_xor[33] ^ din_xor[34] ^ din_xor[35] ^ din_xor[39] ^ din_xor[40] 
+                    ^ din_xor[41] ^ din_xor[42] ^ din_xor[46] ^ din_xor[47] ^ din_xor[49] 
+                    ^ din_xor[50] ^ din_xor[51] ^ din_xor[57] ^ din_xor[59] ^ din_xor[63];
+assign crc_s1_0[4] = din_xor[32] ^ din_xor[34] ^ din_xor[35] ^ din_xor[36] ^ din_xor[38] 
+                    ^ din_xor[40] ^ din_xor[43] ^ din_xor[44] ^ din_xor[47] ^ din_xor[50] 
+                    ^ din_xor[51] ^ din_xor[52] ^ din_xor[56] ^ din_xor[57] ^ din_xor[61] 
+                    ^ din_xor[62] ^ din_xor[63];
+assign crc_s1_0[5] = din_xor[32] ^ din_xor[33] ^ din_xor[35] ^ din_xor[36] ^ din_xor[37] 
+                    ^ din_xor[38] ^ din_xor[39] ^ din_xor[42] ^ din_xor[45] ^ din_xor[51] 
+                    ^ din_xor[52] ^ din_xor[53] ^ din_xor[56] ^ din_xor[60] ^ din_xor[61];
+assign crc_s1_0[6] = din_xor[33] ^ din_xor[34] ^ din_xor[36] ^ din_xor[37] ^ din_xor[38] 
+                    ^ din_xor[39] ^ din_xor[40] ^ din_xor[43] ^ din_xor[46] ^ din_xor[52] 
+                    ^ din_xor[53] ^ din_xor[54] ^ din_xor[57] ^ din_xor[61] ^ din_xor[62];
+assign crc_s1_0[7] = din_xor[32] ^ din_xor[34] ^ din_xor[35] ^ din_xor[37] ^ din_xor[39] 
+                    ^ din_xor[40] ^ din_xor[42] ^ din_xor[47] ^ din_xor[48] ^ din_xor[53] 
+                    ^ din_xor[54] ^ din_xor[55] ^ din_xor[56] ^ din_xor[57] ^ din_xor[60] 
+                    ^ din_xor[61];
+assign crc_s1_0[8] = din_xor[32] ^ din_xor[33] ^ din_xor[35] ^ din_xor[36] ^ din_xor[40] 
+                    ^ din_xor[42] ^ din_xor[43] ^ din_xor[44] ^ din_xor[49] ^ din_xor[54] 
+                    ^ din_xor[55] ^ din_xor[60] ^ din_xor[63];
+assign crc_s1_0[9] = din_xor[33] ^ din_xor[34] ^ din_xor[36] ^ din_xor[37] ^ din_xor[41] 
+                    ^ din_xor[43] ^ din_xor[44] ^ din_xor[45] ^ din_xor[50] ^ din_xor[55] 
+                    ^ din_xor[56] ^ din_xor[61];
+assign crc_s1_0[10] = din_xor[32] ^ din_xor[34] ^ din_xor[35] ^ din_xor[37] ^ din_xor[41] 
+                    ^ din_xor[45] ^ din_xor[46] ^ din_xor[48] ^ din_xor[51] ^ din_xor[58] 
+                    ^ din_xor[60] ^ din_xor[61] ^ din_xor[63];
+assign crc_s1_0[11] = din_xor[32] ^ din_xor[33] ^ din_xor[35] ^ din_xor[36] ^ din_xor[41] 
+                    ^ din_xor[44] ^ din_xor[46] ^ din_xor[47] ^ din_xor[48] ^ din_xor[49] 
+                    ^ din_xor[52] ^ din_xor[56] ^ din_xor[57] ^ din_xor[58] ^ din_xor[59] 
+                    ^ din_xor[60] ^ din_xor[63];
+assign crc_s1_0[12] = din_xor[32] ^ din_xor[33] ^ din_xor[34] ^ din_xor[36] ^ din_xor[37] 
+                    ^ din_xor[38] ^ din_xor[41] ^ din_xor[44] ^ din_xor[45] ^ din_xor[47] 
+                    ^ din_xor[49] ^ din_xor[50] ^ din_xor[53] ^ din_xor[56] ^ din_xor[59] 
+                    ^ din_xor[62] ^ din_xor[63];
+assign crc_s1_0[13] = din_xor[33] ^ din_xor[34] ^ din_xor[35] ^ din_xor[37] ^ din_xor[38] 
+                    ^ din_xor[39] ^ din_xor[42] ^ din_xor[45] ^ din_xor[46] ^ din_xor[48] 
+                    ^ din_xor[50] ^ din_xor[51] ^ din_xor[54] ^ din_xor[57] ^ din_xor[60] 
+                    ^ din_xor[63];
+assign crc_s1_0[14] = din_xor[34] ^ din_xor[35] ^ din_xor[36] ^ din_xor[38] ^ din_xor[39] 
+                    ^ din_xor[40] ^ din_xor[43] ^ din_xor[46] ^ din_xor[47] ^ din_xor[49] 
+                    ^ din_xor[51] ^ din_xor[52] ^ din_xor[55] ^ din_xor[58] ^ din_xor[61];
+assign crc_s1_0[15] = din_xor[35] ^ din_xor[36] ^ din_xor[37] ^ din_xor[39] ^ din_xor[40] 
+                    ^ din_xor[41] ^ din_xor[44] ^ din_xor[47] ^ din_xor[48] ^ din_xor[50] 
+                    ^ din_xor[52] ^ din_xor[53] ^ din_xor[56] ^ din_xor[59] ^ din_xor[62];
+assign crc_s1_0[16] = din_xor[32] ^ din_xor[36] ^ din_xor[37] ^ din_xor[40] ^ din_xor[44] 
+                    ^ din_xor[45] ^ din_xor[49] ^ din_xor[51] ^ din_xor[53] ^ din_xor[54] 
+                    ^ din_xor[56] ^ din_xor[58] ^ din_xor[61] ^ din_xor[62];
+assign crc_s1_0[17] = din_xor[33] ^ din_xor[37] ^ din_xor[38] ^ din_xor[41] ^ din_xor[45] 
+                    ^ din_xor[46] ^ din_xor[50] ^ din_xor[52] ^ din_xor[54] ^ din_xor[55] 
+                    ^ din_xor[57] ^ din_xor[59] ^ din_xor[62] ^ din_xor[63];
+assign crc_s1_0[18] = din_xor[34] ^ din_xor[38] ^ din_xor[39] ^ din_xor[42] ^ din_xor[46] 
+                    ^ din_xor[47] ^ din_xor[51] ^ din_xor[53] ^ din_xor[55] ^ din_xor[56] 
+                    ^ din_xor[58] ^ din_xor[60] ^ din_xor[63];
+assign crc_s1_0[19] = din_xor[35] ^ din_xor[39] ^ din_xor[40] ^ din_xor[43] ^ din_xor[47] 
+                    ^ din_xor[48] ^ din_xor[52] ^ din_xor[54] ^ din_xor[56] ^ din_xor[57] 
+                    ^ din_xor[59] ^ din_xor[61];
+assign crc_s1_0[20] = din_xor[36] ^ din_xor[40] ^ din_xor[41] ^ din_xor[44] ^ din_xor[48] 
+                    ^ din_xor[49] ^ din_xor[53] ^ din_xor[55] ^ din_xor[57] ^ din_xor[58] 
+                    ^ din_xor[60] ^ din_xor[62];
+assign crc_s1_0[21] = din_xor[37] ^ din_xor[41] ^ din_xor[42] ^ din_xor[45] ^ din_xor[49] 
+                    ^ din_xor[50] ^ din_xor[54] ^ din_xor[56] ^ din_xor[58] ^ din_xor[59] 
+                    ^ din_xor[61] ^ din_xor[63];
+assign crc_s1_0[22] = din_xor[32] ^ din_xor[41] ^ din_xor[43] ^ din_xor[44] ^ din_xor[46] 
+                    ^ din_xor[48] ^ din_xor[50] ^ din_xor[51] ^ din_xor[55] ^ din_xor[56] 
+                    ^ din_xor[58] ^ din_xor[59] ^ din_xor[61] ^ din_xor[63];
+assign crc_s1_0[23] = din_xor[32] ^ din_xor[33] ^ din_xor[38] ^ din_xor[41] ^ din_xor[45] 
+                    ^ din_xor[47] ^ din_xor[48] ^ din_xor[49] ^ din_xor[51] ^ din_xor[52] 
+                    ^ din_xor[58] ^ din_xor[59] ^ din_xor[61] ^ din_xor[63];
+assign crc_s1_0[24] = din_xor[33] ^ din_xor[34] ^ din_xor[39] ^ din_xor[42] ^ din_xor[46] 
+                    ^ din_xor[48] ^ din_xor[49] ^ din_xor[50] ^ din_xor[52] ^ din_xor[53] 
+                    ^ din_xor[59] ^ din_xor[60] ^ din_xor[62];
+assign crc_s1_0[25] = din_xor[34] ^ din_xor[35] ^ din_xor[40] ^ din_xor[43] ^ din_xor[47] 
+                    ^ din_xor[49] ^ din_xor[50] ^ din_xor[51] ^ din_xor[53] ^ din_xor[54] 
+                    ^ din_xor[60] ^ din_xor[61] ^ din_xor[63];
+assign crc_s1_0[26] = din_xor[32] ^ din_xor[35] ^ din_xor[36] ^ din_xor[38] ^ din_xor[42] 
+                    ^ din_xor[50] ^ din_xor[51] ^ din_xor[52] ^ din_xor[54] ^ din_xor[55] 
+                    ^ din_xor[56] ^ din_xor[57] ^ din_xor[58] ^ din_xor[60] ^ din_xor[63];
+assign crc_s1_0[27] = din_xor[33] ^ din_xor[36] ^ din_xor[37] ^ din_xor[39] ^ din_xor[43] 
+                    ^ din_xor[51] ^ din_xor[52] ^ din_xor[53] ^ din_xor[55] ^ din_xor[56] 
+                    ^ din_xor[57] ^ din_xor[58] ^ din_xor[59] ^ din_xor[61];
+assign crc_s1_0[28] = din_xor[34] ^ din_xor[37] ^ din_xor[38] ^ din_xor[40] ^ din_xor[44] 
+                    ^ din_xor[52] ^ din_xor[53] ^ din_xor[54] ^ din_xor[56] ^ din_xor[57] 
+                    ^ din_xor[58] ^ din_xor[59] ^ din_xor[60] ^ din_xor[62];
+assign crc_s1_0[29] = din_xor[35] ^ din_xor[38] ^ din_xor[39] ^ din_xor[41] ^ din_xor[45] 
+                    ^ din_xor[53] ^ din_xor[54] ^ din_xor[55] ^ din_xor[57] ^ din_xor[58] 
+                    ^ din_xor[59] ^ din_xor[60] ^ din_xor[61] ^ din_xor[63];
+assign crc_s1_0[30] = din_xor[36] ^ din_xor[39] ^ din_xor[40] ^ din_xor[42] ^ din_xor[46] 
+                    ^ din_xor[54] ^ din_xor[55] ^ din_xor[56] ^ din_xor[58] ^ din_xor[59] 
+                    ^ din_xor[60] ^ din_xor[61] ^ din_xor[62];
+assign crc_s1_0[31] = din_xor[37] ^ din_xor[40] ^ din_xor[41] ^ din_xor[43] ^ din_xor[47] 
+                    ^ din_xor[55] ^ din_xor[56] ^ din_xor[57] ^ din_xor[59] ^ din_xor[60] 
+                    ^ din_xor[61] ^ din_xor[62] ^ din_xor[63];
+wire [WIDTH-1 : 0] crc_s1_1;
+assign crc_s1_1[0] = din_xor[0] ^ din_xor[6] ^ din_xor[9] ^ din_xor[10] ^ din_xor[12] 
+                    ^ din_xor[16] ^ din_xor[24] ^ din_xor[25] ^ din_xor[26] ^ din_xor[28] 
+                    ^ din_xor[29] ^ din_xor[30] ^ din_xor[31];
+assign crc_s1_1[1] = din_xor[0] ^ din_xor[1] ^ din_xor[6] ^ din_xor[7] ^ din_xor[9] ^ din_xor[11] 
+                    ^ din_xor[12] ^ din_xor[13] ^ din_xor[16] ^ din_xor[17] ^ din_xor[24] 
+                    ^ din_xor[27] ^ din_xor[28];
+assign crc_s1_1[2] = din_xor[0] ^ din_xor[1] ^ din_xor[2] ^ din_xor[6] ^ din_xor[7] ^ din_xor[8] 
+                    ^ din_xor[9] ^ din_xor[13] ^ din_xor[14] ^ din_xor[16] ^ din_xor[17] 
+                    ^ din_xor[18] ^ din_xor[24] ^ din_xor[26] ^ din_xor[30] ^ din_xor[31];
+assign crc_s1_1[3] = din_xor[1] ^ din_xor[2] ^ din_xor[3] ^ din_xor[7] ^ din_xor[8] ^ din_xor[9] 
+                    ^ din_xor[10] ^ din_xor[14] ^ din_xor[15] ^ din_xor[17] ^ din_xor[18] 
+                    ^ din_xor[19] ^ din_xor[25] ^ din_xor[27] ^ din_xor[31];
+assign crc_s1_1[4] = din_xor[0] ^ din_xor[2] ^ din_xor[3] ^ din_xor[4] ^ din_xor[6] ^ din_xor[8] 
+                    ^ din_xor[11] ^ din_xor[12] ^ din_xor[15] ^ din_xor[18] ^ din_xor[19] 
+                    ^ din_xor[20] ^ din_xor[24] ^ din_xor[25] ^ din_xor[29] ^ din_xor[30] 
+                    ^ din_xor[31];
+assign crc_s1_1[5] = din_xor[0] ^ din_xor[1] ^ din_xor[3] ^ din_xor[4] ^ din_xor[5] ^ din_xor[6] 
+                    ^ din_xor[7] ^ din_xor[10] ^ din_xor[13] ^ din_xor[19] ^ din_xor[20] 
+                    ^ din_xor[21] ^ din_xor[24] ^ din_xor[28] ^ din_xor[29];
+assign crc_s1_1[6] = din_xor[1] ^ din_xor[2] ^ din_xor[4] ^ din_xor[5] ^ din_xor[6] ^ din_xor[7] 
+                    ^ din_xor[8] ^ din_xor[11] ^ din_xor[14] ^ din_xor[20] ^ din_xor[21] 
+                    ^ din_xor[22] ^ din_xor[25] ^ din_xor[29] ^ din_xor[30];
+assign crc_s1_1[7] = din_xor[0] ^ din_xor[2] ^ din_xor[3] ^ din_xor[5] ^ din_xor[7] ^ din_xor[8] 
+                    ^ din_xor[10] ^ din_xor[15] ^ din_xor[16] ^ din_xor[21] ^ din_xor[22] 
+                    ^ din_xor[23] ^ din_xor[24] ^ din_xor[25] ^ din_xor[28] ^ din_xor[29];
+assign crc_s1_1[8] = din_xor[0] ^ din_xor[1] ^ din_xor[3] ^ din_xor[4] ^ din_xor[8] ^ din_xor[10] 
+                    ^ din_xor[11] ^ din_xor[12] ^ din_xor[17] ^ din_xor[22] ^ din_xor[23] 
+                    ^ din_xor[28] ^ din_xor[31];
+assign crc_s1_1[9] = din_xor[1] ^ din_xor[2] ^ din_xor[4] ^ din_xor[5] ^ din_xor[9] ^ din_xor[11] 
+                    ^ din_xor[12] ^ din_xor[13] ^ din_xor[18] ^ din_xor[23] ^ din_xor[24] 
+                    ^ din_xor[29];
+assign crc_s1_1[10] = din_xor[0] ^ din_xor[2] ^ din_xor[3] ^ din_xor[5] ^ din_xor[9] ^ din_xor[13] 
+                    ^ din_xor[14] ^ din_xor[16] ^ din_xor[19] ^ din_xor[26] ^ din_xor[28] 
+                    ^ din_xor[29] ^ din_xor[31];
+assign crc_s1_1[11] = din_xor[0] ^ din_xor[1] ^ din_xor[3] ^ din_xor[4] ^ din_xor[9] ^ din_xor[12] 
+                    ^ din_xor[14] ^ din_xor[15] ^ din_xor[16] ^ din_xor[17] ^ din_xor[20] 
+                    ^ din_xor[24] ^ din_xor[25] ^ din_xor[26] ^ din_xor[27] ^ din_xor[28] 
+                    ^ din_xor[31];
+assign crc_s1_1[12] = din_xor[0] ^ din_xor[1] ^ din_xor[2] ^ din_xor[4] ^ din_xor[5] ^ din_xor[6] 
+                    ^ din_xor[9] ^ din_xor[12] ^ din_xor[13] ^ din_xor[15] ^ din_xor[17] 
+                    ^ din_xor[18] ^ din_xor[21] ^ din_xor[24] ^ din_xor[27] ^ din_xor[30] 
+                    ^ din_xor[31];
+assign crc_s1_1[13] = din_xor[1] ^ din_xor[2] ^ din_xor[3] ^ din_xor[5] ^ din_xor[6] ^ din_xor[7] 
+                    ^ din_xor[10] ^ din_xor[13] ^ din_xor[14] ^ din_xor[16] ^ din_xor[18] 
+                    ^ din_xor[19] ^ din_xor[22] ^ din_xor[25] ^ din_xor[28] ^ din_xor[31];
+assign crc_s1_1[14] = din_xor[2] ^ din_xor[3] ^ din_xor[4] ^ din_xor[6] ^ din_xor[7] ^ din_xor[8] 
+                    ^ din_xor[11] ^ din_xor[14] ^ din_xor[15] ^ din_xor[17] ^ din_xor[19] 
+                    ^ din_xor[20] ^ din_xor[23] ^ din_xor[26] ^ din_xor[29];
+assign crc_s1_1[15] = din_xor[3] ^ din_xor[4] ^ din_xor[5] ^ din_xor[7] ^ din_xor[8] ^ din_xor[9] 
+                    ^ din_xor[12] ^ din_xor[15] ^ din_xor[16] ^ din_xor[18] ^ din_xor[20] 
+                    ^ din_xor[21] ^ din_xor[24] ^ din_xor[27] ^ din_xor[30];
+assign crc_s1_1[16] = din_xor[0] ^ din_xor[4] ^ din_xor[5] ^ din_xor[8] ^ din_xor[12] 
+                    ^ din_xor[13] ^ din_xor[17] ^ din_xor[19] ^ din_xor[21] ^ din_xor[22] 
+                    ^ din_xor[24] ^ din_xor[26] ^ din_xor[29] ^ din_xor[30];
+assign crc_s1_1[17] = din_xor[1] ^ din_xor[5] ^ din_xor[6] ^ din_xor[9] ^ din_xor[13] 
+                    ^ din_xor[14] ^ din_xor[18] ^ din_xor[20] ^ din_xor[22] ^ din_xor[23] 
+                    ^ din_xor[25] ^ din_xor[27] ^ din_xor[30] ^ din_xor[31];
+assign crc_s1_1[18] = din_xor[2] ^ din_xor[6] ^ din_xor[7] ^ din_xor[10] ^ din_xor[14] 
+                    ^ din_xor[15] ^ din_xor[19] ^ din_xor[21] ^ din_xor[23] ^ din_xor[24] 
+                    ^ din_xor[26] ^ din_xor[28] ^ din_xor[31];
+assign crc_s1_1[19] = din_xor[3] ^ din_xor[7] ^ din_xor[8] ^ din_xor[11] ^ din_xor[15] 
+                    ^ din_xor[16] ^ din_xor[20] ^ din_xor[22] ^ din_xor[24] ^ din_xor[25] 
+                    ^ din_xor[27] ^ din_xor[29];
+assign crc_s1_1[20] = din_xor[4] ^ din_xor[8] ^ din_xor[9] ^ din_xor[12] ^ din_xor[16] 
+                    ^ din_xor[17] ^ din_xor[21] ^ din_xor[23] ^ din_xor[25] ^ din_xor[26] 
+                    ^ din_xor[28] ^ din_xor[30];
+assign crc_s1_1[21] = din_xor[5] ^ din_xor[9] ^ din_xor[10] ^ din_xor[13] ^ din_xor[17] 
+                    ^ din_xor[18] ^ din_xor[22] ^ din_xor[24] ^ din_xor[26] ^ din_xor[27] 
+                    ^ din_xor[29] ^ din_xor[31];
+assign crc_s1_1[22] = din_xor[0] ^ din_xor[9] ^ din_xor[11] ^ din_xor[12] ^ din_xor[14] 
+                    ^ din_xor[16] ^ din_xor[18] ^ din_xor[19] ^ din_xor[23] ^ din_xor[24] 
+                    ^ din_xor[26] ^ din_xor[27] ^ din_xor[29] ^ din_xor[31];
+assign crc_s1_1[23] = din_xor[0] ^ din_xor[1] ^ din_xor[6] ^ din_xor[9] ^ din_xor[13] 
+                    ^ din_xor[15] ^ din_xor[16] ^ din_xor[17] ^ din_xor[19] ^ din_xor[20] 
+                    ^ din_xor[26] ^ din_xor[27] ^ din_xor[29] ^ din_xor[31];
+assign crc_s1_1[24] = din_xor[1] ^ din_xor[2] ^ din_xor[7] ^ din_xor[10] ^ din_xor[14] 
+                    ^ din_xor[16] ^ din_xor[17] ^ din_xor[18] ^ din_xor[20] ^ din_xor[21] 
+                    ^ din_xor[27] ^ din_xor[28] ^ din_xor[30];
+assign crc_s1_1[25] = din_xor[2] ^ din_xor[3] ^ din_xor[8] ^ din_xor[11] ^ din_xor[15] 
+                    ^ din_xor[17] ^ din_xor[18] ^ din_xor[19] ^ din_xor[21] ^ din_xor[22] 
+                    ^ din_xor[28] ^ din_xor[29] ^ din_xor[31];
+assign crc_s1_1[26] = din_xor[0] ^ din_xor[3] ^ din_xor[4] ^ din_xor[6] ^ din_xor[10] 
+                    ^ din_xor[18] ^ din_xor[19] ^ din_xor[20] ^ din_xor[22] ^ din_xor[23] 
+                    ^ din_xor[24] ^ din_xor[25] ^ din_xor[26] ^ din_xor[28] ^ din_xor[31];
+assign crc_s1_1[27] = din_xor[1] ^ din_xor[4] ^ din_xor[5] ^ din_xor[7] ^ din_xor[11] 
+                    ^ din_xor[19] ^ din_xor[20] ^ din_xor[21] ^ din_xor[23] ^ din_xor[24] 
+                    ^ din_xor[25] ^ din_xor[26] ^ din_xor[27] ^ din_xor[29];
+assign crc_s1_1[28] = din_xor[2] ^ din_xor[5] ^ din_xor[6] ^ din_xor[8] ^ din_xor[12] 
+                    ^ din_xor[20] ^ din_xor[21] ^ din_xor[22] ^ din_xor[24] ^ din_xor[25] 
+                    ^ din_xor[26] ^ din_xor[27] ^ din_xor[28] ^ din_xor[30];
+assign crc_s1_1[29] = din_xor[3] ^ din_xor[6] ^ din_xor[7] ^ din_xor[9] ^ din_xor[13] 
+                    ^ din_xor[21] ^ din_xor[22] ^ din_xor[23] ^ din_xor[25] ^ din_xor[26] 
+                    ^ din_xor[27] ^ din_xor[28] ^ din_xor[29] ^ din_xor[31];
+assign crc_s1_1[30] = din_xor[4] ^ din_xor[7] ^ din_xor[8] ^ din_xor[10] ^ din_xor[14] 
+                    ^ din_xor[22] ^ din_xor[23] ^ din_xor[24] ^ din_xor[26] ^ din_xor[27] 
+                    ^ din_xor[28] ^ din_xor[29] ^ din_xor[30];
+assign crc_s1_1[31] = din_xor[5] ^ din_xor[8] ^ din_xor[9] ^ din_xor[11] ^ din_xor[15] 
+                    ^ din_xor[23] ^ din_xor[24] ^ din_xor[25] ^ din_xor[27] ^ din_xor[28] 
+                    ^ din_xor[29] ^ din_xor[30] ^ din_xor[31];
+reg  [WIDTH-1 : 0] crc_s1_0_r;
+reg  [WIDTH-1 : 0] crc_s1_1_r;
+always @(posedge clk) begin
+  crc_s1_0_r <= crc_s1_0;
+  crc_s1_1_r <= crc_s1_1;
+end
+// 第2级: 相邻两段的余数合并
+wire [WIDTH-1 : 0] crc_s2_0;
+assign crc_s2_0[0] = crc_s1_0_r[0] ^ crc_s1_0_r[6] ^ crc_s1_0_r[9] ^ crc_s1_0_r[10] 
+                    ^ crc_s1_0_r[12] ^ crc_s1_0_r[16] ^ crc_s1_0_r[24] ^ crc_s1_0_r[25] 
+                    ^ crc_s1_0_r[26] ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] ^ crc_s1_0_r[30] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[0];
+assign crc_s2_0[1] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[6] ^ crc_s1_0_r[7] ^ crc_s1_0_r[9] 
+                    ^ crc_s1_0_r[11] ^ crc_s1_0_r[12] ^ crc_s1_0_r[13] ^ crc_s1_0_r[16] 
+                    ^ crc_s1_0_r[17] ^ crc_s1_0_r[24] ^ crc_s1_0_r[27] ^ crc_s1_0_r[28] 
+                    ^ crc_s1_1_r[1];
+assign crc_s2_0[2] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[6] ^ crc_s1_0_r[7] 
+                    ^ crc_s1_0_r[8] ^ crc_s1_0_r[9] ^ crc_s1_0_r[13] ^ crc_s1_0_r[14] 
+                    ^ crc_s1_0_r[16] ^ crc_s1_0_r[17] ^ crc_s1_0_r[18] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[26] ^ crc_s1_0_r[30] ^ crc_s1_0_r[31] ^ crc_s1_1_r[2];
+assign crc_s2_0[3] = crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[7] ^ crc_s1_0_r[8] 
+                    ^ crc_s1_0_r[9] ^ crc_s1_0_r[10] ^ crc_s1_0_r[14] ^ crc_s1_0_r[15] 
+                    ^ crc_s1_0_r[17] ^ crc_s1_0_r[18] ^ crc_s1_0_r[19] ^ crc_s1_0_r[25] 
+                    ^ crc_s1_0_r[27] ^ crc_s1_0_r[31] ^ crc_s1_1_r[3];
+assign crc_s2_0[4] = crc_s1_0_r[0] ^ crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[4] ^ crc_s1_0_r[6] 
+                    ^ crc_s1_0_r[8] ^ crc_s1_0_r[11] ^ crc_s1_0_r[12] ^ crc_s1_0_r[15] 
+                    ^ crc_s1_0_r[18] ^ crc_s1_0_r[19] ^ crc_s1_0_r[20] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[25] ^ crc_s1_0_r[29] ^ crc_s1_0_r[30] ^ crc_s1_0_r[31] 
+                    ^ crc_s1_1_r[4];
+assign crc_s2_0[5] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[3] ^ crc_s1_0_r[4] ^ crc_s1_0_r[5] 
+                    ^ crc_s1_0_r[6] ^ crc_s1_0_r[7] ^ crc_s1_0_r[10] ^ crc_s1_0_r[13] 
+                    ^ crc_s1_0_r[19] ^ crc_s1_0_r[20] ^ crc_s1_0_r[21] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] ^ crc_s1_1_r[5];
+assign crc_s2_0[6] = crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[4] ^ crc_s1_0_r[5] ^ crc_s1_0_r[6] 
+                    ^ crc_s1_0_r[7] ^ crc_s1_0_r[8] ^ crc_s1_0_r[11] ^ crc_s1_0_r[14] 
+                    ^ crc_s1_0_r[20] ^ crc_s1_0_r[21] ^ crc_s1_0_r[22] ^ crc_s1_0_r[25] 
+                    ^ crc_s1_0_r[29] ^ crc_s1_0_r[30] ^ crc_s1_1_r[6];
+assign crc_s2_0[7] = crc_s1_0_r[0] ^ crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[5] ^ crc_s1_0_r[7] 
+                    ^ crc_s1_0_r[8] ^ crc_s1_0_r[10] ^ crc_s1_0_r[15] ^ crc_s1_0_r[16] 
+                    ^ crc_s1_0_r[21] ^ crc_s1_0_r[22] ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[25] ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] ^ crc_s1_1_r[7];
+assign crc_s2_0[8] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[3] ^ crc_s1_0_r[4] ^ crc_s1_0_r[8] 
+                    ^ crc_s1_0_r[10] ^ crc_s1_0_r[11] ^ crc_s1_0_r[12] ^ crc_s1_0_r[17] 
+                    ^ crc_s1_0_r[22] ^ crc_s1_0_r[23] ^ crc_s1_0_r[28] ^ crc_s1_0_r[31] 
+                    ^ crc_s1_1_r[8];
+assign crc_s2_0[9] = crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[4] ^ crc_s1_0_r[5] ^ crc_s1_0_r[9] 
+                    ^ crc_s1_0_r[11] ^ crc_s1_0_r[12] ^ crc_s1_0_r[13] ^ crc_s1_0_r[18] 
+                    ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] ^ crc_s1_0_r[29] ^ crc_s1_1_r[9];
+assign crc_s2_0[10] = crc_s1_0_r[0] ^ crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[5] 
+                    ^ crc_s1_0_r[9] ^ crc_s1_0_r[13] ^ crc_s1_0_r[14] ^ crc_s1_0_r[16] 
+                    ^ crc_s1_0_r[19] ^ crc_s1_0_r[26] ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[10];
+assign crc_s2_0[11] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[3] ^ crc_s1_0_r[4] 
+                    ^ crc_s1_0_r[9] ^ crc_s1_0_r[12] ^ crc_s1_0_r[14] ^ crc_s1_0_r[15] 
+                    ^ crc_s1_0_r[16] ^ crc_s1_0_r[17] ^ crc_s1_0_r[20] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[25] ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] ^ crc_s1_0_r[28] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[11];
+assign crc_s2_0[12] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[4] 
+                    ^ crc_s1_0_r[5] ^ crc_s1_0_r[6] ^ crc_s1_0_r[9] ^ crc_s1_0_r[12] 
+                    ^ crc_s1_0_r[13] ^ crc_s1_0_r[15] ^ crc_s1_0_r[17] ^ crc_s1_0_r[18] 
+                    ^ crc_s1_0_r[21] ^ crc_s1_0_r[24] ^ crc_s1_0_r[27] ^ crc_s1_0_r[30] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[12];
+assign crc_s2_0[13] = crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[5] 
+                    ^ crc_s1_0_r[6] ^ crc_s1_0_r[7] ^ crc_s1_0_r[10] ^ crc_s1_0_r[13] 
+                    ^ crc_s1_0_r[14] ^ crc_s1_0_r[16] ^ crc_s1_0_r[18] ^ crc_s1_0_r[19] 
+                    ^ crc_s1_0_r[22] ^ crc_s1_0_r[25] ^ crc_s1_0_r[28] ^ crc_s1_0_r[31] 
+                    ^ crc_s1_1_r[13];
+assign crc_s2_0[14] = crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[4] ^ crc_s1_0_r[6] 
+                    ^ crc_s1_0_r[7] ^ crc_s1_0_r[8] ^ crc_s1_0_r[11] ^ crc_s1_0_r[14] 
+                    ^ crc_s1_0_r[15] ^ crc_s1_0_r[17] ^ crc_s1_0_r[19] ^ crc_s1_0_r[20] 
+                    ^ crc_s1_0_r[23] ^ crc_s1_0_r[26] ^ crc_s1_0_r[29] ^ crc_s1_1_r[14];
+assign crc_s2_0[15] = crc_s1_0_r[3] ^ crc_s1_0_r[4] ^ crc_s1_0_r[5] ^ crc_s1_0_r[7] 
+                    ^ crc_s1_0_r[8] ^ crc_s1_0_r[9] ^ crc_s1_0_r[12] ^ crc_s1_0_r[15] 
+                    ^ crc_s1_0_r[16] ^ crc_s1_0_r[18] ^ crc_s1_0_r[20] ^ crc_s1_0_r[21] 
+                    ^ crc_s1_0_r[24] ^ crc_s1_0_r[27] ^ crc_s1_0_r[30] ^ crc_s1_1_r[15];
+assign crc_s2_0[16] = crc_s1_0_r[0] ^ crc_s1_0_r[4] ^ crc_s1_0_r[5] ^ crc_s1_0_r[8] 
+                    ^ crc_s1_0_r[12] ^ crc_s1_0_r[13] ^ crc_s1_0_r[17] ^ crc_s1_0_r[19] 
+                    ^ crc_s1_0_r[21] ^ crc_s1_0_r[22] ^ crc_s1_0_r[24] ^ crc_s1_0_r[26] 
+                    ^ crc_s1_0_r[29] ^ crc_s1_0_r[30] ^ crc_s1_1_r[16];
+assign crc_s2_0[17] = crc_s1_0_r[1] ^ crc_s1_0_r[5] ^ crc_s1_0_r[6] ^ crc_s1_0_r[9] 
+                    ^ crc_s1_0_r[13] ^ crc_s1_0_r[14] ^ crc_s1_0_r[18] ^ crc_s1_0_r[20] 
+                    ^ crc_s1_0_r[22] ^ crc_s1_0_r[23] ^ crc_s1_0_r[25] ^ crc_s1_0_r[27] 
+                    ^ crc_s1_0_r[30] ^ crc_s1_0_r[31] ^ crc_s1_1_r[17];
+assign crc_s2_0[18] = crc_s1_0_r[2] ^ crc_s1_0_r[6] ^ crc_s1_0_r[7] ^ crc_s1_0_r[10] 
+                    ^ crc_s1_0_r[14] ^ crc_s1_0_r[15] ^ crc_s1_0_r[19] ^ crc_s1_0_r[21] 
+                    ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] ^ crc_s1_0_r[26] ^ crc_s1_0_r[28] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[18];
+assign crc_s2_0[19] = crc_s1_0_r[3] ^ crc_s1_0_r[7] ^ crc_s1_0_r[8] ^ crc_s1_0_r[11] 
+                    ^ crc_s1_0_r[15] ^ crc_s1_0_r[16] ^ crc_s1_0_r[20] ^ crc_s1_0_r[22] 
+                    ^ crc_s1_0_r[24] ^ crc_s1_0_r[25] ^ crc_s1_0_r[27] ^ crc_s1_0_r[29] 
+                    ^ crc_s1_1_r[19];
+assign crc_s2_0[20] = crc_s1_0_r[4] ^ crc_s1_0_r[8] ^ crc_s1_0_r[9] ^ crc_s1_0_r[12] 
+                    ^ crc_s1_0_r[16] ^ crc_s1_0_r[17] ^ crc_s1_0_r[21] ^ crc_s1_0_r[23] 
+                    ^ crc_s1_0_r[25] ^ crc_s1_0_r[26] ^ crc_s1_0_r[28] ^ crc_s1_0_r[30] 
+                    ^ crc_s1_1_r[20];
+assign crc_s2_0[21] = crc_s1_0_r[5] ^ crc_s1_0_r[9] ^ crc_s1_0_r[10] ^ crc_s1_0_r[13] 
+                    ^ crc_s1_0_r[17] ^ crc_s1_0_r[18] ^ crc_s1_0_r[22] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] ^ crc_s1_0_r[29] ^ crc_s1_0_r[31] 
+                    ^ crc_s1_1_r[21];
+assign crc_s2_0[22] = crc_s1_0_r[0] ^ crc_s1_0_r[9] ^ crc_s1_0_r[11] ^ crc_s1_0_r[12] 
+                    ^ crc_s1_0_r[14] ^ crc_s1_0_r[16] ^ crc_s1_0_r[18] ^ crc_s1_0_r[19] 
+                    ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] 
+                    ^ crc_s1_0_r[29] ^ crc_s1_0_r[31] ^ crc_s1_1_r[22];
+assign crc_s2_0[23] = crc_s1_0_r[0] ^ crc_s1_0_r[1] ^ crc_s1_0_r[6] ^ crc_s1_0_r[9] 
+                    ^ crc_s1_0_r[13] ^ crc_s1_0_r[15] ^ crc_s1_0_r[16] ^ crc_s1_0_r[17] 
+                    ^ crc_s1_0_r[19] ^ crc_s1_0_r[20] ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] 
+                    ^ crc_s1_0_r[29] ^ crc_s1_0_r[31] ^ crc_s1_1_r[23];
+assign crc_s2_0[24] = crc_s1_0_r[1] ^ crc_s1_0_r[2] ^ crc_s1_0_r[7] ^ crc_s1_0_r[10] 
+                    ^ crc_s1_0_r[14] ^ crc_s1_0_r[16] ^ crc_s1_0_r[17] ^ crc_s1_0_r[18] 
+                    ^ crc_s1_0_r[20] ^ crc_s1_0_r[21] ^ crc_s1_0_r[27] ^ crc_s1_0_r[28] 
+                    ^ crc_s1_0_r[30] ^ crc_s1_1_r[24];
+assign crc_s2_0[25] = crc_s1_0_r[2] ^ crc_s1_0_r[3] ^ crc_s1_0_r[8] ^ crc_s1_0_r[11] 
+                    ^ crc_s1_0_r[15] ^ crc_s1_0_r[17] ^ crc_s1_0_r[18] ^ crc_s1_0_r[19] 
+                    ^ crc_s1_0_r[21] ^ crc_s1_0_r[22] ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[25];
+assign crc_s2_0[26] = crc_s1_0_r[0] ^ crc_s1_0_r[3] ^ crc_s1_0_r[4] ^ crc_s1_0_r[6] 
+                    ^ crc_s1_0_r[10] ^ crc_s1_0_r[18] ^ crc_s1_0_r[19] ^ crc_s1_0_r[20] 
+                    ^ crc_s1_0_r[22] ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] ^ crc_s1_0_r[25] 
+                    ^ crc_s1_0_r[26] ^ crc_s1_0_r[28] ^ crc_s1_0_r[31] ^ crc_s1_1_r[26];
+assign crc_s2_0[27] = crc_s1_0_r[1] ^ crc_s1_0_r[4] ^ crc_s1_0_r[5] ^ crc_s1_0_r[7] 
+                    ^ crc_s1_0_r[11] ^ crc_s1_0_r[19] ^ crc_s1_0_r[20] ^ crc_s1_0_r[21] 
+                    ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] ^ crc_s1_0_r[25] ^ crc_s1_0_r[26] 
+                    ^ crc_s1_0_r[27] ^ crc_s1_0_r[29] ^ crc_s1_1_r[27];
+assign crc_s2_0[28] = crc_s1_0_r[2] ^ crc_s1_0_r[5] ^ crc_s1_0_r[6] ^ crc_s1_0_r[8] 
+                    ^ crc_s1_0_r[12] ^ crc_s1_0_r[20] ^ crc_s1_0_r[21] ^ crc_s1_0_r[22] 
+                    ^ crc_s1_0_r[24] ^ crc_s1_0_r[25] ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] 
+                    ^ crc_s1_0_r[28] ^ crc_s1_0_r[30] ^ crc_s1_1_r[28];
+assign crc_s2_0[29] = crc_s1_0_r[3] ^ crc_s1_0_r[6] ^ crc_s1_0_r[7] ^ crc_s1_0_r[9] 
+                    ^ crc_s1_0_r[13] ^ crc_s1_0_r[21] ^ crc_s1_0_r[22] ^ crc_s1_0_r[23] 
+                    ^ crc_s1_0_r[25] ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] ^ crc_s1_0_r[28] 
+                    ^ crc_s1_0_r[29] ^ crc_s1_0_r[31] ^ crc_s1_1_r[29];
+assign crc_s2_0[30] = crc_s1_0_r[4] ^ crc_s1_0_r[7] ^ crc_s1_0_r[8] ^ crc_s1_0_r[10] 
+                    ^ crc_s1_0_r[14] ^ crc_s1_0_r[22] ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] 
+                    ^ crc_s1_0_r[26] ^ crc_s1_0_r[27] ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] 
+                    ^ crc_s1_0_r[30] ^ crc_s1_1_r[30];
+assign crc_s2_0[31] = crc_s1_0_r[5] ^ crc_s1_0_r[8] ^ crc_s1_0_r[9] ^ crc_s1_0_r[11] 
+                    ^ crc_s1_0_r[15] ^ crc_s1_0_r[23] ^ crc_s1_0_r[24] ^ crc_s1_0_r[25] 
+                    ^ crc_s1_0_r[27] ^ crc_s1_0_r[28] ^ crc_s1_0_r[29] ^ crc_s1_0_r[30] 
+                    ^ crc_s1_0_r[31] ^ crc_s1_1_r[31];
+reg  [WIDTH-1 : 0] crc_s2_0_r;
+always @(posedge clk) begin
+  crc_s2_0_r <= crc_s2_0;
+end
+// 反馈: crc·T^DIN_WIDTH 与数据余数异或
+assign crc_calc[0] = crc[0] ^ crc[2] ^ crc[5] ^ crc[12] ^ crc[13] ^ crc[15] ^ crc[16] ^ crc[18] 
+                    ^ crc[21] ^ crc[22] ^ crc[23] ^ crc[26] ^ crc[28] ^ crc[29] ^ crc[31] 
+                    ^ crc_s2_0_r[0];
+assign crc_calc[1] = crc[1] ^ crc[2] ^ crc[3] ^ crc[5] ^ crc[6] ^ crc[12] ^ crc[14] ^ crc[15] 
+                    ^ crc[17] ^ crc[18] ^ crc[19] ^ crc[21] ^ crc[24] ^ crc[26] ^ crc[27] 
+                    ^ crc[28] ^ crc[30] ^ crc[31] ^ crc_s2_0_r[1];
+assign crc_calc[2] = crc[0] ^ crc[3] ^ crc[4] ^ crc[5] ^ crc[6] ^ crc[7] ^ crc[12] ^ crc[19] 
+                    ^ crc[20] ^ crc[21] ^ crc[23] ^ crc[25] ^ crc[26] ^ crc[27] ^ crc_s2_0_r[2];
+assign crc_calc[3] = crc[0] ^ crc[1] ^ crc[4] ^ crc[5] ^ crc[6] ^ crc[7] ^ crc[8] ^ crc[13] 
+                    ^ crc[20] ^ crc[21] ^ crc[22] ^ crc[24] ^ crc[26] ^ crc[27] ^ crc[28] 
+                    ^ crc_s2_0_r[3];
+assign crc_calc[4] = crc[1] ^ crc[6] ^ crc[7] ^ crc[8] ^ crc[9] ^ crc[12] ^ crc[13] ^ crc[14] 
+                    ^ crc[15] ^ crc[16] ^ crc[18] ^ crc[25] ^ crc[26] ^ crc[27] ^ crc[31] 
+                    ^ crc_s2_0_r[4];
+assign crc_calc[5] = crc[5] ^ crc[7] ^ crc[8] ^ crc[9] ^ crc[10] ^ crc[12] ^ crc[14] ^ crc[17] 
+                    ^ crc[18] ^ crc[19] ^ crc[21] ^ crc[22] ^ crc[23] ^ crc[27] ^ crc[29] 
+                    ^ crc[31] ^ crc_s2_0_r[5];
+assign crc_calc[6] = crc[6] ^ crc[8] ^ crc[9] ^ crc[10] ^ crc[11] ^ crc[13] ^ crc[15] ^ crc[18] 
+                    ^ crc[19] ^ crc[20] ^ crc[22] ^ crc[23] ^ crc[24] ^ crc[28] ^ crc[30] 
+                    ^ crc_s2_0_r[6];
+assign crc_calc[7] = crc[0] ^ crc[2] ^ crc[5] ^ crc[7] ^ crc[9] ^ crc[10] ^ crc[11] ^ crc[13] 
+                    ^ crc[14] ^ crc[15] ^ crc[18] ^ crc[19] ^ crc[20] ^ crc[22] ^ crc[24] 
+                    ^ crc[25] ^ crc[26] ^ crc[28] ^ crc_s2_0_r[7];
+assign crc_calc[8] = crc[0] ^ crc[1] ^ crc[2] ^ crc[3] ^ crc[5] ^ crc[6] ^ crc[8] ^ crc[10] 
+                    ^ crc[11] ^ crc[13] ^ crc[14] ^ crc[18] ^ crc[19] ^ crc[20] ^ crc[22] 
+                    ^ crc[25] ^ crc[27] ^ crc[28] ^ crc[31] ^ crc_s2_0_r[8];
+assign crc_calc[9] = crc[0] ^ crc[1] ^ crc[2] ^ crc[3] ^ crc[4] ^ crc[6] ^ crc[7] ^ crc[9] 
+                    ^ crc[11] ^ crc[12] ^ crc[14] ^ crc[15] ^ crc[19] ^ crc[20] ^ crc[21] 
+                    ^ crc[23] ^ crc[26] ^ crc[28] ^ crc[29] ^ crc_s2_0_r[9];
+assign crc_calc[10] = crc[0] ^ crc[1] ^ crc[3] ^ crc[4] ^ crc[7] ^ crc[8] ^ crc[10] ^ crc[18] 
+                    ^ crc[20] ^ crc[23] ^ crc[24] ^ crc[26] ^ crc[27] ^ crc[28] ^ crc[30] 
+                    ^ crc[31] ^ crc_s2_0_r[10];
+assign crc_calc[11] = crc[1] ^ crc[4] ^ crc[8] ^ crc[9] ^ crc[11] ^ crc[12] ^ crc[13] ^ crc[15] 
+                    ^ crc[16] ^ crc[18] ^ crc[19] ^ crc[22] ^ crc[23] ^ crc[24] ^ crc[25] 
+                    ^ crc[26] ^ crc[27] ^ crc_s2_0_r[11];
+assign crc_calc[12] = crc[9] ^ crc[10] ^ crc[14] ^ crc[15] ^ crc[17] ^ crc[18] ^ crc[19] ^ crc[20] 
+                    ^ crc[21] ^ crc[22] ^ crc[24] ^ crc[25] ^ crc[27] ^ crc[29] ^ crc[31] 
+                    ^ crc_s2_0_r[12];
+assign crc_calc[13] = crc[0] ^ crc[10] ^ crc[11] ^ crc[15] ^ crc[16] ^ crc[18] ^ crc[19] ^ crc[20] 
+                    ^ crc[21] ^ crc[22] ^ crc[23] ^ crc[25] ^ crc[26] ^ crc[28] ^ crc[30] 
+                    ^ crc_s2_0_r[13];
+assign crc_calc[14] = crc[0] ^ crc[1] ^ crc[11] ^ crc[12] ^ crc[16] ^ crc[17] ^ crc[19] ^ crc[20] 
+                    ^ crc[21] ^ crc[22] ^ crc[23] ^ crc[24] ^ crc[26] ^ crc[27] ^ crc[29] 
+                    ^ crc[31] ^ crc_s2_0_r[14];
+assign crc_calc[15] = crc[1] ^ crc[2] ^ crc[12] ^ crc[13] ^ crc[17] ^ crc[18] ^ crc[20] ^ crc[21] 
+                    ^ crc[22] ^ crc[23] ^ crc[24] ^ crc[25] ^ crc[27] ^ crc[28] ^ crc[30] 
+                    ^ crc_s2_0_r[15];
+assign crc_calc[16] = crc[0] ^ crc[3] ^ crc[5] ^ crc[12] ^ crc[14] ^ crc[15] ^ crc[16] ^ crc[19] 
+                    ^ crc[24] ^ crc[25] ^ crc_s2_0_r[16];
+assign crc_calc[17] = crc[1] ^ crc[4] ^ crc[6] ^ crc[13] ^ crc[15] ^ crc[16] ^ crc[17] ^ crc[20] 
+                    ^ crc[25] ^ crc[26] ^ crc_s2_0_r[17];
+assign crc_calc[18] = crc[0] ^ crc[2] ^ crc[5] ^ crc[7] ^ crc[14] ^ crc[16] ^ crc[17] ^ crc[18] 
+                    ^ crc[21] ^ crc[26] ^ crc[27] ^ crc_s2_0_r[18];
+assign crc_calc[19] = crc[0] ^ crc[1] ^ crc[3] ^ crc[6] ^ crc[8] ^ crc[15] ^ crc[17] ^ crc[18] 
+                    ^ crc[19] ^ crc[22] ^ crc[27] ^ crc[28] ^ crc_s2_0_r[19];
+assign crc_calc[20] = crc[1] ^ crc[2] ^ crc[4] ^ crc[7] ^ crc[9] ^ crc[16] ^ crc[18] ^ crc[19] 
+                    ^ crc[20] ^ crc[23] ^ crc[28] ^ crc[29] ^ crc_s2_0_r[20];
+assign crc_calc[21] = crc[2] ^ crc[3] ^ crc[5] ^ crc[8] ^ crc[10] ^ crc[17] ^ crc[19] ^ crc[20] 
+                    ^ crc[21] ^ crc[24] ^ crc[29] ^ crc[30] ^ crc_s2_0_r[21];
+assign crc_calc[22] = crc[2] ^ crc[3] ^ crc[4] ^ crc[5] ^ crc[6] ^ crc[9] ^ crc[11] ^ crc[12] 
+                    ^ crc[13] ^ crc[15] ^ crc[16] ^ crc[20] ^ crc[23] ^ crc[25] ^ crc[26] 
+                    ^ crc[28] ^ crc[29] ^ crc[30] ^ crc_s2_0_r[22];
+assign crc_calc[23] = crc[2] ^ crc[3] ^ crc[4] ^ crc[6] ^ crc[7] ^ crc[10] ^ crc[14] ^ crc[15] 
+                    ^ crc[17] ^ crc[18] ^ crc[22] ^ crc[23] ^ crc[24] ^ crc[27] ^ crc[28] 
+                    ^ crc[30] ^ crc_s2_0_r[23];
+assign crc_calc[24] = crc[0] ^ crc[3] ^ crc[4] ^ crc[5] ^ crc[7] ^ crc[8] ^ crc[11] ^ crc[15] 
+                    ^ crc[16] ^ crc[18] ^ crc[19] ^ crc[23] ^ crc[24] ^ crc[25] ^ crc[28] 
+                    ^ crc[29] ^ crc[31] ^ crc_s2_0_r[24];
+assign crc_calc[25] = crc[1] ^ crc[4] ^ crc[5] ^ crc[6] ^ crc[8] ^ crc[9] ^ crc[12] ^ crc[16] 
+                    ^ crc[17] ^ crc[19] ^ crc[20] ^ crc[24] ^ crc[25] ^ crc[26] ^ crc[29] 
+                    ^ crc[30] ^ crc_s2_0_r[25];
+assign crc_calc[26] = crc[6] ^ crc[7] ^ crc[9] ^ crc[10] ^ crc[12] ^ crc[15] ^ crc[16] ^ crc[17] 
+                    ^ crc[20] ^ crc[22] ^ crc[23] ^ crc[25] ^ crc[27] ^ crc[28] ^ crc[29] 
+                    ^ crc[30] ^ crc_s2_0_r[26];
+assign crc_calc[27] = crc[0] ^ crc[7] ^ crc[8] ^ crc[10] ^ crc[11] ^ crc[13] ^ crc[16] ^ crc[17] 
+                    ^ crc[18] ^ crc[21] ^ crc[23] ^ crc[24] ^ crc[26] ^ crc[28] ^ crc[29] 
+                    ^ crc[30] ^ crc[31] ^ crc_s2_0_r[27];
+assign crc_calc[28] = crc[1] ^ crc[8] ^ crc[9] ^ crc[11] ^ crc[12] ^ crc[14] ^ crc[17] ^ crc[18] 
+                    ^ crc[19] ^ crc[22] ^ crc[24] ^ crc[25] ^ crc[27] ^ crc[29] ^ crc[30] 
+                    ^ crc[31] ^ crc_s2_0_r[28];
+assign crc_calc[29] = crc[2] ^ crc[9] ^ crc[10] ^ crc[12] ^ crc[13] ^ crc[15] ^ crc[18] ^ crc[19] 
+                    ^ crc[20] ^ crc[23] ^ crc[25] ^ crc[26] ^ crc[28] ^ crc[30] ^ crc[31] 
+                    ^ crc_s2_0_r[29];
+assign crc_calc[30] = crc[0] ^ crc[3] ^ crc[10] ^ crc[11] ^ crc[13] ^ crc[14] ^ crc[16] ^ crc[19] 
+                    ^ crc[20] ^ crc[21] ^ crc[24] ^ crc[26] ^ crc[27] ^ crc[29] ^ crc[31] 
+                    ^ crc_s2_0_r[30];
+assign crc_calc[31] = crc[1] ^ crc[4] ^ crc[11] ^ crc[12] ^ crc[14] ^ crc[15] ^ crc[17] ^ crc[20] 
+                    ^ crc[21] ^ crc[22] ^ crc[25] ^ crc[27] ^ crc[28] ^ crc[30] ^ crc_s2_0_r[31];
+// 输出: 最后一段数据按整段计算, 乘以T^-(DIN_WIDTH-LAST_DIN_WIDTH)还原
+assign crc_calc_last[0] = crc_last[0] ^ crc_last[3] ^ crc_last[4] ^ crc_last[5] ^ crc_last[6] 
+                    ^ crc_last[9] ^ crc_last[11] ^ crc_last[16] ^ crc_last[17] ^ crc_last[18] 
+                    ^ crc_last[19] ^ crc_last[20] ^ crc_last[21] ^ crc_last[22] ^ crc_last[23] 
+                    ^ crc_last[25] ^ crc_last[26] ^ crc_last[29];
+assign crc_calc_last[1] = crc_last[1] ^ crc_last[3] ^ crc_last[7] ^ crc_last[9] ^ crc_last[10] 
+                    ^ crc_last[11] ^ crc_last[12] ^ crc_last[16] ^ crc_last[24] ^ crc_last[25] 
+                    ^ crc_last[27] ^ crc_last[29] ^ crc_last[30];
+assign crc_calc_last[2] = crc_last[2] ^ crc_last[3] ^ crc_last[5] ^ crc_last[6] ^ crc_last[8] 
+                    ^ crc_last[9] ^ crc_last[10] ^ crc_last[12] ^ crc_last[13] ^ crc_last[16] 
+                    ^ crc_last[18] ^ crc_last[19] ^ crc_last[20] ^ crc_last[21] ^ crc_last[22] 
+                    ^ crc_last[23] ^ crc_last[28] ^ crc_last[29] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[3] = crc_last[0] ^ crc_last[3] ^ crc_last[4] ^ crc_last[6] ^ crc_last[7] 
+                    ^ crc_last[9] ^ crc_last[10] ^ crc_last[11] ^ crc_last[13] ^ crc_last[14] 
+                    ^ crc_last[17] ^ crc_last[19] ^ crc_last[20] ^ crc_last[21] ^ crc_last[22] 
+                    ^ crc_last[23] ^ crc_last[24] ^ crc_last[29] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[4] = crc_last[1] ^ crc_last[3] ^ crc_last[6] ^ crc_last[7] ^ crc_last[8] 
+                    ^ crc_last[9] ^ crc_last[10] ^ crc_last[12] ^ crc_last[14] ^ crc_last[15] 
+                    ^ crc_last[16] ^ crc_last[17] ^ crc_last[19] ^ crc_last[24] ^ crc_last[26] 
+                    ^ crc_last[29] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[5] = crc_last[0] ^ crc_last[2] ^ crc_last[3] ^ crc_last[5] ^ crc_last[6] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[10] ^ crc_last[13] ^ crc_last[15] 
+                    ^ crc_last[19] ^ crc_last[21] ^ crc_last[22] ^ crc_last[23] ^ crc_last[26] 
+                    ^ crc_last[27] ^ crc_last[29] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[6] = crc_last[0] ^ crc_last[1] ^ crc_last[3] ^ crc_last[4] ^ crc_last[6] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[9] ^ crc_last[11] ^ crc_last[14] 
+                    ^ crc_last[16] ^ crc_last[20] ^ crc_last[22] ^ crc_last[23] ^ crc_last[24] 
+                    ^ crc_last[27] ^ crc_last[28] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[7] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[3] ^ crc_last[6] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[10] ^ crc_last[11] ^ crc_last[12] 
+                    ^ crc_last[15] ^ crc_last[16] ^ crc_last[18] ^ crc_last[19] ^ crc_last[20] 
+                    ^ crc_last[22] ^ crc_last[24] ^ crc_last[26] ^ crc_last[28] ^ crc_last[31];
+assign crc_calc_last[8] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[5] ^ crc_last[6] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[12] ^ crc_last[13] ^ crc_last[18] 
+                    ^ crc_last[22] ^ crc_last[26] ^ crc_last[27];
+assign crc_calc_last[9] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[3] ^ crc_last[6] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[9] ^ crc_last[13] ^ crc_last[14] 
+                    ^ crc_last[19] ^ crc_last[23] ^ crc_last[27] ^ crc_last[28];
+assign crc_calc_last[10] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[5] ^ crc_last[6] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[10] ^ crc_last[11] ^ crc_last[14] 
+                    ^ crc_last[15] ^ crc_last[16] ^ crc_last[17] ^ crc_last[18] ^ crc_last[19] 
+                    ^ crc_last[21] ^ crc_last[22] ^ crc_last[23] ^ crc_last[24] ^ crc_last[25] 
+                    ^ crc_last[26] ^ crc_last[28];
+assign crc_calc_last[11] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[4] ^ crc_last[5] 
+                    ^ crc_last[7] ^ crc_last[8] ^ crc_last[12] ^ crc_last[15] ^ crc_last[21] 
+                    ^ crc_last[24] ^ crc_last[27];
+assign crc_calc_last[12] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[4] ^ crc_last[8] 
+                    ^ crc_last[11] ^ crc_last[13] ^ crc_last[17] ^ crc_last[18] ^ crc_last[19] 
+                    ^ crc_last[20] ^ crc_last[21] ^ crc_last[23] ^ crc_last[26] ^ crc_last[28] 
+                    ^ crc_last[29];
+assign crc_calc_last[13] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[3] ^ crc_last[5] 
+                    ^ crc_last[9] ^ crc_last[12] ^ crc_last[14] ^ crc_last[18] ^ crc_last[19] 
+                    ^ crc_last[20] ^ crc_last[21] ^ crc_last[22] ^ crc_last[24] ^ crc_last[27] 
+                    ^ crc_last[29] ^ crc_last[30];
+assign crc_calc_last[14] = crc_last[1] ^ crc_last[2] ^ crc_last[3] ^ crc_last[4] ^ crc_last[6] 
+                    ^ crc_last[10] ^ crc_last[13] ^ crc_last[15] ^ crc_last[19] ^ crc_last[20] 
+                    ^ crc_last[21] ^ crc_last[22] ^ crc_last[23] ^ crc_last[25] ^ crc_last[28] 
+                    ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[15] = crc_last[2] ^ crc_last[3] ^ crc_last[4] ^ crc_last[5] ^ crc_last[7] 
+                    ^ crc_last[11] ^ crc_last[14] ^ crc_last[16] ^ crc_last[20] ^ crc_last[21] 
+                    ^ crc_last[22] ^ crc_last[23] ^ crc_last[24] ^ crc_last[26] ^ crc_last[29] 
+                    ^ crc_last[31];
+assign crc_calc_last[16] = crc_last[8] ^ crc_last[9] ^ crc_last[11] ^ crc_last[12] ^ crc_last[15] 
+                    ^ crc_last[16] ^ crc_last[18] ^ crc_last[19] ^ crc_last[20] ^ crc_last[24] 
+                    ^ crc_last[26] ^ crc_last[27] ^ crc_last[29] ^ crc_last[30];
+assign crc_calc_last[17] = crc_last[0] ^ crc_last[9] ^ crc_last[10] ^ crc_last[12] ^ crc_last[13] 
+                    ^ crc_last[16] ^ crc_last[17] ^ crc_last[19] ^ crc_last[20] ^ crc_last[21] 
+                    ^ crc_last[25] ^ crc_last[27] ^ crc_last[28] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[18] = crc_last[1] ^ crc_last[10] ^ crc_last[11] ^ crc_last[13] ^ crc_last[14] 
+                    ^ crc_last[17] ^ crc_last[18] ^ crc_last[20] ^ crc_last[21] ^ crc_last[22] 
+                    ^ crc_last[26] ^ crc_last[28] ^ crc_last[29] ^ crc_last[31];
+assign crc_calc_last[19] = crc_last[2] ^ crc_last[11] ^ crc_last[12] ^ crc_last[14] ^ crc_last[15] 
+                    ^ crc_last[18] ^ crc_last[19] ^ crc_last[21] ^ crc_last[22] ^ crc_last[23] 
+                    ^ crc_last[27] ^ crc_last[29] ^ crc_last[30];
+assign crc_calc_last[20] = crc_last[3] ^ crc_last[12] ^ crc_last[13] ^ crc_last[15] ^ crc_last[16] 
+                    ^ crc_last[19] ^ crc_last[20] ^ crc_last[22] ^ crc_last[23] ^ crc_last[24] 
+                    ^ crc_last[28] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[21] = crc_last[4] ^ crc_last[13] ^ crc_last[14] ^ crc_last[16] ^ crc_last[17] 
+                    ^ crc_last[20] ^ crc_last[21] ^ crc_last[23] ^ crc_last[24] ^ crc_last[25] 
+                    ^ crc_last[29] ^ crc_last[31];
+assign crc_calc_last[22] = crc_last[0] ^ crc_last[3] ^ crc_last[4] ^ crc_last[6] ^ crc_last[9] 
+                    ^ crc_last[11] ^ crc_last[14] ^ crc_last[15] ^ crc_last[16] ^ crc_last[19] 
+                    ^ crc_last[20] ^ crc_last[23] ^ crc_last[24] ^ crc_last[29] ^ crc_last[30];
+assign crc_calc_last[23] = crc_last[1] ^ crc_last[3] ^ crc_last[6] ^ crc_last[7] ^ crc_last[9] 
+                    ^ crc_last[10] ^ crc_last[11] ^ crc_last[12] ^ crc_last[15] ^ crc_last[18] 
+                    ^ crc_last[19] ^ crc_last[22] ^ crc_last[23] ^ crc_last[24] ^ crc_last[26] 
+                    ^ crc_last[29] ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[24] = crc_last[2] ^ crc_last[4] ^ crc_last[7] ^ crc_last[8] ^ crc_last[10] 
+                    ^ crc_last[11] ^ crc_last[12] ^ crc_last[13] ^ crc_last[16] ^ crc_last[19] 
+                    ^ crc_last[20] ^ crc_last[23] ^ crc_last[24] ^ crc_last[25] ^ crc_last[27] 
+                    ^ crc_last[30] ^ crc_last[31];
+assign crc_calc_last[25] = crc_last[3] ^ crc_last[5] ^ crc_last[8] ^ crc_last[9] ^ crc_last[11] 
+                    ^ crc_last[12] ^ crc_last[13] ^ crc_last[14] ^ crc_last[17] ^ crc_last[20] 
+                    ^ crc_last[21] ^ crc_last[24] ^ crc_last[25] ^ crc_last[26] ^ crc_last[28] 
+                    ^ crc_last[31];
+assign crc_calc_last[26] = crc_last[0] ^ crc_last[3] ^ crc_last[5] ^ crc_last[10] ^ crc_last[11] 
+                    ^ crc_last[12] ^ crc_last[13] ^ crc_last[14] ^ crc_last[15] ^ crc_last[16] 
+                    ^ crc_last[17] ^ crc_last[19] ^ crc_last[20] ^ crc_last[23] ^ crc_last[27];
+assign crc_calc_last[27] = crc_last[0] ^ crc_last[1] ^ crc_last[4] ^ crc_last[6] ^ crc_last[11] 
+                    ^ crc_last[12] ^ crc_last[13] ^ crc_last[14] ^ crc_last[15] ^ crc_last[16] 
+                    ^ crc_last[17] ^ crc_last[18] ^ crc_last[20] ^ crc_last[21] ^ crc_last[24] 
+                    ^ crc_last[28];
+assign crc_calc_last[28] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[5] ^ crc_last[7] 
+                    ^ crc_last[12] ^ crc_last[13] ^ crc_last[14] ^ crc_last[15] ^ crc_last[16] 
+                    ^ crc_last[17] ^ crc_last[18] ^ crc_last[19] ^ crc_last[21] ^ crc_last[22] 
+                    ^ crc_last[25] ^ crc_last[29];
+assign crc_calc_last[29] = crc_last[0] ^ crc_last[1] ^ crc_last[2] ^ crc_last[3] ^ crc_last[6] 
+                    ^ crc_last[8] ^ crc_last[13] ^ crc_last[14] ^ crc_last[15] ^ crc_last[16] 
+                    ^ crc_last[17] ^ crc_last[18] ^ crc_last[19] ^ crc_last[20] ^ crc_last[22] 
+                    ^ crc_last[23] ^ crc_last[26] ^ crc_last[30];
+assign crc_calc_last[30] = crc_last[1] ^ crc_last[2] ^ crc_last[3] ^ crc_last[4] ^ crc_last[7] 
+                    ^ crc_last[9] ^ crc_last[14] ^ crc_last[15] ^ crc_last[16] ^ crc_last[17] 
+                    ^ crc_last[18] ^ crc_last[19] ^ crc_last[20] ^ crc_last[21] ^ crc_last[23] 
+                    ^ crc_last[24] ^ crc_last[27] ^ crc_last[31];
+assign crc_calc_last[31] = crc_last[2] ^ crc_last[3] ^ crc_last[4] ^ crc_last[5] ^ crc_last[8] 
+                    ^ crc_last[10] ^ crc_last[15] ^ crc_last[16] ^ crc_last[17] ^ crc_last[18] 
+                    ^ crc_last[19] ^ crc_last[20] ^ crc_last[21] ^ crc_last[22] ^ crc_last[24] 
+                    ^ crc_last[25] ^ crc_last[28];
+// 此部分代码由Python程序生成 请勿手动修改 end
+//-- 模2计算 ------------------------------------------------------------
+
+
+//++ 输出反转 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+reg  [WIDTH-1 : 0] crc_reflected;
+generate
+if (REFLECT_OUT == 1) begin // 输出是否翻转
+  genvar i;
+  for (i = 0; i < WIDTH; i = i + 1) begin : reverse
+    always @(posedge clk) begin
+      if (crc_last_valid)
+        crc_reflected[i] <= crc_calc_last[WIDTH-1-i]; // 最后一步输出反转
+    end
+  end
+end else begin
+  always @(posedge clk) begin
+    if (crc_last_valid)
+      crc_reflected <= crc_calc_last;
+  end
+end
+endgenerate
+
+reg crc_reflected_valid;
+always @(posedge clk) begin
+  if (~rstn)
+    crc_reflected_valid <= 1'b0;
+  else
+    crc_reflected_valid <= crc_last_valid;
+end
+//-- 输出反转 ------------------------------------------------------------
+
+
+//++ 输出异或 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+always @(posedge clk) begin
+  if (crc_reflected_valid)
+    crc_out <= crc_reflected ^ XOR_OUT; // 最后一步输出结果与XOR_OUT异或
+end
+
+always @(posedge clk) begin
+  if (~rstn)
+    crc_out_valid <= 1'b0;
+  else
+    crc_out_valid <= crc_reflected_valid;
+end
+//-- 输出异或 ------------------------------------------------------------
+
+
+endmodule
+`resetall
@@ -0,0 +1,91 @@
+/*
+ * @Author       : Xu Xiaokang
+ * @Email        :
+ * @Date         : 2025-01-23 10:46:28
+ * @LastEditors  : Xu Xiaokang
+ * @LastEditTime : 2025-02-11 10:34:35
+ * @Filename     :
+ * @Description  :
+*/
+
+module myCrcPipelined_tb();
+
+timeunit 1ns;
+timeprecision 1ps;
+
+//++ 实例化待测模块 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+// DIN_WIDTH, LAST_DIN_WIDTH, STAGES与WIDTH须与myCrcPipelined.v中生成的代码一致
+localparam DIN_WIDTH = 64; // 8的倍数
+localparam LAST_DIN_WIDTH = 8;
+localparam STAGES = 2;
+localparam WIDTH = 32;
+localparam REFLECT_IN = 1;
+localparam XOR_IN = 32'hFFFF_FFFF;
+localparam REFLECT_OUT = 1;
+localparam XOR_OUT = 32'hFFFF_FFFF;
+
+logic [WIDTH-1 : 0] crc_out;
+logic crc_out_valid;
+logic [DIN_WIDTH-1 : 0] din;
+logic  din_valid;
+logic  din_first;
+logic  din_last;
+logic  clk;
+logic  rstn;
+
+myCrcPipelined #(
+  .DIN_WIDTH      (DIN_WIDTH     ),
+  .LAST_DIN_WIDTH (LAST_DIN_WIDTH),
+  .STAGES         (STAGES        ),
+  .WIDTH          (WIDTH         ),
+  .REFLECT_IN     (REFLECT_IN    ),
+  .XOR_IN         (XOR_IN        ),
+  .REFLECT_OUT    (REFLECT_OUT   ),
+  .XOR_OUT        (XOR_OUT       )
+) myCrcPipelined_inst (.*);
+//-- 实例化待测模块 ------------------------------------------------------------
+
+
+//++ 生成时钟 ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+localparam CLKT = 2;
+initial begin
+  clk = 0;
+  forever #(CLKT / 2) clk = ~clk;
+end
+//-- 生成时钟 ------------------------------------------------------------
+
+
+// 两帧连续输入, 中间没有间隔
+// 第一帧为"123456789", crc_out应为32'hCBF43926; 第二帧为12004578368F000278, crc_out应为32'h62CEDBEC
+initial begin
+  rstn = 0;
+  #(CLKT * 10.6)
+  rstn = 1;
+  din = 'h31323334_35363738;
+  din_valid = 1;
+  din_first = 1;
+  din_last  = 0;
+  #(CLKT*1)
+  din = 'h39FFFFFF_FFFFFFFF; // 只有最高8位有效, 其余位不影响结果
+  din_valid = 1;
+  din_first = 0;
+  din_last  = 1;
+  #(CLKT*1)
+  din = 'h12004578_368F0002;
+  din_valid = 1;
+  din_first = 1;
+  din_last  = 0;
+  #(CLKT*1)
+  din = 'h78000000_00000000;
+  din_valid = 1;
+  din_first = 0;
+  din_last  = 1;
+  #(CLKT*1)
+  din_valid = 0;
+  din_first = 0;
+  din_last  = 0;
+  #(CLKT * 10) $stop;
+end
+
+
+endmodule